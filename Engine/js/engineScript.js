@@ -14,32 +14,140 @@
         return;
     }
 
-    let recognition;
     let silenceTimer;
+    let pushEndpoint = '';
+    let pushChain = Promise.resolve(); // envios em série: fetches paralelos chegariam fora de ordem
+    let eventSeq = 0; // único para a página: ordena os eventos de todos os idiomas
+    const engines = {}; // idioma -> { recognition, session, lastWords, enabled, running, speaking }
+    // O Chrome mantém uma só sessão de reconhecimento por página: iniciar uma segunda
+    // instância aborta a primeira. Por isso só um idioma fica ativo por vez.
+    let activeLanguage = null;
+    // Eventos ainda não lidos pelo Python no modo Selenium, drenados de uma vez por drain().
+    const MAX_PENDING = 512;
+    const pendingEvents = [];
+    let droppedEvents = 0;
 
+    function splitWords(text) {
+        return text.trim().split(/\s+/).filter(Boolean);
+    }
+
+    // Uma palavra é considerada estável quando se repete na mesma posição em dois
+    // onresult seguidos (ou quando o resultado é final). O resto é instável.
+    function segmentResult(lastWords, index, result) {
+        const words = splitWords(result[0].transcript);
+        if (result.isFinal) {
+            delete lastWords[index];
+            return { index: index, stable: words, unstable: [], isFinal: true };
+        }
+        const previous = lastWords[index] || [];
+        let n = 0;
+        while (n < words.length && n < previous.length && words[n] === previous[n]) n++;
+        lastWords[index] = words;
+        return { index: index, stable: words.slice(0, n), unstable: words.slice(n), isFinal: false };
+    }
+
+    // Publica o evento estruturado: direto no endpoint definido pelo Python ou, sem
+    // ele (modo Selenium), no fim de pendingEvents, para nenhum resultado intermediário
+    // se perder entre duas leituras.
+    function publish(payload) {
+        if (!pushEndpoint) {
+            // sentAt fica para o drain(): o evento só sai da página quando é lido.
+            pendingEvents.push(payload);
+            if (pendingEvents.length > MAX_PENDING) {
+                pendingEvents.shift();
+                droppedEvents++;
+            }
+            return;
+        }
+        // Um POST por vez, na ordem de seq: o Python descarta o que chega com seq
+        // menor que o último visto, e um final atrasado perderia palavras estáveis.
+        pushChain = pushChain.then(() => {
+            // sentAt - timestamp é o tempo gasto no navegador (inclusive esperando a
+            // vez na fila); o Python mede o resto.
+            payload.sentAt = Date.now();
+            return fetch(pushEndpoint, {
+                method: 'POST',
+                // text/plain evita o preflight de CORS
+                headers: { 'Content-Type': 'text/plain' },
+                body: JSON.stringify(payload),
+                keepalive: true
+            });
+        }).catch(() => {});
+    }
+
+    function startEngine(engine, language) {
+        try {
+            engine.recognition.start();
+            engine.running = true; // já conta como sessão aberta antes do onstart
+            console.log(`Engine de voz [${language}] iniciada em modo de baixo delay.`);
+        } catch(e) {
+            // Ignora o erro se já estiver iniciada
+        }
+    }
+
+    // Troca o idioma ativo (null: nenhum). O novo só começa no onend do anterior,
+    // para as duas sessões nunca se sobreporem.
+    function activate(language) {
+        activeLanguage = language;
+        let stopping = false;
+        Object.entries(engines).forEach(([l, engine]) => {
+            engine.enabled = (l === language);
+            if (!engine.enabled && engine.running) {
+                stopping = true;
+                engine.recognition.abort();
+            }
+        });
+        if (!stopping && language) startEngine(engines[language], language);
+    }
+
+    // Uma instância de SpeechRecognition por idioma, criadas juntas; só a ativa roda.
     function setupRecognition(language) {
-        recognition = new SpeechRecognition();
+        const engine = { recognition: new SpeechRecognition(), session: 0, lastWords: {}, enabled: false, running: false, speaking: false };
+        const recognition = engine.recognition;
+        engines[language] = engine;
         recognition.lang = language;
         recognition.continuous = true;
         recognition.interimResults = true; // Essencial para a resposta em tempo real
         recognition.maxAlternatives = 1;
 
+        recognition.onstart = function() {
+            // Os índices de resultado recomeçam a cada start().
+            engine.running = true;
+            engine.session++;
+            engine.lastWords = {};
+        };
+
+        // Só dizem ao Python quando vale ler mais rápido (ver drain()).
+        recognition.onspeechstart = function() { engine.speaking = true; };
+        recognition.onspeechend = function() { engine.speaking = false; };
+
         recognition.onresult = function(event) {
+            if (!engine.enabled) return;
             clearTimeout(silenceTimer);
             let transcript = '';
-            // Constrói a transcrição completa a partir dos resultados
+            const results = [];
             for (let i = event.resultIndex; i < event.results.length; ++i) {
                 transcript += event.results[i][0].transcript;
+                results.push(segmentResult(engine.lastWords, i, event.results[i]));
             }
-            
-            // A única tarefa é atualizar o elemento com o que está sendo ouvido.
-            resultSpeaker.textContent = transcript.trim();
+
+            publish({
+                seq: eventSeq++,
+                language: language,
+                session: engine.session,
+                resultIndex: event.resultIndex,
+                timestamp: Date.now(),
+                results: results
+            });
+
+            // O texto visível serve apenas para depuração.
+            resultSpeaker.textContent = `[${language}] ${transcript.trim()}`;
             
             // Se o resultado for final, agenda uma limpeza do texto para indicar uma nova frase.
             if (event.results[event.results.length - 1].isFinal) {
+                const shown = resultSpeaker.textContent;
                 silenceTimer = setTimeout(() => {
-                    // Limpar o texto aqui sinaliza ao Python que a frase acabou.
-                    if (resultSpeaker.textContent === transcript.trim()) {
+                    if (resultSpeaker.textContent === shown) {
                          resultSpeaker.textContent = '';
                     }
                 }, 750); // Tempo de silêncio para limpar.
@@ -47,36 +155,62 @@
         };
 
         recognition.onend = function() {
-            // Reinicia automaticamente se parar
-            setTimeout(() => {
-                try { 
-                    recognition.start(); 
-                } catch(e) {
-                    // Ignora o erro se já estiver iniciado
-                }
-            }, 100);
+            engine.running = engine.speaking = false;
+            if (engine.enabled) {
+                // Reinicia automaticamente se parar sozinho, a menos que o idioma tenha
+                // sido trocado nesse meio-tempo: a sessão dela abortaria a do novo ativo.
+                setTimeout(() => {
+                    if (engine.enabled && !engine.running) startEngine(engine, language);
+                }, 100);
+            } else if (activeLanguage && !engines[activeLanguage].running) {
+                // Foi desligada por activate(): agora a sessão do novo idioma pode começar
+                startEngine(engines[activeLanguage], activeLanguage);
+            }
         };
 
         recognition.onerror = function(event) {
             if (event.error !== 'no-speech') {
-                 console.error('Erro de reconhecimento:', event.error);
+                 console.error(`Erro de reconhecimento [${language}]:`, event.error);
             }
         };
-        
-        try {
-            recognition.start();
-            console.log('Engine de voz iniciada em modo de baixo delay.');
-        } catch(e) {
-            console.error("Erro ao iniciar a engine:", e);
-        }
     }
 
-    // Espera o Python definir o idioma para iniciar
+    // Controle pelo Python (driver.execute_script) enquanto a página roda.
+    window.speechEngines = {
+        languages: () => Object.keys(engines),
+        active: () => activeLanguage,
+        // Uma chamada por leitura do modo Selenium: todos os eventos pendentes, em ordem,
+        // e se algum idioma está ouvindo fala agora.
+        drain: function() {
+            const sentAt = Date.now();
+            const events = pendingEvents.splice(0);
+            events.forEach(e => { e.sentAt = sentAt; });
+            const dropped = droppedEvents;
+            droppedEvents = 0;
+            return {
+                events: events,
+                dropped: dropped,
+                speaking: Object.values(engines).some(e => e.enabled && e.speaking)
+            };
+        },
+        // Ligar um idioma desliga o que estava ativo; desligar o ativo deixa o microfone parado.
+        setEnabled: function(language, enabled) {
+            if (!engines[language]) return;
+            if (enabled && language !== activeLanguage) activate(language);
+            else if (!enabled && language === activeLanguage) activate(null);
+        }
+    };
+
+    // Espera o Python definir o(s) idioma(s) para iniciar; vários vêm separados por
+    // vírgula e o primeiro começa ativo.
     const languageCheckInterval = setInterval(() => {
         const language = document.getElementById('lg')?.textContent;
         if (language && language !== 'Looking...') {
             clearInterval(languageCheckInterval);
-            setupRecognition(language);
+            pushEndpoint = (document.getElementById('pushEndpoint')?.textContent || '').trim();
+            const languages = language.split(',').map(l => l.trim()).filter(Boolean);
+            languages.forEach(setupRecognition);
+            if (languages.length) activate(languages[0]);
         }
     }, 100);
 
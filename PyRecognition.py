@@ -8,19 +8,114 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import json
 import threading
-from queue import Queue, Empty
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from command_bus import CommandBus
+from voice_backends import RecognizerBackend, TranscriptTracker
+from latency import voice_tracer
 
-class PyRecognition:
-    def __init__(self, language):
-        self.language = language
+
+class _PushHandler(BaseHTTPRequestHandler):
+    """Recebe os eventos que o engineScript.js envia via fetch."""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8') if length else ''
+        try:
+            self.server.on_event(json.loads(body))
+        except (ValueError, TypeError):
+            pass
+        self.send_response(204)
+        self._cors_headers()
+        self.end_headers()
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.end_headers()
+
+    def _cors_headers(self):
+        # A página é aberta via file://, então a origem é sempre "null".
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+
+    def log_message(self, format, *args):
+        pass  # Silencia o log de cada requisição
+
+
+class _PushServer(HTTPServer):
+    """Servidor HTTP local (single-thread, preserva a ordem dos eventos)."""
+
+    def __init__(self, on_event):
+        super().__init__(('127.0.0.1', 0), _PushHandler)
+        self.on_event = on_event
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+class PyRecognition(RecognizerBackend):
+    """
+    Ponte entre a Web Speech API (Chrome) e o Python.
+
+    transport='push' (padrão): o engineScript.js envia cada evento onresult para
+    um servidor HTTP local, sem nenhum polling no Python.
+    transport='selenium': a página guarda os eventos num array e cada leitura os
+    drena todos com um único execute_script; lê a cada POLL_ATIVO enquanto há fala
+    e a cada POLL_OCIOSO quando o microfone está em silêncio.
+    Se o servidor local não puder ser iniciado, o modo selenium é usado.
+
+    Cada evento traz, por índice de resultado, o segmento estável e o instável da
+    transcrição. Só as palavras que acabaram de se estabilizar são entregues, então
+    "fogo" -> "fogo gelo" gera "fogo" e depois apenas "gelo".
+
+    language: um idioma ("pt-BR"), vários separados por vírgula ("pt-BR,en-US")
+    ou uma lista. A página cria um SpeechRecognition por idioma, mas o Chrome só
+    mantém uma sessão de reconhecimento por página (iniciar uma segunda aborta a
+    primeira), então só um idioma escuta por vez: o primeiro da lista, até
+    set_language_enabled(outro, True) trocar, sem reiniciar o navegador. Cada
+    TranscriptEvent sai marcado com o idioma que o gerou.
+
+    record_path: se definido, grava cada evento recebido (JSON por linha) para ser
+    reproduzido depois com voice_backends.ReplayRecognizer.
+    """
+
+    def __init__(self, language, transport='push', record_path=None):
+        if isinstance(language, str):
+            language = language.split(',')
+        self.languages = [l.strip() for l in language if l.strip()]
+        self.language = ','.join(self.languages)
+        self.transport = transport
         self.driver = None
-        self.speech_queue = Queue()
+        self.speech_queue = CommandBus(maxlen=256, max_idade=self.IDADE_MAX, clock=self.clock,
+                                       ao_descartar=lambda evento, motivo: voice_tracer.discard(evento.trace_id))
         self.is_running = False
         self.recognition_thread = None
-        self.POLL_INTERVAL = 0.03  # Leitura bem rápida
+        self.push_server = None
+        self.push_thread = None
+        self.tracker = TranscriptTracker()
+        self.disabled_languages = frozenset(self.languages[1:])  # só o primeiro começa ativo
+        self.record_file = open(record_path, 'w', encoding='utf-8') if record_path else None
+        self._record_start = time.perf_counter()
+        self.POLL_ATIVO = 0.015   # Com fala em andamento
+        self.POLL_OCIOSO = 0.1    # Em silêncio
+        self.JANELA_ATIVA = 1.0   # Segundos em ritmo ativo depois do último evento
+        self.eventos_perdidos = 0 # Descartados pela página por falta de leitura
 
-        self._setup_driver()
+        if self.transport == 'push':
+            self._start_push_server()
+        try:
+            self._setup_driver()
+        except Exception:
+            # _setup_driver já fechou o Chrome e o servidor; falta a gravação.
+            if self.record_file:
+                self.record_file.close()
+                self.record_file = None
+            raise
         self._start_recognition_loop()
 
     def _setup_driver(self):
@@ -64,56 +159,104 @@ class PyRecognition:
             
             wait = WebDriverWait(self.driver, 10)
             wait.until(EC.presence_of_element_located((By.ID, "lg")))
+            if self.push_server:
+                # O endpoint precisa estar definido antes do idioma, que dispara a engine.
+                self.driver.execute_script(
+                    f"document.getElementById('pushEndpoint').innerHTML = '{self.push_server.url}';")
             self.driver.execute_script(f"document.getElementById('lg').innerHTML = '{self.language}';")
             
             wait.until(EC.presence_of_element_located((By.ID, "resultSpeak")))
             time.sleep(0.5)
             
-            print(f"PyRecognition inicializado com sucesso! Idioma: {self.language}")
+            print(f"PyRecognition inicializado com sucesso! Idiomas: {self.language}")
             
         except Exception as e:
             print(f"Erro ao inicializar PyRecognition: {e}")
             if self.driver:
                 self.driver.quit()
+                self.driver = None
+            self._stop_push_server()
             raise
 
+    def _start_push_server(self):
+        """Sobe o servidor local que recebe os eventos do navegador."""
+        try:
+            self.push_server = _PushServer(self._on_browser_event)
+        except OSError as e:
+            print(f"Servidor push indisponível ({e}). Usando polling via Selenium.")
+            self.transport = 'selenium'
+            return
+        self.push_thread = threading.Thread(target=self.push_server.serve_forever, daemon=True)
+        self.push_thread.start()
+
+    def _stop_push_server(self):
+        if self.push_server:
+            self.push_server.shutdown()
+            self.push_server.server_close()
+            self.push_server = None
+
+    def _on_browser_event(self, event):
+        """Converte um evento onresult do navegador em TranscriptEvents incrementais."""
+        if self.record_file:
+            linha = dict(event, t=round(time.perf_counter() - self._record_start, 4))
+            self.record_file.write(json.dumps(linha, ensure_ascii=False) + '\n')
+        if event.get('language') in self.disabled_languages:
+            return  # Já estava a caminho quando o idioma foi desligado
+        instante = self.clock()
+        for transcript_event in self.tracker.feed(event):
+            transcript_event.trace_id = voice_tracer.start(event.get('timestamp'), event.get('sentAt'))
+            transcript_event.instante = instante
+            self.speech_queue.put(transcript_event, instante=instante)
+
+    def set_language_enabled(self, language, enabled):
+        """Ligar um idioma o torna o ativo (desliga os outros); desligar o ativo deixa nenhum escutando."""
+        if language not in self.languages:
+            # A página não tem engine para ele: ligá-lo desligaria todos os outros só no Python.
+            raise ValueError(f"Idioma {language!r} não configurado (idiomas: {self.language})")
+        if enabled:
+            self.disabled_languages = frozenset(l for l in self.languages if l != language)
+        else:
+            super().set_language_enabled(language, enabled)
+        if self.driver:
+            self.driver.execute_script(
+                "window.speechEngines && window.speechEngines.setEnabled(arguments[0], arguments[1]);", language, bool(enabled))
+
     def _start_recognition_loop(self):
         """Inicia o loop de reconhecimento em thread separada"""
         self.is_running = True
+        if self.transport == 'push':
+            return  # Os eventos chegam pelo servidor local, não há o que consultar.
         self.recognition_thread = threading.Thread(target=self._recognition_loop, daemon=True)
         self.recognition_thread.start()
 
+    _DRAIN_SCRIPT = "return window.speechEngines ? window.speechEngines.drain() : null;"
+
     def _recognition_loop(self):
-        """Loop que apenas lê o texto do HTML e o envia."""
-        last_speech = ""
+        """Loop que drena os eventos pendentes na página, um execute_script por leitura."""
+        ultimo_evento = 0.0
         while self.is_running:
             try:
                 if not self.driver:
                     break
-                
-                speech_element = self.driver.find_element(By.ID, "resultSpeak")
-                speech = speech_element.text
-                
-                # Envia a transcrição se ela mudou.
-                if speech != last_speech:
-                    self.speech_queue.put(speech)
-                    last_speech = speech
-
-                time.sleep(self.POLL_INTERVAL)
+
+                lote = self.driver.execute_script(self._DRAIN_SCRIPT) or {}
+                for event in lote.get('events', ()):
+                    self._on_browser_event(event)
+                self.eventos_perdidos += lote.get('dropped', 0)
+
+                # Rápido enquanto alguém fala (ou acabou de falar), devagar em silêncio.
+                agora = time.perf_counter()
+                if lote.get('events') or lote.get('speaking'):
+                    ultimo_evento = agora
+                ativo = agora - ultimo_evento < self.JANELA_ATIVA
+                time.sleep(self.POLL_ATIVO if ativo else self.POLL_OCIOSO)
             except Exception:
                 # Em caso de erro (ex: browser fechando), apenas espera um pouco
                 time.sleep(0.1)
 
-    def get_all_pending(self):
-        """Retorna todos os comandos pendentes"""
-        results = []
-        while not self.speech_queue.empty():
-            try:
-                result = self.speech_queue.get_nowait()
-                results.append(result)
-            except Empty:
-                break
-        return results
+    def get_all_pending_events(self):
+        """Retorna todos os TranscriptEvents pendentes, numa única aquisição do lock"""
+        return self.speech_queue.drain()
 
     def stop(self):
         """Para o reconhecimento e fecha recursos"""
@@ -121,6 +264,12 @@ class PyRecognition:
         
         if self.recognition_thread and self.recognition_thread.is_alive():
             self.recognition_thread.join(timeout=1)
+
+        self._stop_push_server()
+
+        if self.record_file:
+            self.record_file.close()
+            self.record_file = None
         
         if self.driver:
             try:
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import struct
+
+import pygame
+
+# Versão do formato em disco; mude para invalidar todos os arquivos antigos.
+FORMATO_CACHE = 1
+_CABECALHO = struct.Struct('<II')  # largura, altura; seguido dos pixels RGBA
+
+
+class AssetCache:
+    """
+    Cache em disco de imagens já decodificadas e redimensionadas.
+
+    Cada entrada é identificada pelo caminho da imagem original, seu mtime e
+    tamanho em bytes, e pela resolução de destino. Assim um PNG editado ou uma
+    resolução diferente geram uma entrada nova. Os pixels ficam em RGBA cru,
+    lidos com pygame.image.frombytes, sem decodificar PNG nem redimensionar.
+
+    Os métodos load_* podem ser chamados de threads; convert()/convert_alpha()
+    ficam a cargo de quem chama, na thread principal.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, source_path, size):
+        st = os.stat(source_path)
+        ident = f"{FORMATO_CACHE}|{os.path.abspath(source_path)}|{st.st_mtime_ns}|{st.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+    def _read(self, key):
+        try:
+            with open(os.path.join(self.cache_dir, key + '.bin'), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        w, h = _CABECALHO.unpack_from(data)
+        pixels = data[_CABECALHO.size:]
+        if len(pixels) != w * h * 4:
+            return None  # Arquivo truncado: refaz
+        return pygame.image.frombytes(pixels, (w, h), 'RGBA')
+
+    def _write(self, key, surface):
+        destino = os.path.join(self.cache_dir, key + '.bin')
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        with open(temporario, 'wb') as f:
+            f.write(_CABECALHO.pack(*surface.get_size()))
+            f.write(pygame.image.tobytes(surface, 'RGBA'))
+        os.replace(temporario, destino)
+
+    def load_scaled_many(self, source_path, sizes):
+        """
+        Retorna ({tamanho: Surface}, decodificou) para uma imagem em vários tamanhos.
+        O PNG só é decodificado (uma única vez) se algum tamanho não estiver no cache.
+        """
+        resultado, faltando = {}, []
+        for size in sizes:
+            key = self._key(source_path, size)
+            surf = self._read(key)
+            if surf is None: faltando.append((size, key))
+            else: resultado[size] = surf
+        if faltando:
+            original = pygame.image.load(source_path)
+            if original.get_bitsize() < 24:
+                # Paletas não têm representação RGBA direta: expande para 32 bits.
+                expandida = pygame.Surface(original.get_size(), pygame.SRCALPHA, 32)
+                expandida.blit(original, (0, 0))
+                original = expandida
+            for size, key in faltando:
+                surf = original if original.get_size() == size else pygame.transform.scale(original, size)
+                self._write(key, surf)
+                resultado[size] = surf
+        return resultado, bool(faltando)
+
+    def load_scaled(self, source_path, size):
+        return self.load_scaled_many(source_path, [size])[0][size]
+
+    def clear(self):
+        for nome in os.listdir(self.cache_dir):
+            if nome.endswith('.bin'):
+                os.remove(os.path.join(self.cache_dir, nome))
@@ -0,0 +1,76 @@
+import pygame
+
+
+class TextureAtlas:
+    """
+    Atlas de texturas: os frames são empacotados em poucas páginas grandes
+    (Surfaces com alpha) e region(frame) devolve (página, área), pronto para um
+    item (superfície, destino, área) de Surface.blits. Frames iguais dão sempre
+    a mesma região; a primeira chamada copia o frame para a página.
+
+    As páginas são preenchidas em prateleiras, da esquerda para a direita e de
+    cima para baixo, com `margem` pixels entre os frames. Um frame maior que a
+    página ganha uma página só para ele. A cópia é feita com BLEND_RGBA_ADD
+    sobre a página zerada, então os pixels (alpha incluído) ficam idênticos aos
+    do original.
+
+    O jogo desenha o caminho em lote com frame_cache.RleFrameCache, que tem a
+    mesma interface: no blit por software do pygame o custo é a mistura de alpha
+    por pixel, não a troca de superfície, e as páginas não ganham nada (o SDL
+    só acelera com RLE o blit da superfície inteira, não de uma área dentro
+    dela). O atlas fica como referência em benchmarks/bench_atlas.py.
+
+    Frames com alpha da superfície (set_alpha) ou sem alpha por pixel ficam de
+    fora: region() devolve o próprio frame com área None, e o blit fica igual
+    ao de antes. O atlas guarda uma referência a cada frame empacotado; clear()
+    solta frames e páginas.
+    """
+
+    def __init__(self, tamanho_pagina=(2048, 2048), margem=1):
+        self.tamanho_pagina = tamanho_pagina
+        self.margem = margem
+        self.paginas = []
+        self.regioes = {}  # frame -> (superfície, Rect ou None)
+        self._pagina = None  # página em que as prateleiras estão sendo preenchidas
+        self._x = self._y = self._altura_prateleira = 0
+        self.area_usada = 0
+
+    def region(self, frame):
+        regiao = self.regioes.get(frame)
+        if regiao is None:
+            regiao = self.regioes[frame] = self._pack(frame)
+        return regiao
+
+    def regions(self, frames):
+        return [self.region(f) for f in frames]
+
+    def _pack(self, frame):
+        if not frame.get_flags() & pygame.SRCALPHA or frame.get_alpha() not in (None, 255):
+            return frame, None
+        w, h = frame.get_size()
+        largura, altura = self.tamanho_pagina
+        if w > largura or h > altura:
+            pagina = pygame.Surface((w, h), pygame.SRCALPHA, frame); self.paginas.append(pagina)
+            rect = pygame.Rect(0, 0, w, h)
+        else:
+            if self._x + w > largura:  # prateleira cheia: abre a próxima
+                self._x, self._y, self._altura_prateleira = 0, self._y + self._altura_prateleira + self.margem, 0
+            if self._pagina is None or self._y + h > altura:  # página cheia: abre outra
+                self._pagina = pygame.Surface(self.tamanho_pagina, pygame.SRCALPHA, frame); self.paginas.append(self._pagina)
+                self._x = self._y = self._altura_prateleira = 0
+            pagina, rect = self._pagina, pygame.Rect(self._x, self._y, w, h)
+            self._x += w + self.margem; self._altura_prateleira = max(self._altura_prateleira, h)
+        pagina.blit(frame, rect.topleft, special_flags=pygame.BLEND_RGBA_ADD)
+        self.area_usada += w * h
+        return pagina, rect
+
+    def clear(self):
+        self.paginas.clear(); self.regioes.clear(); self._pagina = None
+        self._x = self._y = self._altura_prateleira = 0
+        self.area_usada = 0
+
+    def stats(self):
+        area_total = sum(p.get_width() * p.get_height() for p in self.paginas)
+        return {"paginas": len(self.paginas), "frames": len(self.regioes),
+                "bytes": sum(p.get_pitch() * p.get_height() for p in self.paginas),
+                "ocupacao": self.area_usada / area_total if area_total else 0.0}
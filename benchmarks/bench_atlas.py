@@ -0,0 +1,97 @@
+"""
+Desenho de um frame no modo horda: o caminho atual (um blit por superfície de
+frame, barras de vida com pygame.draw.rect) versus o caminho em lote (um único
+Surface.blits com sprites e barras de vida), com os frames empacotados em
+páginas pelo atlas.TextureAtlas ou, como no --lote-rle, em cópias com RLE do
+frame_cache.RleFrameCache.
+
+Para cada motor e N, as três variantes rodam a mesma partida lado a lado
+(mesma semente, bot lançando feitiços, dificuldade alta para haver barras de
+vida), e cada frame desenhado é comparado com o do caminho atual: com as
+páginas ele precisa ser idêntico; com RLE, mostra a maior diferença por canal
+nos pixels translúcidos. Só o world.draw é cronometrado (mediana dos frames);
+a tela é limpa antes, fora da medida.
+
+Uso: python benchmarks/bench_atlas.py [--frames N] [--motor sprites|soa|ambos]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import jogo
+from atlas import TextureAtlas
+from frame_cache import RleFrameCache
+
+# (nome, usar_lote_rle, classe dos quadros_lote, exige pixels idênticos ao 'atual')
+VARIANTES = (('atual', False, None, True), ('páginas', True, TextureAtlas, True), ('rle', True, RleFrameCache, False))
+
+def rodar(classe, anim_managers, horda, frames, bot_interval=5):
+    mundos = []
+    for anim_manager in anim_managers:
+        game_state = jogo.GameState(None); game_state.player_name = "bench"; game_state.estado = "JOGANDO"
+        world = classe(game_state, anim_manager, random.Random(horda), horda=horda)
+        game_state.dificuldade = 8  # monstros com 2 e 3 de vida, ou seja, com barra
+        world.update(jogo.PASSO_FIXO)
+        mundos.append(world)
+    tempos, diferenca_max = [[] for _ in VARIANTES], 0
+    for frame in range(frames):
+        if frame % bot_interval == 0:
+            for world in mundos:
+                cmd = jogo._comando_do_bot(world)
+                if cmd: world.queue_spell(cmd)
+        referencia = None
+        for (nome, usar_lote, _, identico), world, tempo in zip(VARIANTES, mundos, tempos):
+            world.update(jogo.PASSO_FIXO)
+            jogo.usar_lote_rle = usar_lote
+            jogo.tela.fill((30, 60, 90))
+            inicio = time.perf_counter()
+            world.draw(jogo.tela, False, 0.5)
+            tempo.append(time.perf_counter() - inicio)
+            pixels = jogo.pygame.surfarray.array3d(jogo.tela).astype(np.int16)
+            if referencia is None:
+                referencia = pixels
+            else:
+                diferenca = int(np.abs(pixels - referencia).max())
+                assert diferenca == 0 or not identico, f"'{nome}' desenhou pixels diferentes (até {diferenca} níveis, frame {frame})"
+                if not identico: diferenca_max = max(diferenca_max, diferenca)
+    for world in mundos: world.close()
+    jogo.usar_lote_rle = False
+    return [sorted(t)[len(t) // 2] * 1000 for t in tempos], diferenca_max
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--motor', choices=('sprites', 'soa', 'ambos'), default='ambos')
+    args = parser.parse_args()
+    motores = {'sprites': jogo.GameWorld}
+    if jogo.entity_store is not None:
+        motores['soa'] = jogo.SoAGameWorld
+    if args.motor != 'ambos':
+        motores = {args.motor: motores[args.motor]}
+    anim_managers = []
+    for _, _, quadros, _ in VARIANTES:
+        anim_manager = jogo.AnimationManager()
+        anim_manager.load_animations(jogo.ANIMACOES_DO_JOGO)
+        if quadros is not None: anim_manager.quadros_lote = quadros()
+        anim_managers.append(anim_manager)
+
+    print(f"{'motor':>7} | {'monstros':>8} | {'atual (ms)':>10} | {'páginas (ms)':>12} | {'rle (ms)':>8} | {'ganho rle':>9} | {'dif. rle':>8}")
+    print("-" * 83)
+    for nome, classe in motores.items():
+        for horda in (100, 500, 1000, 2000):
+            (atual, paginas, rle), diferenca = rodar(classe, anim_managers, horda, args.frames)
+            print(f"{nome:>7} | {horda:>8} | {atual:>10.3f} | {paginas:>12.3f} | {rle:>8.3f} | {atual / rle:>8.2f}x | {diferenca:>8}")
+    st = anim_managers[1].quadros_lote.stats()
+    print(f"\natlas em páginas: {st['paginas']} página(s), {st['frames']} frames, {st['bytes'] / 1024 / 1024:.1f} MB, {st['ocupacao']:.0%} ocupado")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark do reconhecimento de comandos.
+
+Compara a busca original (palavras x sinônimos, refeita a cada chamada) com o
+CommandMatcher (Aho-Corasick pré-compilado), com e sem cache, à medida que o
+vocabulário cresce até centenas de sinônimos.
+
+Uso: python benchmarks/bench_comandos.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comandos import COMANDOS_MAP, CommandMatcher, _normalize_ascii
+
+def busca_original(comandos_map, command):
+    """Reprodução fiel do process_voice_command antes do matcher pré-compilado."""
+    if not command:
+        return []
+    sinonimo_map = {s: cmd for cmd, sl in comandos_map.items() for s in sl}
+    todos_sinonimos = list(sinonimo_map.keys())
+    comandos_identificados = []
+    for palavra in _normalize_ascii(command).split():
+        for sinonimo in todos_sinonimos:
+            if sinonimo in palavra:
+                comandos_identificados.append(sinonimo_map[sinonimo])
+                break
+    return comandos_identificados
+
+def vocabulario_sintetico(total_sinonimos, rng):
+    """COMANDOS_MAP real acrescido de sinônimos aleatórios até o total pedido."""
+    comandos_map = {cmd: list(sl) for cmd, sl in COMANDOS_MAP.items()}
+    existentes = sum(len(sl) for sl in comandos_map.values())
+    letras = "bcdfghjklmnpqrstvwxz"  # sem vogais: não colide com as palavras reais
+    comandos = list(comandos_map)
+    for _ in range(max(0, total_sinonimos - existentes)):
+        sinonimo = "".join(rng.choice(letras) for _ in range(rng.randint(4, 9)))
+        comandos_map[rng.choice(comandos)].append(sinonimo)
+    return comandos_map
+
+def transcricoes_parciais(rng, n):
+    """Simula resultados parciais: prefixos crescentes de frases, muito repetidos."""
+    frases = ["fogo gelo raio", "lança fogo agora", "gelo gelo", "relâmpago e trovão",
+              "começar o jogo", "voltar para o menu", "quero ver o placar", "hmm não sei"]
+    saida = []
+    while len(saida) < n:
+        palavras = rng.choice(frases).split()
+        for i in range(1, len(palavras) + 1):
+            saida.append(" ".join(palavras[:i]))
+    return saida[:n]
+
+def medir(func, entradas, repeticoes=5):
+    def rodada():
+        for t in entradas:
+            func(t)
+    melhor = min(timeit.repeat(rodada, number=1, repeat=repeticoes))
+    return melhor / len(entradas) * 1e6  # microssegundos por chamada
+
+def main():
+    rng = random.Random(42)
+    entradas = transcricoes_parciais(rng, 2000)
+    print(f"{'sinônimos':>10} | {'original (us)':>14} | {'matcher s/ cache':>16} | {'matcher c/ cache':>16}")
+    print("-" * 66)
+    for total in (27, 100, 250, 500, 1000):
+        comandos_map = vocabulario_sintetico(total, rng)
+        # Só a busca exata: a aproximada (fuzzy) tem o seu próprio bench_fuzzy.py.
+        sem_cache = CommandMatcher(comandos_map, cache_size=0, fuzzy=False)
+        com_cache = CommandMatcher(comandos_map, fuzzy=False)
+        for t in entradas:  # sanidade: mesma semântica
+            assert sem_cache.match(t) == busca_original(comandos_map, t), t
+        t_original = medir(lambda t: busca_original(comandos_map, t), entradas)
+        t_sem_cache = medir(sem_cache.match, entradas)
+        t_com_cache = medir(com_cache.match, entradas)
+        print(f"{total:>10} | {t_original:>14.2f} | {t_sem_cache:>16.2f} | {t_com_cache:>16.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Modo horda: GameWorld (monstros e feitiços como sprites) versus SoAGameWorld
+(arrays numpy do entity_store), com N monstros mantidos na tela.
+
+Para cada N, os dois mundos rodam a mesma partida (mesma semente, bot lançando
+um feitiço a cada poucos ticks) e o resultado precisa ser idêntico. Mede o tempo
+da simulação por tick (update) e o de desenhar um frame; 16.7 ms é o orçamento
+de um frame a 60 FPS.
+
+Uso: python benchmarks/bench_entidades.py [--ticks N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import jogo
+
+def rodar(classe, anim_manager, horda, ticks, bot_interval=5):
+    game_state = jogo.GameState(None); game_state.player_name = "bench"; game_state.estado = "JOGANDO"
+    world = classe(game_state, anim_manager, random.Random(horda), horda=horda)
+    world.update(jogo.PASSO_FIXO)  # primeiro passo: enche a tela
+    simulacao = desenho = 0.0
+    for tick in range(ticks):
+        if tick % bot_interval == 0:
+            cmd = jogo._comando_do_bot(world)
+            if cmd: world.queue_spell(cmd)
+        inicio = time.perf_counter()
+        world.update(jogo.PASSO_FIXO)
+        meio = time.perf_counter()
+        world.draw(jogo.tela, False, 0.5)
+        desenho += time.perf_counter() - meio; simulacao += meio - inicio
+    resultado = (game_state.pontuacao, game_state.vidas, world.monster_count())
+    world.close()
+    return simulacao / ticks * 1000, desenho / ticks * 1000, resultado
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=120)
+    args = parser.parse_args()
+    if jogo.entity_store is None:
+        sys.exit("o SoAGameWorld precisa do numpy")
+    anim_manager = jogo.AnimationManager()
+    anim_manager.load_animations(jogo.ANIMACOES_DO_JOGO)
+
+    print(f"{'monstros':>9} | {'sprites: update':>15} | {'desenho':>8} | {'soa: update':>11} | {'desenho':>8} | {'ganho update':>12}")
+    print("-" * 80)
+    for horda in (100, 500, 1000, 2000, 5000):
+        t_sprites, d_sprites, r_sprites = rodar(jogo.GameWorld, anim_manager, horda, args.ticks)
+        t_soa, d_soa, r_soa = rodar(jogo.SoAGameWorld, anim_manager, horda, args.ticks)
+        assert r_sprites == r_soa, f"os motores divergiram: {r_sprites} != {r_soa}"
+        print(f"{horda:>9} | {t_sprites:>12.3f} ms | {d_sprites:>5.2f} ms | {t_soa:>8.3f} ms | {d_soa:>5.2f} ms | {t_sprites / t_soa:>11.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Busca aproximada de comandos: FuzzyCommandIndex (chaves fonéticas + índice de
+deleções simétricas) versus varrer todos os sinônimos calculando a distância de
+edição ponderada de cada um, à medida que o vocabulário cresce até mil sinônimos.
+
+As consultas são quase-acertos de sinônimos (uma ou duas letras trocadas,
+apagadas ou repetidas, como "fogu" ou "jelo") e palavras que não são comando. Os
+tempos são por palavra, sem o cache; o índice também mostra p99, máximo e quantas
+consultas estouraram o orçamento.
+
+No fim, com o vocabulário real do jogo, mede os dois lados do corte de
+confiança: quantos quase-acertos conhecidos ainda acham o comando certo e
+quantas palavras comuns de português e inglês (NEGATIVAS) viram comando por
+engano.
+
+Uso: python benchmarks/bench_fuzzy.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comandos import COMANDOS_MAP, CommandMatcher, chave_fonetica, _TROCAS_PARECIDAS
+
+SILABAS = [c + v for c in "bcdfgjlmnprstvz" for v in "aeiou"]
+
+# Erros de reconhecimento que devem continuar virando o comando
+QUASE_ACERTOS = {"fogu": "fogo", "fugo": "fogo", "keimar": "fogo", "jelo": "gelo", "gelu": "gelo", "kongelar": "gelo",
+                 "raiu": "raio", "eletriko": "raio", "thunderr": "raio", "parrar": "parar", "voutar": "voltar",
+                 "retornarr": "voltar", "comesar": "comecar", "iniciarr": "comecar", "pontuasao": "pontuacao",
+                 "plakar": "pontuacao", "estart": "comecar", "troväo": "raio"}
+
+# Fala comum que não pode virar comando
+NEGATIVAS = ["menos", "frito", "frigo", "placa", "kit", "retorno", "casa", "mesa", "fora", "gente", "certo",
+             "porta", "pode", "fica", "forte", "logo", "jogo", "rato", "gato", "para", "parte", "volta",
+             "tempo", "menor", "mundo", "ponte", "carro", "frase", "raiva", "sorte", "bola", "tarde",
+             "senha", "falar", "quero", "vamos", "coisa", "agora", "sobre", "ainda", "start", "fire",
+             "kitty", "quite", "mess", "store", "fair", "rate", "ready", "first", "frozen", "return",
+             "score", "scare", "water", "hello", "thanks", "nice", "place", "price", "ice cream", "menus"]
+
+def distancia_ponderada(a, b):
+    """Distância de edição com as mesmas trocas parecidas do índice (matriz completa)."""
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        atual = [i]
+        for j, cb in enumerate(b, 1):
+            troca = 0 if ca == cb else (0.5 if (ca, cb) in _TROCAS_PARECIDAS else 1)
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + troca))
+        anterior = atual
+    return anterior[-1]
+
+def varredura(indice, chaves, palavra):
+    """A alternativa ingênua: distância contra a chave de cada sinônimo, com os mesmos cortes do índice."""
+    chave, melhor = chave_fonetica(palavra), None
+    for outra, comando in chaves:
+        confianca = 0.9 * (1 - distancia_ponderada(chave, outra) / max(len(chave), len(outra)))
+        if (melhor is None or confianca > melhor[1]) and indice.aceita(palavra, chave, outra, confianca): melhor = (comando, confianca)
+    return melhor
+
+def vocabulario_sintetico(total_sinonimos, rng):
+    """COMANDOS_MAP real acrescido de palavras pronunciáveis (2 a 4 sílabas) até o total pedido."""
+    comandos_map = {cmd: list(sl) for cmd, sl in COMANDOS_MAP.items()}
+    existentes = {s for sl in comandos_map.values() for s in sl}
+    comandos = list(comandos_map)
+    while len(existentes) < total_sinonimos:
+        sinonimo = "".join(rng.choice(SILABAS) for _ in range(rng.randint(2, 4)))
+        if sinonimo not in existentes:
+            existentes.add(sinonimo); comandos_map[rng.choice(comandos)].append(sinonimo)
+    return comandos_map
+
+def quase_acerto(palavra, rng):
+    letras = list(palavra)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(letras))
+        operacao = rng.choice(("troca", "apaga", "repete"))
+        if operacao == "troca": letras[i] = rng.choice("aeiou" if letras[i] in "aeiou" else "bcdfgjklmnprstvz")
+        elif operacao == "apaga" and len(letras) > 3: del letras[i]
+        else: letras.insert(i, letras[i])
+    return "".join(letras)
+
+def consultas(comandos_map, rng, n):
+    sinonimos = [s for sl in comandos_map.values() for s in sl if len(s) >= 4]
+    saida = []
+    for k in range(n):
+        if k % 4 == 3: saida.append("".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(rng.randint(5, 9))))
+        else: saida.append(quase_acerto(rng.choice(sinonimos), rng))
+    return saida
+
+def main():
+    rng = random.Random(7)
+    print(f"{'sinônimos':>10} | {'varredura (us)':>14} | {'índice p50':>10} | {'p99':>7} | {'máx':>7} | {'estouros':>8} | {'concordam':>9}")
+    print("-" * 84)
+    for total in (27, 100, 250, 500, 1000):
+        comandos_map = vocabulario_sintetico(total, rng)
+        matcher = CommandMatcher(comandos_map, cache_size=0)
+        indice = matcher.fuzzy; indice.cache_size = 0
+        chaves = [(chave, indice.por_chave[chave]) for chave in indice.por_chave]
+        palavras = consultas(comandos_map, rng, 400)
+
+        tempos, concordam = [], 0
+        for palavra in palavras:
+            inicio = time.perf_counter_ns()
+            achado = indice.lookup(palavra)
+            tempos.append((time.perf_counter_ns() - inicio) / 1000)
+            esperado = varredura(indice, chaves, palavra)
+            concordam += (achado and achado[0]) == (esperado and esperado[0])
+        inicio = time.perf_counter()
+        for palavra in palavras[:100]: varredura(indice, chaves, palavra)
+        t_varredura = (time.perf_counter() - inicio) / 100 * 1e6
+        tempos.sort()
+        print(f"{total:>10} | {t_varredura:>14.1f} | {tempos[len(tempos) // 2]:>10.1f} | {tempos[int(len(tempos) * 0.99)]:>7.1f} | "
+              f"{tempos[-1]:>7.1f} | {indice.estouros:>8} | {concordam / len(palavras):>9.0%}")
+
+    indice = CommandMatcher(COMANDOS_MAP, cache_size=0).fuzzy
+    sinonimos = {s for sl in COMANDOS_MAP.values() for s in sl}
+    erros = [f"{p} -> {a and a[0]}" for p, cmd in QUASE_ACERTOS.items() if (a := indice.lookup(p)) is None or a[0] != cmd]
+    negativas = [p for p in NEGATIVAS if p not in sinonimos]
+    falsos = [f"{p} -> {a[0]} ({a[1]:.2f})" for p in negativas if (a := indice.lookup(p))]
+    print(f"\nvocabulário real: {len(QUASE_ACERTOS) - len(erros)}/{len(QUASE_ACERTOS)} quase-acertos acham o comando, "
+          f"{len(falsos)}/{len(negativas)} palavras comuns viram comando")
+    for linha in erros: print(f"  perdido: {linha}")
+    for linha in falsos: print(f"  falso positivo: {linha}")
+
+if __name__ == '__main__':
+    main()
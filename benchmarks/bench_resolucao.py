@@ -0,0 +1,91 @@
+"""
+Custo de desenho por frame: 1920x1080 nativo versus resolução lógica 800x600
+ampliada uma vez por frame (pelo SDL com pygame.SCALED, ou por transform.scale).
+
+Cada modo roda num processo próprio, porque a resolução é fixada quando o
+jogo.py é importado. A partida é simulada (bot + relógio simulado) e cada
+frame é desenhado e apresentado como no game_loop. Também mostra a memória das
+animações e do cenário em cada modo.
+
+Por padrão usa o driver de vídeo "dummy" (sem janela), em que o modo 'sdl'
+amplia no renderer de software do SDL para o "desktop" falso do driver (1024x768),
+não para 1920x1080: a coluna da janela mostra o tamanho real. Só com --janela,
+numa máquina com display, o modo 'sdl' amplia na GPU para a tela cheia do monitor.
+
+Uso: python benchmarks/bench_resolucao.py [--frames N] [--janela]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODOS = (
+    ('nativo 1920x1080', []),
+    ('800x600 + SDL (tela cheia)', ['--logica', '800x600', '--upscale', 'sdl']),
+    ('800x600 + transform.scale', ['--logica', '800x600', '--upscale', 'software']),
+)
+
+def medir_modo(frames):
+    """Roda dentro do processo filho, com o sys.argv já apontando o modo."""
+    sys.path.insert(0, RAIZ)
+    os.chdir(RAIZ)
+    import random
+    import jogo
+
+    anim_manager = jogo.AnimationManager()
+    anim_manager.load_animations(jogo.ANIMACOES_DO_JOGO)
+    game_state = jogo.GameState(None); game_state.player_name = "bench"; game_state.estado = "JOGANDO"
+    world = jogo.GameWorld(game_state, anim_manager, random.Random(1))
+    desenho = apresentacao = 0.0
+    for frame in range(frames):
+        if frame % 10 == 0:
+            cmd = jogo._comando_do_bot(world)
+            if cmd: world.queue_spell(cmd)
+        world.update(jogo.PASSO_FIXO)
+        if game_state.estado != "JOGANDO":
+            game_state.estado = "JOGANDO"; world = jogo.GameWorld(game_state, anim_manager, random.Random(frame))
+        inicio = time.perf_counter()
+        jogo.renderer.begin_frame(jogo.tela)
+        rects = world.draw(jogo.tela, False, 0.5)
+        meio = time.perf_counter()
+        jogo.renderer.present(rects)
+        fim = time.perf_counter()
+        desenho += meio - inicio; apresentacao += fim - meio
+    frames_bytes = sum(f.get_width() * f.get_height() * f.get_bytesize()
+                       for frames_anim in anim_manager.animations.values() for f in frames_anim)
+    cenario_bytes = jogo.cenario_img.get_width() * jogo.cenario_img.get_height() * jogo.cenario_img.get_bytesize()
+    print(json.dumps({'desenho_ms': desenho / frames * 1000, 'apresentacao_ms': apresentacao / frames * 1000,
+                      'logica': list(jogo.tela.get_size()), 'janela': list(jogo.pygame.display.get_window_size()),
+                      'memoria_kb': (frames_bytes + cenario_bytes + jogo.tela.get_width() * jogo.tela.get_height() * 4) / 1024}))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--janela', action='store_true', help="usa o driver de vídeo real em vez do dummy")
+    parser.add_argument('--filho', action='store_true', help=argparse.SUPPRESS)
+    args, resto = parser.parse_known_args()
+    if args.filho:
+        sys.argv = ['jogo.py'] + resto
+        medir_modo(args.frames)
+        return
+
+    env = dict(os.environ)
+    if not args.janela:
+        env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    print(f"{'modo':<28} | {'lógica':>9} | {'janela':>9} | {'desenho (ms)':>12} | {'apresentar (ms)':>15} | {'total (ms)':>10} | {'memória (KB)':>12}")
+    print("-" * 116)
+    for nome, opcoes in MODOS:
+        saida = subprocess.run([sys.executable, os.path.abspath(__file__), '--filho', '--frames', str(args.frames)] + opcoes,
+                               env=env, capture_output=True, text=True, check=True).stdout
+        r = json.loads(saida.strip().splitlines()[-1])
+        logica, janela = (f"{l}x{a}" for l, a in (r['logica'], r['janela']))
+        print(f"{nome:<28} | {logica:>9} | {janela:>9} | {r['desenho_ms']:>12.3f} | {r['apresentacao_ms']:>15.3f} | "
+              f"{r['desenho_ms'] + r['apresentacao_ms']:>10.3f} | {r['memoria_kb']:>12.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+"""
+Suíte de benchmarks dos caminhos quentes, com baseline e limite de regressão.
+
+Cada medida é um tempo (menor é melhor), o melhor de algumas repetições:
+
+  texto.*    _normalize_ascii e process_voice_command (com e sem o cache do matcher)
+  placar.*   ScoreManager com 100, 10 mil e 1 milhão de pontuações: abrir (carregar
+             o top-K), save_score (a chamada, que não bloqueia), save_score até
+             gravar, e rank()
+  assets.*   AnimationManager.load_animation_from_folder a frio (sem cache)
+  entidades.* construção de um Monstro
+  tick.*     um GameWorld.update com N monstros (modo horda) e o bot lançando
+             feitiços, nos motores de sprites e soa
+  voz.*      PyRecognition (sem navegador): receber um evento e esvaziar com
+             get_all_pending() a fila cheia
+
+Os resultados saem em JSON (--saida) e são comparados com o baseline: uma medida
+mais de `--tolerancia` (fração, padrão 0.25) acima do baseline é regressão e o
+script termina com código 1. --limite NOME=FRAÇÃO muda a tolerância de uma medida
+(ou de um prefixo, ex: tick=0.1); o baseline também pode guardar "tolerancias" e
+"pisos", a diferença absoluta (na unidade da medida) abaixo da qual não há
+regressão.
+
+Máquinas compartilhadas mudam de velocidade ao longo de minutos, e todas as
+medidas juntas. Antes e depois de cada grupo a suíte mede uma carga fixa de
+Python puro (calibracao.GRUPO_us; o placar, que é longo, tem também uma por
+tamanho); na comparação o baseline é escalado pela razão entre a calibração de
+agora e a do baseline, e a tolerância vale para o que sobra.
+
+A suíte roda --rodadas vezes (padrão: as do baseline, ou 5) e fica com a mediana
+de cada medida, o que filtra tanto uma rodada atrapalhada por outro processo
+quanto uma sorte isolada. Uma medida acima da tolerância é medida de novo, com
+o mesmo número de rodadas, e só é regressão se a mediana de todas continuar
+acima. Baselines são por máquina: gere um com --salvar-baseline, que grava as
+rodadas usadas para a comparação repetir.
+
+Uso: python benchmarks/suite.py [--so PREFIXO] [--rapido] [--saida ARQ.json]
+                                [--baseline ARQ.json] [--salvar-baseline]
+                                [--tolerancia 0.25] [--limite NOME=FRAÇÃO ...] [--rodadas N]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import jogo
+from comandos import COMANDOS_MAP, CommandMatcher, _normalize_ascii
+from PyRecognition import PyRecognition
+from score_store import ScoreManager
+
+BASELINE_PADRAO = os.path.join(RAIZ, 'benchmarks', 'baseline.json')
+TRANSCRICOES = ["fogo gelo raio", "lança fogo agora", "gelo gelo", "relâmpago e trovão", "começar o jogo",
+                "voltar para o menu", "quero ver o placar", "hmm não sei", "fogu jelo raiu", "congelá tudo"]
+
+def melhor_us(func, numero, repeticoes=5):
+    """Melhor tempo por chamada, em microssegundos."""
+    return min(timeit.repeat(func, number=numero, repeat=repeticoes)) / numero * 1e6
+
+def _carga_fixa():
+    contagem = {}
+    for i in range(2000): contagem[i % 97] = contagem.get(i % 97, 0) + i
+    return sorted(contagem.values())
+
+def calibracao_us():
+    """Tempo de uma carga fixa de Python puro: a velocidade da máquina neste momento."""
+    return melhor_us(_carga_fixa, 20)
+
+# --- Medidas ---
+def bench_texto():
+    entradas = TRANSCRICOES * 10
+    sem_cache = CommandMatcher(COMANDOS_MAP, cache_size=0)
+    return {
+        'texto.normalize_ascii_us': melhor_us(lambda: [_normalize_ascii(t) for t in entradas], 20) / len(entradas),
+        'texto.process_voice_command_us': melhor_us(lambda: [jogo.process_voice_command(t) for t in entradas], 20) / len(entradas),
+        'texto.matcher_sem_cache_us': melhor_us(lambda: [sem_cache.match(t) for t in entradas], 20) / len(entradas),
+    }
+
+def bench_placar(rapido):
+    resultados = {}
+    for total, nome in ((100, '100'), (10_000, '10k'), (1_000_000, '1M')):
+        if rapido and total > 10_000: continue
+        antes = calibracao_us()
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, 'scores.db')
+            rng = random.Random(total)
+            placar = ScoreManager(caminho, legacy_json=None)
+            placar.save_many((f"j{rng.randrange(5000)}", rng.randrange(100_000)) for _ in range(total))
+            placar.close()
+            aberturas = []
+            for _ in range(3):
+                inicio = time.perf_counter()
+                placar = ScoreManager(caminho, legacy_json=None)
+                aberturas.append(time.perf_counter() - inicio)
+                if len(aberturas) < 3: placar.close()
+            resultados[f'placar.{nome}.abrir_ms'] = min(aberturas) * 1000
+            chamadas, gravados = [], []
+            for _ in range(3):  # a gravação passa pelo disco: o melhor de 3 lotes
+                pontos = [rng.randrange(100_000) for _ in range(200)]
+                inicio = time.perf_counter()
+                for p in pontos: placar.save_score("bench", p)
+                chamadas.append(time.perf_counter() - inicio)
+                placar.flush()
+                gravados.append(time.perf_counter() - inicio)
+            resultados[f'placar.{nome}.save_score_us'] = min(chamadas) / len(pontos) * 1e6
+            resultados[f'placar.{nome}.save_gravado_us'] = min(gravados) / len(pontos) * 1e6
+            resultados[f'placar.{nome}.rank_ms'] = melhor_us(lambda: placar.rank(50_000), 5, 3) / 1000
+            placar.close()
+        resultados[f'calibracao.placar.{nome}_us'] = (antes + calibracao_us()) / 2  # o grupo é longo: uma por tamanho
+    return resultados
+
+def bench_assets():
+    def carga_fria():
+        jogo.AnimationManager().load_animation_from_folder('monstro_fogo', jogo.pasta_monstro_fogo_anim, (80, 80))
+    return {'assets.animacao_fria_ms': melhor_us(carga_fria, 1, 3) / 1000}
+
+def bench_entidades(anim_manager):
+    rng = random.Random(1)
+    return {'entidades.monstro_us': melhor_us(lambda: jogo.Monstro(5, anim_manager, rng), 500)}
+
+def bench_tick(anim_manager):
+    resultados = {}
+    for motor, classe in (('sprites', jogo.GameWorld), ('soa', jogo.SoAGameWorld if jogo.entity_store else None)):
+        if classe is None: continue
+        for horda in (50, 500):
+            medianas = []
+            for repeticao in range(3):
+                game_state = jogo.GameState(None); game_state.estado = "JOGANDO"
+                world = classe(game_state, anim_manager, random.Random(horda), horda=horda)
+                tempos = []
+                for tick in range(120):
+                    if tick % 5 == 0 and (cmd := jogo._comando_do_bot(world)): world.queue_spell(cmd)
+                    inicio = time.perf_counter()
+                    world.update(jogo.PASSO_FIXO)
+                    tempos.append(time.perf_counter() - inicio)
+                world.close()
+                tempos = sorted(tempos[1:])  # o primeiro passo só enche a tela
+                medianas.append(tempos[len(tempos) // 2])
+            resultados[f'tick.{motor}.{horda}_us'] = min(medianas) * 1e6
+    return resultados
+
+class _ReconhecedorSemNavegador(PyRecognition):
+    """PyRecognition sem Chrome nem servidor: os eventos entram direto por _on_browser_event."""
+    def _setup_driver(self): pass
+    def _start_recognition_loop(self): self.is_running = True
+
+def bench_voz():
+    reconhecedor = _ReconhecedorSemNavegador('pt-BR', transport='selenium')
+    seq = iter(range(10**9))
+    def evento():
+        n = next(seq)
+        return {'seq': n, 'session': 1, 'language': 'pt-BR', 'timestamp': 0,
+                'results': [{'index': n, 'stable': ['fogo', 'gelo'], 'unstable': [], 'isFinal': True}]}
+    por_evento = float('inf')
+    for _ in range(5):
+        eventos = [evento() for _ in range(500)]
+        inicio = time.perf_counter()
+        for e in eventos: reconhecedor._on_browser_event(e)
+        por_evento = min(por_evento, (time.perf_counter() - inicio) / len(eventos) * 1e6)
+        reconhecedor.get_all_pending()
+    drenagens = []
+    for _ in range(20):
+        for _ in range(reconhecedor.speech_queue.maxlen * 2): reconhecedor._on_browser_event(evento())  # inunda
+        inicio = time.perf_counter()
+        reconhecedor.get_all_pending()
+        drenagens.append(time.perf_counter() - inicio)
+    reconhecedor.stop()
+    return {'voz.evento_us': por_evento, 'voz.drain_fila_cheia_us': min(drenagens) * 1e6}
+
+def rodar(filtro, rapido):
+    anim_manager = jogo.AnimationManager()
+    anim_manager.load_animations(jogo.ANIMACOES_DO_JOGO)
+    grupos = (('texto', bench_texto), ('placar', lambda: bench_placar(rapido)), ('assets', bench_assets),
+              ('entidades', lambda: bench_entidades(anim_manager)), ('tick', lambda: bench_tick(anim_manager)),
+              ('voz', bench_voz))
+    resultados = {}
+    for nome, bench in grupos:
+        if filtro and not any(nome.startswith(f) or f.startswith(nome) for f in filtro): continue
+        antes = calibracao_us()
+        medidas = bench()
+        resultados[f'calibracao.{nome}_us'] = (antes + calibracao_us()) / 2
+        resultados.update({k: v for k, v in medidas.items() if not filtro or any(k.startswith(f) for f in filtro)})
+    return resultados
+
+# --- Comparação ---
+def tolerancia_de(nome, tolerancia, limites):
+    """A do maior prefixo de `nome` em limites, senão a global."""
+    prefixos = [p for p in limites if nome == p or nome.startswith(p + '.') or nome.startswith(p + '_')]
+    return limites[max(prefixos, key=len)] if prefixos else tolerancia
+
+def velocidade(resultados, baseline, nome):
+    """Quanto a máquina está mais lenta (> 1) ou mais rápida que no baseline, pela calibração mais próxima de `nome`."""
+    partes = nome.split('.')
+    for n in range(len(partes) - 1, 0, -1):  # placar.10k.rank_ms: calibracao.placar.10k_us, depois calibracao.placar_us
+        chave = f"calibracao.{'.'.join(partes[:n])}_us"
+        atual, base = resultados.get(chave), baseline.get('resultados', {}).get(chave)
+        if atual and base: return atual / base
+    return 1.0
+
+def comparar(resultados, baseline, tolerancia, limites, pisos=None):
+    """[(nome, atual, base, variação, tolerância, regrediu)] das medidas presentes nos dois; a variação já desconta a velocidade da máquina."""
+    pisos, linhas = pisos or {}, []
+    for nome, atual in resultados.items():
+        base = baseline.get('resultados', {}).get(nome)
+        if nome.startswith('calibracao.'): continue
+        if base is None:
+            linhas.append((nome, atual, None, None, None, False)); continue
+        limite = tolerancia_de(nome, tolerancia, limites)
+        base *= velocidade(resultados, baseline, nome)
+        variacao = atual / base - 1 if base else 0.0
+        linhas.append((nome, atual, base, variacao, limite, variacao > limite and atual - base > tolerancia_de(nome, 0.0, pisos)))
+    return linhas
+
+def ambiente():
+    return {'python': platform.python_version(), 'plataforma': platform.platform(), 'processador': platform.processor(),
+            'cpus': os.cpu_count(), 'data': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes, comparados com um baseline")
+    parser.add_argument('--so', action='append', default=[], metavar='PREFIXO', help="roda só as medidas com este prefixo (ex: tick, placar.10k)")
+    parser.add_argument('--rapido', action='store_true', help="pula o placar com 1 milhão de pontuações")
+    parser.add_argument('--saida', metavar='ARQUIVO', help="grava os resultados em JSON")
+    parser.add_argument('--baseline', default=BASELINE_PADRAO, metavar='ARQUIVO')
+    parser.add_argument('--salvar-baseline', action='store_true', help="grava os resultados como o novo baseline em vez de comparar")
+    parser.add_argument('--tolerancia', type=float, help="regressão máxima aceita, como fração do baseline (padrão 0.25)")
+    parser.add_argument('--limite', action='append', default=[], metavar='NOME=FRAÇÃO', help="tolerância de uma medida ou prefixo")
+    parser.add_argument('--rodadas', type=int, metavar='N', help="roda a suíte N vezes e fica com a mediana de cada medida (padrão: as do baseline, ou 5)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f: baseline = json.load(f)
+    rodadas = max(1, args.rodadas or baseline.get('rodadas', 5))
+    valores = {}
+    for _ in range(rodadas):
+        for nome, valor in rodar(args.so, args.rapido).items():
+            valores.setdefault(nome, []).append(valor)
+    resultados = {nome: statistics.median(v) for nome, v in valores.items()}
+    saida = {'ambiente': ambiente(), 'rodadas': rodadas, 'resultados': resultados}
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f: json.dump(saida, f, ensure_ascii=False, indent=1)
+
+    if args.salvar_baseline:
+        if 'tolerancia' in baseline: saida['tolerancia'] = baseline['tolerancia']
+        saida['tolerancias'] = baseline.get('tolerancias', {})
+        saida['pisos'] = baseline.get('pisos', {})
+        saida['resultados'] = {**baseline.get('resultados', {}), **resultados}  # --so atualiza só parte
+        with open(args.baseline, 'w', encoding='utf-8') as f: json.dump(saida, f, ensure_ascii=False, indent=1)
+        for nome, valor in resultados.items(): print(f"{nome:<34} {valor:>12.3f}")
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"Sem baseline em {args.baseline}: só mostrando os resultados (gere um com --salvar-baseline).")
+    limites = dict(baseline.get('tolerancias', {}))
+    for item in args.limite:
+        nome, _, valor = item.partition('=')
+        limites[nome] = float(valor)
+    tolerancia = args.tolerancia if args.tolerancia is not None else baseline.get('tolerancia', 0.25)
+
+    linhas = comparar(resultados, baseline, tolerancia, limites, baseline.get('pisos'))
+    suspeitas = [linha[0] for linha in linhas if linha[-1]]
+    if suspeitas:
+        # Uma rodada ruim pesa menos na mediana de mais rodadas; regressão de verdade continua lá.
+        print(f"Confirmando {len(suspeitas)} medida(s) acima da tolerância com mais {rodadas} rodada(s)...")
+        for _ in range(rodadas):
+            for nome, valor in rodar(suspeitas, args.rapido).items():
+                valores[nome].append(valor)
+        resultados = {nome: statistics.median(v) for nome, v in valores.items()}
+        linhas = comparar(resultados, baseline, tolerancia, limites, baseline.get('pisos'))
+
+    regressoes = 0
+    print(f"{'medida':<34} | {'atual':>12} | {'baseline*':>12} | {'variação':>9} | {'limite':>7}")
+    print("-" * 87)
+    for nome, atual, base, variacao, limite, regrediu in linhas:
+        if base is None:
+            print(f"{nome:<34} | {atual:>12.3f} | {'-':>12} | {'-':>9} | {'-':>7}"); continue
+        regressoes += regrediu
+        print(f"{nome:<34} | {atual:>12.3f} | {base:>12.3f} | {variacao:>+8.0%} | {limite:>6.0%}{'  REGRESSÃO' if regrediu else ''}")
+    print("* baseline corrigido pela calibração do grupo (a máquina agora vs quando o baseline foi gravado):",
+          ", ".join(f"{n[len('calibracao.'):-3]} {v / baseline['resultados'][n]:.2f}x" for n, v in sorted(resultados.items())
+                    if n.startswith('calibracao.') and n in baseline.get('resultados', {})) or "sem calibração")
+    if baseline and baseline.get('ambiente', {}).get('plataforma') != platform.platform():
+        print("Aviso: o baseline foi gerado em outra máquina; os tempos podem não ser comparáveis.")
+    if regressoes:
+        print(f"{regressoes} medida(s) acima da tolerância.")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,322 @@
+import time
+import unicodedata
+from collections import OrderedDict
+
+# --- VOCABULÁRIO DE COMANDOS ---
+# Comando canônico -> sinônimos aceitos (já normalizados em ASCII minúsculo).
+COMANDOS_MAP = {
+    "fogo": ["fogo", "fire", "chama", "queimar"],
+    "gelo": ["gelo", "ice", "congelar", "frio"],
+    "raio": ["raio", "thunder", "trovao", "eletrico", "relampago", "rai"],
+    "comecar": ["comecar", "iniciar", "start", "jogar"],
+    "pontuacao": ["pontuacao", "scores", "placar"],
+    "voltar": ["voltar", "menu", "retornar"],
+    "parar": ["parar", "stop", "sair", "quit"]
+}
+
+def _normalize_ascii(texto: str) -> str:
+    if not texto: return ""
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii').lower()
+
+# --- CORRESPONDÊNCIA APROXIMADA ---
+# Grafias com o mesmo som (aplicadas em ordem, antes das regras por letra).
+_DIGRAFOS = (("ch", "x"), ("sh", "x"), ("lh", "li"), ("nh", "ni"), ("ph", "f"), ("th", "t"),
+             ("qu", "k"), ("gue", "ghe"), ("gui", "ghi"), ("sc", "s"), ("ss", "s"), ("rr", "r"))
+_VOGAIS = "aeiou"
+# Trocas que o reconhecimento de voz costuma fazer: custam metade de uma troca qualquer.
+_TROCAS_PARECIDAS = {(a, b) for par in ("bp", "dt", "fv", "gk", "gj", "sx", "sj", "mn", "lr", "lu") for a, b in (par, par[::-1])} | \
+                    {(a, b) for a in _VOGAIS for b in _VOGAIS if a != b}
+
+def chave_fonetica(palavra):
+    """
+    Chave fonética aproximada do português para uma palavra já normalizada:
+    grafias diferentes do mesmo som viram a mesma chave ("gelo" e "jelo" ->
+    "jelu", "fogo" e "fogu" -> "fogu", "raio" e "raiu" -> "raiu").
+    """
+    for de, para in _DIGRAFOS:
+        if de in palavra: palavra = palavra.replace(de, para)
+    chave, n = [], len(palavra)
+    for i, ch in enumerate(palavra):
+        prox = palavra[i + 1] if i + 1 < n else ""
+        final = i == n - 1 or (i == n - 2 and prox == "s")
+        if ch == "h": continue                                  # mudo (ou marca de "gue"/"gui")
+        elif ch == "c": ch = "s" if prox in ("e", "i") else "k"
+        elif ch == "g": ch = "j" if prox in ("e", "i") else "g"
+        elif ch == "q": ch = "k"
+        elif ch == "z": ch = "s"
+        elif ch == "w": ch = "v"
+        elif ch == "y": ch = "i"
+        elif ch == "o" and final: ch = "u"                      # "fogo" soa "fogu"
+        elif ch == "e" and final: ch = "i"
+        elif ch == "m" and (not prox or prox not in _VOGAIS): ch = "n"  # nasal
+        if not chave or chave[-1] != ch: chave.append(ch)
+    return "".join(chave)
+
+def _delecoes_a_partir(chave, i, max_delecoes):
+    """Variantes de `chave` em que a primeira letra apagada é a i-ésima: [(variante, posições apagadas)]."""
+    uma = chave[:i] + chave[i + 1:]
+    variantes = [(uma, (i,))]
+    if max_delecoes > 1:
+        variantes.extend((uma[:j] + uma[j + 1:], (i, j + 1)) for j in range(i, len(uma)))
+    return variantes
+
+def _delecoes(chave, max_delecoes):
+    """A chave e as variantes com até `max_delecoes` (1 ou 2) letras apagadas. Pode repetir variantes."""
+    variantes = [(chave, ())]
+    for i in range(len(chave)): variantes += _delecoes_a_partir(chave, i, max_delecoes)
+    return variantes
+
+def _no_maximo_uma_edicao(a, b):
+    """Se `a` vira `b` com no máximo uma troca, inserção ou remoção de letra."""
+    if abs(len(a) - len(b)) > 1: return False
+    if len(a) > len(b): a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]: i += 1
+    return a[i + 1:] == b[i + 1:] if len(a) == len(b) else a[i:] == b[i + 1:]
+
+def custo_alinhado(a, apagadas_a, b, apagadas_b):
+    """
+    Custo de edição entre `a` e `b` quando apagar as posições `apagadas_a` de
+    `a` e `apagadas_b` de `b` dá a mesma variante: letras apagadas no mesmo ponto
+    da variante são uma troca (0.5 se for uma troca parecida, 1 senão, 0 se a
+    letra for a mesma); as que sobram são inserções/remoções de custo 1.
+    """
+    custo, i, j = 0.0, 0, 0
+    while i < len(apagadas_a) and j < len(apagadas_b):
+        pa, pb = apagadas_a[i], apagadas_b[j]
+        ponto_a, ponto_b = pa - i, pb - j  # onde a letra apagada ficaria na variante
+        if ponto_a == ponto_b:
+            ca, cb = a[pa], b[pb]
+            custo += 0.0 if ca == cb else (0.5 if (ca, cb) in _TROCAS_PARECIDAS else 1.0)
+            i += 1; j += 1
+        elif ponto_a < ponto_b: custo += 1; i += 1
+        else: custo += 1; j += 1
+    return custo + (len(apagadas_a) - i) + (len(apagadas_b) - j)
+
+class FuzzyCommandIndex:
+    """
+    Índice aproximado dos sinônimos, consultado pelo CommandMatcher quando a
+    busca exata não acha nada numa palavra.
+
+    Cada sinônimo entra pela sua chave_fonetica(). lookup(palavra) tenta primeiro
+    a chave exata (um acesso a dict) e, para chaves com `tamanho_minimo` a
+    `tamanho_maximo` letras, as chaves a até `max_delecoes` edições, por um índice
+    de deleções simétricas: as variantes de cada chave com letras apagadas são
+    pré-computadas na construção, a consulta gera as da palavra (no máximo ~80)
+    e o custo de cada candidata sai das posições apagadas (custo_alinhado), sem
+    matriz de distância. O trabalho por palavra não cresce com o vocabulário.
+
+    Confiança: 0.9 para a mesma chave fonética e 0.9 * (1 - custo / tamanho da
+    maior chave) para as aproximadas; abaixo de `confianca_minima` não há match.
+    (1.0 fica para o match exato do CommandMatcher.) Palavras curtas colidem
+    demais com a fala comum ("kit" tem a chave de "quit", "placa" fica a uma
+    letra de "placar"): se a chave da palavra ou a do sinônimo tem até
+    `tamanho_curto` letras, o match pede `confianca_curta` e que a palavra esteja
+    a no máximo uma letra trocada, inserida ou removida de um sinônimo com
+    aquela chave (ver aceita()). Uma consulta que passa de
+    `orcamento_us` microssegundos para e devolve o melhor achado até ali.
+    Palavras repetidas são respondidas por um cache LRU.
+    """
+    CONFIANCA_FONETICA = 0.9
+
+    def __init__(self, sinonimos, comando_por_sinonimo, confianca_minima=0.75, orcamento_us=100,
+                 max_delecoes=2, tamanho_minimo=5, tamanho_maximo=12, cache_size=1024,
+                 tamanho_curto=5, confianca_curta=0.85):
+        self.confianca_minima = confianca_minima
+        self.tamanho_curto, self.confianca_curta = tamanho_curto, confianca_curta
+        self.orcamento_ns = int(orcamento_us * 1000)
+        self.max_delecoes = max_delecoes
+        self.tamanho_minimo, self.tamanho_maximo = tamanho_minimo, tamanho_maximo
+        self.por_chave = {}    # chave -> comando do sinônimo de maior prioridade
+        self.prioridade = {}   # chave -> posição desse sinônimo no vocabulário
+        self.sinonimos_por_chave = {}  # chave -> todos os sinônimos com ela
+        for prioridade, sinonimo in enumerate(sinonimos):
+            chave = chave_fonetica(sinonimo)
+            if chave: self.sinonimos_por_chave.setdefault(chave, []).append(sinonimo)
+            if chave and chave not in self.por_chave:
+                self.por_chave[chave], self.prioridade[chave] = comando_por_sinonimo[sinonimo], prioridade
+        self.delecoes = {}     # variante -> [(chave, posições apagadas)]
+        for chave in self.por_chave:
+            if len(chave) >= self.tamanho_minimo - self.max_delecoes:
+                for variante, apagadas in _delecoes(chave, self.max_delecoes):
+                    self.delecoes.setdefault(variante, []).append((chave, apagadas))
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.consultas = self.estouros = 0
+
+    def lookup(self, palavra):
+        """(comando, confiança) da palavra já normalizada, ou None."""
+        self.consultas += 1
+        cache = self._cache
+        if palavra in cache:
+            cache.move_to_end(palavra)
+            return cache[palavra]
+        achado = self._lookup(palavra)
+        if self.cache_size > 0:
+            cache[palavra] = achado
+            if len(cache) > self.cache_size: cache.popitem(last=False)
+        return achado
+
+    def _lookup(self, palavra):
+        chave = chave_fonetica(palavra)
+        comando = self.por_chave.get(chave)
+        if comando is not None:
+            # Uma chave curta recusada aqui também não passaria como aproximada.
+            return (comando, self.CONFIANCA_FONETICA) if self.aceita(palavra, chave, chave, self.CONFIANCA_FONETICA) else None
+        if not self.tamanho_minimo <= len(chave) <= self.tamanho_maximo:
+            return None
+        prazo = time.perf_counter_ns() + self.orcamento_ns
+        custos, delecoes = {}, self.delecoes  # candidata -> menor custo achado
+        # As variantes de _delecoes(), geradas por primeira letra apagada para conferir o prazo a cada grupo.
+        for i in range(-1, len(chave)):
+            for variante, apagadas in (_delecoes_a_partir(chave, i, self.max_delecoes) if i >= 0 else ((chave, ()),)):
+                for candidata, apagadas_candidata in delecoes.get(variante, ()):
+                    custo = custo_alinhado(chave, apagadas, candidata, apagadas_candidata)
+                    if custo < custos.get(candidata, custo + 1): custos[candidata] = custo
+            if time.perf_counter_ns() > prazo:
+                self.estouros += 1
+                break
+        melhor = None
+        for candidata, custo in custos.items():
+            confianca = self.CONFIANCA_FONETICA * (1 - custo / max(len(chave), len(candidata)))
+            ordem = (-confianca, self.prioridade[candidata])
+            if (melhor is None or ordem < melhor[0]) and self.aceita(palavra, chave, candidata, confianca):
+                melhor = (ordem, candidata, confianca)
+        if melhor is None:
+            return None
+        return self.por_chave[melhor[1]], melhor[2]
+
+    def aceita(self, palavra, chave, candidata, confianca):
+        """Se `palavra` (de chave `chave`) pode casar com a chave `candidata` com essa confiança."""
+        if min(len(chave), len(candidata)) > self.tamanho_curto:
+            return confianca >= self.confianca_minima
+        return confianca >= self.confianca_curta and any(_no_maximo_uma_edicao(palavra, s) for s in self.sinonimos_por_chave[candidata])
+
+    def stats(self):
+        return {"chaves": len(self.por_chave), "variantes": len(self.delecoes),
+                "consultas": self.consultas, "estouros": self.estouros}
+
+class CommandMatcher:
+    """
+    Identifica comandos canônicos numa transcrição com um autômato Aho-Corasick
+    construído uma única vez a partir do vocabulário.
+
+    Semântica idêntica à busca original: para cada palavra falada, o primeiro
+    sinônimo (na ordem do vocabulário) que aparece como substring da palavra
+    define o comando. O custo por palavra depende só do tamanho da palavra, não
+    do número de sinônimos. Transcrições normalizadas repetidas (muito comuns nos
+    resultados parciais) são respondidas por um cache LRU limitado.
+
+    Com fuzzy=True, palavras sem nenhum sinônimo exato ainda podem casar por
+    aproximação ("fogu", "jelo", "raiu"), pelo FuzzyCommandIndex; match_scored()
+    diz a confiança de cada comando. match(..., aproximado=False) fica só com os
+    exatos (confiança 1.0), para os menus, onde palavras comuns como "placas" e
+    "voltas" ficariam a uma letra de "placar" e "voltar".
+    """
+
+    def __init__(self, comandos_map, cache_size=512, fuzzy=True):
+        # Mesma construção do mapa reverso original: em sinônimos repetidos o
+        # último comando vence, mas a prioridade é a da primeira aparição.
+        self.sinonimo_map = {s: cmd for cmd, sl in comandos_map.items() for s in sl if s}
+        self.sinonimos = list(self.sinonimo_map.keys())
+        self._comando_por_prioridade = [self.sinonimo_map[s] for s in self.sinonimos]
+        self._build_automaton()
+        self.fuzzy = FuzzyCommandIndex(self.sinonimos, self.sinonimo_map) if fuzzy else None
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _build_automaton(self):
+        sem_match = len(self.sinonimos)
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [sem_match]  # menor prioridade de sinônimo que termina no nó
+
+        for prioridade, sinonimo in enumerate(self.sinonimos):
+            node = 0
+            for ch in sinonimo:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({}); self._fail.append(0); self._best.append(sem_match)
+                node = nxt
+            self._best[node] = min(self._best[node], prioridade)
+
+        # BFS para os links de falha; cada nó herda o melhor match do seu sufixo.
+        fila = list(self._goto[0].values())
+        for node in fila:
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._best[nxt] = min(self._best[nxt], self._best[self._fail[nxt]])
+                fila.append(nxt)
+
+    def match_word(self, palavra):
+        """Retorna o comando canônico da palavra (já normalizada) ou None."""
+        goto, fail, best_of = self._goto, self._fail, self._best
+        state, best = 0, len(self.sinonimos)
+        for ch in palavra:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            b = best_of[state]
+            if b < best:
+                best = b
+                if best == 0: break
+        if best < len(self.sinonimos):
+            return self._comando_por_prioridade[best]
+        return None
+
+    def match_word_scored(self, palavra):
+        """(comando, confiança) da palavra já normalizada: 1.0 no match exato, senão o do índice aproximado. Ou None."""
+        cmd = self.match_word(palavra)
+        if cmd is not None:
+            return cmd, 1.0
+        if self.fuzzy is not None:
+            return self.fuzzy.lookup(palavra)
+        return None
+
+    def match(self, command, aproximado=True):
+        """Lista de comandos canônicos identificados, um por palavra reconhecida; sem `aproximado`, só os exatos."""
+        return [cmd for cmd, confianca in self.match_scored(command) if aproximado or confianca == 1.0]
+
+    def match_scored(self, command):
+        """Como match(), mas com a confiança de cada comando: [(comando, confiança)]."""
+        if not command:
+            return []
+        chave = _normalize_ascii(command)
+        cache = self._cache
+        cached = cache.get(chave)
+        if cached is not None:
+            cache.move_to_end(chave)
+            self.hits += 1
+            return list(cached)
+
+        self.misses += 1
+        comandos = []
+        for palavra in chave.split():
+            achado = self.match_word_scored(palavra)
+            if achado is not None:
+                comandos.append(achado)
+
+        if self.cache_size > 0:
+            cache[chave] = tuple(comandos)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return comandos
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "max_size": self.cache_size}
+
+    def clear_cache(self):
+        self._cache.clear()
+        if self.fuzzy is not None: self.fuzzy._cache.clear()
+        self.hits = self.misses = 0
+
+# Matcher padrão, construído uma única vez na importação.
+command_matcher = CommandMatcher(COMANDOS_MAP)
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+
+
+class CommandBus:
+    """
+    Fila limitada e thread-safe de comandos com o instante de chegada.
+
+    put() pode ser chamado de qualquer thread; cheia, a fila descarta o comando
+    mais antigo. Na saída (pop() ou drain()) duas políticas evitam que um
+    acúmulo vire feitiços disparados muito depois da fala:
+
+    max_idade        comandos mais velhos que isso (em segundos) expiram.
+    coalescer_apos   um comando mais velho que isso é fundido no próximo com a
+                     mesma chave, se houver um na fila (ex: "fogo fogo fogo" dito
+                     enquanto a fila estava travada vira um "fogo" só).
+
+    Qualquer das duas pode ser None (desligada). A idade conta a partir do
+    `instante` passado a put() (no relógio `clock`), que por padrão é o de agora:
+    um comando que já passou por outra fila entra com o instante da origem e não
+    rejuvenesce no caminho. drain() pega tudo com uma única
+    aquisição do lock. ao_descartar(item, motivo) é chamado para cada comando
+    perdido por 'cheia', 'expirado' ou 'coalescido', fora do lock.
+    """
+
+    def __init__(self, maxlen=64, max_idade=None, coalescer_apos=None, clock=time.perf_counter, ao_descartar=None):
+        self.maxlen = maxlen
+        self.max_idade = max_idade
+        self.coalescer_apos = coalescer_apos
+        self.clock = clock
+        self.ao_descartar = ao_descartar
+        self._fila = deque()      # (instante, chave, item)
+        self._chaves = {}         # chave -> quantas entradas na fila
+        self._lock = threading.Lock()
+        self.recebidos = self.entregues = 0
+        self.descartados = {'cheia': 0, 'expirado': 0, 'coalescido': 0}
+
+    def __len__(self):
+        return len(self._fila)
+
+    def put(self, item, chave=None, instante=None):
+        entrada = (self.clock() if instante is None else instante, chave, item)
+        perdido = None
+        with self._lock:
+            if len(self._fila) >= self.maxlen:
+                perdido = self._fila.popleft(); self._forget(perdido[1]); self.descartados['cheia'] += 1
+            self._fila.append(entrada)
+            self._chaves[chave] = self._chaves.get(chave, 0) + 1
+            self.recebidos += 1
+        if perdido is not None and self.ao_descartar is not None:
+            self.ao_descartar(perdido[2], 'cheia')
+
+    def _forget(self, chave):
+        n = self._chaves[chave] - 1
+        if n: self._chaves[chave] = n
+        else: del self._chaves[chave]
+
+    def _motivo_descarte(self, agora, instante, chave, ha_mais_novo):
+        idade = agora - instante
+        if self.max_idade is not None and idade > self.max_idade:
+            return 'expirado'
+        if self.coalescer_apos is not None and idade > self.coalescer_apos and ha_mais_novo:
+            return 'coalescido'
+        return None
+
+    def pop(self):
+        """Próximo comando válido, ou None se a fila esvaziou."""
+        perdidos, item = [], None
+        with self._lock:
+            agora = self.clock()
+            while self._fila:
+                instante, chave, candidato = self._fila.popleft(); self._forget(chave)
+                motivo = self._motivo_descarte(agora, instante, chave, chave in self._chaves)
+                if motivo is None:
+                    item = candidato; self.entregues += 1
+                    break
+                perdidos.append((candidato, motivo)); self.descartados[motivo] += 1
+        for perdido, motivo in perdidos: self._dropped(perdido, motivo)
+        return item
+
+    def drain(self):
+        """Todos os comandos válidos, do mais antigo ao mais novo."""
+        with self._lock:
+            fila, self._fila, self._chaves = self._fila, deque(), {}
+            if not fila:
+                return []
+            agora = self.clock()
+            vistos, validos, perdidos = set(), [], []
+            for instante, chave, item in reversed(fila):
+                motivo = self._motivo_descarte(agora, instante, chave, chave in vistos)
+                vistos.add(chave)
+                if motivo is None: validos.append(item)
+                else: perdidos.append((item, motivo)); self.descartados[motivo] += 1
+            self.entregues += len(validos)
+        validos.reverse()
+        for perdido, motivo in perdidos: self._dropped(perdido, motivo)
+        return validos
+
+    def clear(self):
+        with self._lock:
+            self._fila.clear(); self._chaves.clear()
+
+    def _dropped(self, item, motivo):
+        if self.ao_descartar is not None: self.ao_descartar(item, motivo)
+
+    def stats(self):
+        return {'na_fila': len(self._fila), 'recebidos': self.recebidos, 'entregues': self.entregues, **self.descartados}
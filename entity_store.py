@@ -0,0 +1,147 @@
+import numpy as np
+
+
+def arredondar(valores):
+    """Arredonda como o pygame ao atribuir floats a um Rect (metade para longe do zero)."""
+    return np.copysign(np.floor(np.abs(valores) + 0.5), valores).astype(np.int64)
+
+
+class EntityArrays:
+    """
+    Entidades de um mesmo tipo guardadas como estrutura de arrays (SoA): uma
+    linha por entidade, um array NumPy por atributo, e só as `n` primeiras linhas
+    em uso, na ordem de criação. Atualizar todas é uma operação por coluna, não
+    uma chamada de método por sprite.
+
+    `ancora` diz o que (x, y) representam, como no sprite equivalente:
+    'topleft' (rect.x = int(x), como o Monstro) ou 'center' (rect.center = (x, y),
+    arredondado pelo pygame, como o Feitico). left/top guardam o rect inteiro
+    do último passo.
+
+    kill(linha) só marca a linha; compact() remove as mortas de uma vez no fim do
+    passo, mantendo a ordem. Até lá os índices de linha continuam válidos.
+    """
+    COLUNAS = {
+        'x': np.float64, 'y': np.float64, 'x_anterior': np.float64, 'y_anterior': np.float64,
+        'vx': np.float64, 'vy': np.float64, 'left': np.int64, 'top': np.int64, 'w': np.int64, 'h': np.int64,
+        'frame_index': np.float64, 'animation_speed': np.float64, 'n_frames': np.int64, 'animacao': np.int64,
+        'tipo': np.int64, 'vida': np.int64, 'vida_maxima': np.int64, 'vivo': np.bool_,
+    }
+
+    def __init__(self, ancora='topleft', capacidade=256):
+        self.ancora = ancora
+        self.n = 0
+        self.dados = {nome: np.zeros(capacidade, dtype) for nome, dtype in self.COLUNAS.items()}
+
+    def __len__(self):
+        return self.n
+
+    def __getattr__(self, nome):
+        # Colunas como atributos (arrays.x, arrays.vivo...), só as linhas em uso.
+        dados = self.__dict__.get('dados')
+        if dados is None or nome not in dados:
+            raise AttributeError(nome)
+        return dados[nome][:self.n]
+
+    def spawn(self, **valores):
+        """Acrescenta uma entidade viva; colunas não informadas ficam zeradas. Retorna a linha."""
+        if self.n == len(self.dados['x']):
+            for nome, coluna in self.dados.items():
+                maior = np.zeros(2 * len(coluna), coluna.dtype); maior[:self.n] = coluna[:self.n]
+                self.dados[nome] = maior
+        linha = self.n; self.n += 1
+        for nome, coluna in self.dados.items(): coluna[linha] = valores.get(nome, 0)
+        self.dados['x_anterior'][linha], self.dados['y_anterior'][linha] = valores['x'], valores['y']
+        self.dados['vivo'][linha] = True
+        self._atualizar_rect(slice(linha, linha + 1))
+        return linha
+
+    def kill(self, linha):
+        self.dados['vivo'][linha] = False
+
+    def clear(self):
+        self.n = 0
+
+    def compact(self):
+        """Remove as linhas mortas, preservando a ordem das vivas."""
+        vivo = self.vivo
+        if vivo.all():
+            return
+        manter = np.flatnonzero(vivo); n = len(manter)
+        for coluna in self.dados.values(): coluna[:n] = coluna[:self.n][manter]
+        self.n = n
+
+    def _atualizar_rect(self, linhas):
+        d = self.dados
+        if self.ancora == 'center':
+            d['left'][linhas] = arredondar(d['x'][linhas]) - d['w'][linhas] // 2
+            d['top'][linhas] = arredondar(d['y'][linhas]) - d['h'][linhas] // 2
+        else:
+            d['left'][linhas] = d['x'][linhas].astype(np.int64)
+            d['top'][linhas] = d['y'][linhas].astype(np.int64)
+
+    def advance(self, dt):
+        """Um passo de movimento e animação para todas as entidades."""
+        n = self.n
+        if not n:
+            return
+        d = self.dados
+        d['x_anterior'][:n] = d['x'][:n]; d['y_anterior'][:n] = d['y'][:n]
+        d['x'][:n] += d['vx'][:n] * dt; d['y'][:n] += d['vy'][:n] * dt
+        self._atualizar_rect(slice(0, n))
+        d['frame_index'][:n] = (d['frame_index'][:n] + d['animation_speed'][:n] * dt) % d['n_frames'][:n]
+
+    def render_rects(self, alpha):
+        """(left, top) interpolados entre o passo anterior e o atual, como os render_rect() dos sprites."""
+        x = self.x_anterior + (self.x - self.x_anterior) * alpha
+        if self.ancora == 'center':
+            y = self.y_anterior + (self.y - self.y_anterior) * alpha
+            return arredondar(x) - self.w // 2, arredondar(y) - self.h // 2
+        return x.astype(np.int64), self.top
+
+    def leftmost(self, mascara=None):
+        """Linha viva (dentro de `mascara`, se houver) com o menor left; empates ficam com a mais antiga. None se não houver."""
+        candidatos = self.vivo if mascara is None else self.vivo & mascara
+        if not candidatos.any():
+            return None
+        return int(np.where(candidatos, self.left, np.iinfo(np.int64).max).argmin())
+
+    def outside(self, largura, altura):
+        """Máscara das entidades vivas totalmente fora do retângulo (0, 0, largura, altura)."""
+        left, top = self.left, self.top
+        dentro = (left < largura) & (left + self.w > 0) & (top < altura) & (top + self.h > 0)
+        return self.vivo & ~dentro
+
+
+def first_hits(a, b, bloco=1 << 20):
+    """
+    Colisões AABB entre as entidades vivas de `a` e de `b`, com a semântica de
+    groupcollide(a, b, dokillb=True): percorrendo `a` na ordem, cada `b` fica só
+    com o primeiro `a` que o toca. Retorna [(linha em a, [linhas em b])], as duas
+    na ordem de criação. O teste todos-contra-todos é feito em blocos de linhas de
+    `a` para a matriz de sobreposição não passar de ~`bloco` elementos.
+    """
+    linhas_a, linhas_b = np.flatnonzero(a.vivo), np.flatnonzero(b.vivo)
+    if not len(linhas_a) or not len(linhas_b):
+        return []
+    bl, bt = b.left[linhas_b], b.top[linhas_b]
+    br, bb = bl + b.w[linhas_b], bt + b.h[linhas_b]
+    livre = np.ones(len(linhas_b), bool)
+    passo = max(1, bloco // len(linhas_b))
+    hits = []
+    for inicio in range(0, len(linhas_a), passo):
+        linhas = linhas_a[inicio:inicio + passo]
+        al, at = a.left[linhas][:, None], a.top[linhas][:, None]
+        ar, ab = al + a.w[linhas][:, None], at + a.h[linhas][:, None]
+        toca = (al < br) & (bl < ar) & (at < bb) & (bt < ab) & livre
+        colunas = np.flatnonzero(toca.any(0))
+        if not len(colunas):
+            continue
+        dono = toca[:, colunas].argmax(0)  # primeira linha de `a` que toca cada `b`
+        livre[colunas] = False
+        ordem = np.lexsort((colunas, dono))
+        dono, colunas = dono[ordem], colunas[ordem]
+        cortes = np.flatnonzero(np.diff(dono)) + 1
+        for grupo_dono, grupo in zip(np.split(dono, cortes), np.split(colunas, cortes)):
+            hits.append((int(linhas[grupo_dono[0]]), linhas_b[grupo].tolist()))
+    return hits
@@ -0,0 +1,46 @@
+import pygame
+
+
+class RleFrameCache:
+    """
+    Cópias com RLE dos frames desenhados pelo caminho em lote: region(frame)
+    devolve (superfície, None), pronto para um item (superfície, destino, área)
+    de Surface.blits. Frames iguais dão sempre a mesma cópia; a primeira chamada
+    a prepara.
+
+    Com RLEACCEL o SDL codifica as sequências de pixels transparentes e opacos,
+    e o blit pula as primeiras e copia as segundas em vez de misturar pixel a
+    pixel, o que nos sprites do jogo (quase todos transparentes) deixa o blit
+    várias vezes mais rápido. Os pixels translúcidos podem sair alguns níveis
+    diferentes do blit sem RLE. Não é um atlas: cada frame continua sendo uma
+    superfície própria, porque o SDL só acelera o blit da superfície inteira
+    (ver atlas.TextureAtlas e benchmarks/bench_atlas.py).
+
+    Frames com alpha da superfície (set_alpha) ou sem alpha por pixel ficam de
+    fora: region() devolve o próprio frame, e o blit fica igual ao de antes. O
+    cache guarda uma referência a cada frame preparado; clear() solta todos.
+    """
+
+    def __init__(self):
+        self.regioes = {}  # frame -> (superfície, None)
+
+    def region(self, frame):
+        regiao = self.regioes.get(frame)
+        if regiao is None:
+            regiao = self.regioes[frame] = (self._prepare(frame), None)
+        return regiao
+
+    def regions(self, frames):
+        return [self.region(f) for f in frames]
+
+    def _prepare(self, frame):
+        if not frame.get_flags() & pygame.SRCALPHA or frame.get_alpha() not in (None, 255):
+            return frame
+        copia = frame.copy(); copia.set_alpha(255, pygame.RLEACCEL)
+        return copia
+
+    def clear(self):
+        self.regioes.clear()
+
+    def stats(self):
+        return {"frames": len(self.regioes)}
@@ -1,19 +1,73 @@
-﻿import pygame
+﻿import os
+import sys
+import time
 import random
-import os
-import unicodedata
+import hashlib
 import json
-from collections import deque
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PyRecognition import PyRecognition
+from voice_backends import RecognizerBackend, ReplayRecognizer
+from comandos import command_matcher
+from asset_cache import AssetCache
+from spatial_hash import SpatialHash, groupcollide, compensa as grade_compensa
+from pooling import PooledSprite, EntityPool, GcController
+from profiler import FrameProfiler
+from latency import voice_tracer
+from score_store import ScoreManager
+from command_bus import CommandBus
+from frame_cache import RleFrameCache
+try:
+    import entity_store  # Motor de entidades em arrays (--motor soa); precisa do numpy
+except ImportError:
+    entity_store = None
 
 # --- CONFIGURAÇÕES GERAIS ---
-LARGURA_TELA, ALTURA_TELA = 1920, 1080
-FPS = 60
+def _opcao_antes_do_init(nome, variavel):
+    """Valor de `nome VALOR` no argv (ou da variável de ambiente), lido antes do argparse."""
+    if nome in sys.argv[:-1]: return sys.argv[sys.argv.index(nome) + 1]
+    return os.environ.get(variavel)
+
+RESOLUCAO_JANELA = (1920, 1080)
+# Resolução lógica: o jogo inteiro (lógica, assets e desenho) usa LARGURA_TELA x
+# ALTURA_TELA e o frame é ampliado uma única vez para a janela. Com 800x600, o
+# tamanho da arte, nada é redimensionado no carregamento e cada frame preenche
+# ~4x menos pixels. UPSCALE 'sdl' deixa a ampliação para o SDL (pygame.SCALED,
+# em tela cheia: numa janela o SDL só usa escalas inteiras que caibam no desktop,
+# e 800x600 num monitor 1080p ficaria em escala 1, sem ampliar nada); 'software'
+# amplia aqui com transform.scale para uma janela de RESOLUCAO_JANELA.
+_resolucao_logica = _opcao_antes_do_init('--logica', 'JOGO_LOGICA')
+UPSCALE = _opcao_antes_do_init('--upscale', 'JOGO_UPSCALE') or 'sdl'
+if _resolucao_logica:
+    LARGURA_TELA, ALTURA_TELA = (int(v) for v in _resolucao_logica.lower().split('x'))
+else:
+    LARGURA_TELA, ALTURA_TELA = RESOLUCAO_JANELA
+FPS = 60  # Limite de quadros desenhados por segundo (0 = sem limite)
+# A simulação roda em passos fixos, independente do FPS de desenho.
+# Todas as velocidades e tempos dos sprites estão em unidades por segundo.
+TAXA_SIMULACAO = 60
+PASSO_FIXO = 1.0 / TAXA_SIMULACAO
+MAX_FRAME_DT = 0.25  # Evita a "espiral da morte" após travadas longas
+# Sem janela nem áudio: precisa ser decidido antes do pygame.init().
+HEADLESS = os.environ.get("JOGO_HEADLESS") == "1" or "--headless" in sys.argv
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
 
 # --- INICIALIZAÇÃO PYGAME ---
 pygame.init()
 pygame.mixer.init()
-tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+janela = None  # Superfície da janela, só quando a ampliação é feita em software
+if (LARGURA_TELA, ALTURA_TELA) == RESOLUCAO_JANELA:
+    tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+elif UPSCALE == 'software':
+    janela = pygame.display.set_mode(RESOLUCAO_JANELA)
+    tela = pygame.Surface((LARGURA_TELA, ALTURA_TELA)).convert()
+else:
+    tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA), pygame.SCALED | pygame.FULLSCREEN)
 pygame.display.set_caption("Mago dos Comandos - v1.5 Final")
 clock = pygame.time.Clock()
 
@@ -29,6 +83,7 @@ pasta_feitico_fogo_anim = os.path.join(pasta_assets, 'feitico_fogo_anim')
 pasta_feitico_gelo_anim = os.path.join(pasta_assets, 'feitico_gelo_anim')
 pasta_feitico_raio_anim = os.path.join(pasta_assets, 'feitico_raio_anim')
 pasta_explosao_anim = os.path.join(pasta_assets, 'explosao_anim')
+pasta_cache_assets = os.path.join(os.path.dirname(__file__), '.asset_cache')
 
 # --- FONTES ---
 tamanho_fonte_grande = int(48 * min(escala_x, escala_y))
@@ -37,100 +92,206 @@ tamanho_fonte_media = int(32 * min(escala_x, escala_y))
 fonte = pygame.font.SysFont("Arial", tamanho_fonte_grande, bold=True)
 fonte_pequena = pygame.font.SysFont("Arial", tamanho_fonte_pequena)
 fonte_media = pygame.font.SysFont("Arial", tamanho_fonte_media, bold=True)
+fonte_perfil = pygame.font.SysFont("Consolas,DejaVu Sans Mono,Courier New,monospace", tamanho_fonte_pequena)
 
-# --- FUNÇÕES AUXILIARES ---
-def _normalize_ascii(texto: str) -> str:
-    if not texto: return ""
-    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii').lower()
+class TextCache:
+    """
+    Cache LRU de textos renderizados, chaveado por (texto, fonte, cor, antialias).
+    Títulos, instruções e placares quase nunca mudam, então font.render só roda
+    na primeira vez. hits/misses e o tempo gasto renderizando ficam disponíveis
+    para profiling; take_frame_ms() devolve (e zera) o tempo do frame atual.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+        self.render_ms_total = 0.0
+        self._frame_ms = 0.0
 
-# --- GERENCIADOR DE PONTUAÇÃO ---
-class ScoreManager:
-    def __init__(self, filename="scores.json"):
-        self.filename = filename
-        self.scores = self.load_scores()
+    def render(self, font, text, color, antialias=True):
+        inicio = time.perf_counter()
+        key = (text, font, tuple(color), antialias)
+        surf = self._cache.get(key)
+        if surf is not None:
+            self._cache.move_to_end(key); self.hits += 1
+        else:
+            self.misses += 1
+            surf = font.render(text, antialias, color)
+            self._cache[key] = surf
+            if len(self._cache) > self.max_entries: self._cache.popitem(last=False)
+        ms = (time.perf_counter() - inicio) * 1000
+        self.render_ms_total += ms; self._frame_ms += ms
+        return surf
 
-    def load_scores(self):
-        try:
-            with open(self.filename, 'r') as f:
-                scores_data = json.load(f)
-            # Ordena os scores em ordem decrescente
-            return sorted(scores_data, key=lambda x: x['score'], reverse=True)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def save_score(self, player_name, score):
-        self.scores.append({"name": player_name, "score": score})
-        # Mantém a lista ordenada após adicionar nova pontuação
-        self.scores.sort(key=lambda x: x['score'], reverse=True)
-        # Limita a lista para, por exemplo, os 100 melhores scores
-        self.scores = self.scores[:100]
-        with open(self.filename, 'w') as f:
-            json.dump(self.scores, f, indent=4)
-
-    def get_top_scores(self, count=5):
-        return self.scores[:count]
+    def take_frame_ms(self):
+        ms, self._frame_ms = self._frame_ms, 0.0
+        return ms
+
+    def stats(self):
+        return {"entradas": len(self._cache), "hits": self.hits, "misses": self.misses, "render_ms_total": self.render_ms_total}
+
+text_cache = TextCache()
 
 # --- GERENCIADOR DE ANIMAÇÕES ---
 class AnimationManager:
-    def __init__(self):
+    """
+    Guarda as animações carregadas e um cache compartilhado de versões redimensionadas.
+    get_frames(nome, tamanho) devolve sempre a mesma lista para o mesmo par, então
+    sprites iguais não refazem o scale nem duplicam superfícies. Com max_cache_bytes
+    definido, as entradas menos usadas são descartadas quando o limite é excedido.
+
+    Com um AssetCache, os frames já redimensionados vêm do disco em vez de
+    decodificar os PNGs; load_animations() decodifica as pastas em paralelo.
+
+    `quadros_lote` prepara sob demanda as cópias com RLE dos frames desenhados
+    pelo caminho em lote (--lote-rle); ver GameWorld.draw e frame_cache.RleFrameCache.
+    """
+    def __init__(self, max_cache_bytes=None, asset_cache=None):
         self.animations = {}
+        self.asset_cache = asset_cache
+        self.load_times = {}  # nome -> ms gastos para carregar
+        self.max_cache_bytes = max_cache_bytes
+        self._scaled_cache = OrderedDict()  # (nome, tamanho) -> (frames, bytes)
+        self.cache_bytes = 0
+        self.cache_hits = self.cache_misses = self.cache_evictions = 0
+        self.quadros_lote = RleFrameCache()
+
+    def get_frames(self, name, size=None):
+        """Frames da animação `name`, redimensionados para `size` (largura, altura) se informado."""
+        frames_base = self.animations[name]
+        if size is None or frames_base[0].get_size() == tuple(size):
+            return frames_base
+        key = (name, tuple(size))
+        entry = self._scaled_cache.get(key)
+        if entry is not None:
+            self._scaled_cache.move_to_end(key); self.cache_hits += 1
+            return entry[0]
+        self.cache_misses += 1
+        frames = [pygame.transform.scale(f, key[1]) for f in frames_base]
+        tamanho_bytes = sum(f.get_pitch() * f.get_height() for f in frames)
+        self._scaled_cache[key] = (frames, tamanho_bytes); self.cache_bytes += tamanho_bytes
+        self._evict(keep=key)
+        return frames
+
+    def _evict(self, keep=None):
+        if self.max_cache_bytes is None: return
+        while self.cache_bytes > self.max_cache_bytes and len(self._scaled_cache) > 1:
+            key = next(iter(self._scaled_cache))
+            if key == keep: break
+            _, tamanho_bytes = self._scaled_cache.pop(key)
+            self.cache_bytes -= tamanho_bytes; self.cache_evictions += 1
+
+    def invalidate(self, name):
+        """Descarta as versões redimensionadas de `name` (ex: após recarregar a animação)."""
+        for key in [k for k in self._scaled_cache if k[0] == name]:
+            self.cache_bytes -= self._scaled_cache.pop(key)[1]
+
+    def cache_stats(self):
+        return {"entradas": len(self._scaled_cache), "bytes": self.cache_bytes, "hits": self.cache_hits,
+                "misses": self.cache_misses, "evictions": self.cache_evictions}
+
     def load_animation_from_folder(self, name, path, base_size):
-        frames = []
-        try:
-            files = sorted([f for f in os.listdir(path) if f.endswith('.png')])
-            if not files: raise FileNotFoundError(f"Nenhuma imagem em '{path}'")
-            for f in files:
-                img_path = os.path.join(path, f)
-                img = pygame.image.load(img_path).convert_alpha()
-                scaled_size = (int(base_size[0] * escala_x), int(base_size[1] * escala_y))
-                frames.append(pygame.transform.scale(img, scaled_size))
-            self.animations[name] = frames
-            print(f"Animação '{name}' carregada: {len(frames)} frames.")
-        except Exception as e:
-            print(f"ERRO ao carregar '{name}': {e}")
-            surf = pygame.Surface((int(base_size[0] * escala_x), int(base_size[1] * escala_y))); surf.fill((255, 0, 255))
-            self.animations[name] = [surf]
+        self.load_animations([(name, path, base_size)])
+
+    def _decode_folder(self, path, sizes):
+        """Roda em uma thread: decodifica cada PNG da pasta uma vez e gera todos os tamanhos."""
+        inicio = time.perf_counter()
+        files = sorted([f for f in os.listdir(path) if f.endswith('.png')])
+        if not files: raise FileNotFoundError(f"Nenhuma imagem em '{path}'")
+        frames = {size: [] for size in sizes}; decodificou = False
+        for f in files:
+            img_path = os.path.join(path, f)
+            if self.asset_cache:
+                por_tamanho, dec = self.asset_cache.load_scaled_many(img_path, sizes)
+            else:
+                img = pygame.image.load(img_path); dec = True
+                por_tamanho = {size: pygame.transform.scale(img, size) for size in sizes}
+            decodificou = decodificou or dec
+            for size in sizes: frames[size].append(por_tamanho[size])
+        return frames, decodificou, (time.perf_counter() - inicio) * 1000
+
+    def load_animations(self, pedidos, max_workers=None):
+        """
+        Carrega várias animações [(nome, pasta, tamanho_base), ...] de uma vez.
+        Cada pasta é lida uma única vez em uma thread do pool, mesmo que várias
+        animações usem a mesma pasta em tamanhos diferentes; o convert_alpha final
+        é feito aqui, na thread principal.
+        """
+        por_pasta = {}
+        for name, path, base_size in pedidos:
+            self.invalidate(name)
+            scaled_size = (int(base_size[0] * escala_x), int(base_size[1] * escala_y))
+            por_pasta.setdefault(path, []).append((name, scaled_size))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futuros = {path: pool.submit(self._decode_folder, path, sorted({size for _, size in nomes}))
+                       for path, nomes in por_pasta.items()}
+            for path, nomes in por_pasta.items():
+                try:
+                    frames, decodificou, ms = futuros[path].result()
+                except Exception as e:
+                    for name, scaled_size in nomes:
+                        print(f"ERRO ao carregar '{name}': {e}")
+                        surf = pygame.Surface(scaled_size); surf.fill((255, 0, 255))
+                        self.animations[name] = [surf]
+                    continue
+                origem = "decodificada" if decodificou else "cache"
+                for name, scaled_size in nomes:
+                    inicio = time.perf_counter()
+                    self.animations[name] = [f.convert_alpha() for f in frames[scaled_size]]
+                    self.load_times[name] = ms + (time.perf_counter() - inicio) * 1000
+                    print(f"Animação '{name}' carregada: {len(self.animations[name])} frames em {self.load_times[name]:.1f} ms ({origem}).")
 
 # --- CARREGAR RECURSOS ---
 animation_manager = AnimationManager()
-try:
-    cenario_img_original = pygame.image.load(os.path.join(pasta_assets, 'cenario.png')).convert()
-    # A imagem do cenário agora tem a largura da tela para um loop perfeito
-    cenario_img = pygame.transform.scale(cenario_img_original, (LARGURA_TELA, ALTURA_TELA))
-except Exception as e:
-    print(f"Erro ao carregar cenario.png: {e}")
-    cenario_img = pygame.Surface((LARGURA_TELA, ALTURA_TELA)); cenario_img.fill((10,20,50))
+# Cor lisa até load_background() ser chamado pelo main().
+cenario_img = pygame.Surface((LARGURA_TELA, ALTURA_TELA)); cenario_img.fill((10,20,50))
 cenario_x = 0
 
+def load_background(asset_cache=None):
+    global cenario_img
+    inicio = time.perf_counter()
+    caminho = os.path.join(pasta_assets, 'cenario.png')
+    try:
+        # A imagem do cenário agora tem a largura da tela para um loop perfeito
+        if asset_cache:
+            cenario_img = asset_cache.load_scaled(caminho, (LARGURA_TELA, ALTURA_TELA)).convert()
+        else:
+            cenario_img = pygame.transform.scale(pygame.image.load(caminho).convert(), (LARGURA_TELA, ALTURA_TELA))
+        print(f"Cenário carregado em {(time.perf_counter() - inicio) * 1000:.1f} ms.")
+    except Exception as e:
+        print(f"Erro ao carregar cenario.png: {e}")
+
 # --- CLASSES DE SPRITES ---
 class Mago(pygame.sprite.Sprite):
     def __init__(self, anim_manager):
         super().__init__()
         self.anim_manager = anim_manager
         self.animations = {'idle': self.anim_manager.animations.get('mago_idle'), 'cast': self.anim_manager.animations.get('mago_cast')}
-        self.current_animation, self.frame_index, self.animation_speed = 'idle', 0.0, 0.1
+        self.current_animation, self.frame_index, self.animation_speed = 'idle', 0.0, 6.0
         self.image = self.animations['idle'][0]
         self.rect = self.image.get_rect(center=(LARGURA_TELA * 0.125, ALTURA_TELA / 2))
-        self.casting, self.cast_timer, self.cast_duration = False, 0, 30
-    def update(self):
+        self.casting, self.cast_timer, self.cast_duration = False, 0.0, 0.5
+    def update(self, dt):
         if self.casting and self.cast_timer > 0:
-            self.current_animation = 'cast'; self.cast_timer -= 1
-            if self.cast_timer == 0: self.casting = False
+            self.current_animation = 'cast'; self.cast_timer -= dt
+            if self.cast_timer <= 0: self.casting = False
         else: self.current_animation = 'idle'
         anim_list = self.animations.get(self.current_animation)
         if anim_list:
-            self.frame_index = (self.frame_index + self.animation_speed) % len(anim_list)
+            self.frame_index = (self.frame_index + self.animation_speed * dt) % len(anim_list)
             self.image = anim_list[int(self.frame_index)]
     def cast_spell(self):
         self.casting, self.cast_timer, self.frame_index = True, self.cast_duration, 0
 
 class Aprendiz(pygame.sprite.Sprite):
-    def __init__(self, mago_referencia, anim_manager, mapa_comandos_voz):
+    def __init__(self, mago_referencia, anim_manager, mapa_comandos_voz, rng=random):
         super().__init__()
-        self.anim_manager = anim_manager
+        self.anim_manager, self.rng = anim_manager, rng
         self.mapa_comandos_voz = mapa_comandos_voz
+        self.feitico_contra = inverter_mapa(mapa_comandos_voz)
         self.animations = {'idle': self.anim_manager.animations.get('aprendiz_idle')}
-        self.current_animation, self.frame_index, self.animation_speed = 'idle', 0.0, 0.1
+        self.current_animation, self.frame_index, self.animation_speed = 'idle', 0.0, 6.0
         if self.animations['idle']:
             self.image = self.animations['idle'][0]
         else:
@@ -138,116 +299,238 @@ class Aprendiz(pygame.sprite.Sprite):
             self.image = pygame.Surface((int(70 * escala_x), int(90 * escala_y))); self.image.fill((0, 255, 255))
         self.image.set_alpha(200)
         self.rect = self.image.get_rect(midbottom=mago_referencia.rect.midtop)
-        self.cooldown_tiro, self.cadencia = 0, 480
-    def update(self):
+        self.cooldown_tiro, self.cadencia = 0.0, 8.0  # segundos entre tiros
+    def update(self, dt):
         anim_list = self.animations.get(self.current_animation)
         if anim_list:
-            self.frame_index = (self.frame_index + self.animation_speed) % len(anim_list)
+            self.frame_index = (self.frame_index + self.animation_speed * dt) % len(anim_list)
             self.image = anim_list[int(self.frame_index)]
-    def logica_de_combate(self, mago_ref, monstros, sprites, feiticos):
+    def logica_de_combate(self, mago_ref, indice_monstros, lancar_feitico, dt):
         self.rect.midbottom = mago_ref.rect.midtop; self.rect.y -= 10
-        if self.cooldown_tiro > 0: self.cooldown_tiro -= 1
-        elif monstros and random.random() <= 0.6:
-            alvo = min(monstros, key=lambda m: m.rect.x)
-            tipo_feitico = next((f for f, t in self.mapa_comandos_voz.items() if t == alvo.tipo), None)
+        if self.cooldown_tiro > 0: self.cooldown_tiro -= dt
+        elif (alvo := indice_monstros.nearest_any()) is not None and self.rng.random() <= 0.6:
+            tipo_feitico = self.feitico_contra.get(alvo.tipo)
             if tipo_feitico and alvo.rect.x < LARGURA_TELA:
-                # O aprendiz sempre tem um alvo, então passamos o alvo para o construtor
-                novo_feitico = Feitico(tipo_feitico, self.rect.center, self.anim_manager, self.mapa_comandos_voz, alvo=alvo)
-                sprites.add(novo_feitico); feiticos.add(novo_feitico)
+                # O aprendiz sempre tem um alvo, então o feitiço persegue esse alvo
+                lancar_feitico(tipo_feitico, self.rect.center, alvo)
             self.cooldown_tiro = self.cadencia
 
-class Monstro(pygame.sprite.Sprite):
-    def __init__(self, dificuldade_atual, anim_manager):
+TIPOS_MONSTRO = ("fogo", "gelo", "terra")
+CORES_VIDA = {"fogo": (255,100,100), "gelo": (100,200,255), "terra": (200,150,100)}
+
+def sortear_monstro(dificuldade_atual, rng=random):
+    """(tipo, vida máxima, velocidade da animação) de um monstro novo; consome o rng sempre na mesma ordem."""
+    tipo = rng.choice(TIPOS_MONSTRO)
+    vida_maxima = 1
+    if dificuldade_atual > 3 and rng.random() < 0.2: vida_maxima = 2
+    if dificuldade_atual > 6 and rng.random() < 0.1: vida_maxima = 3
+    return tipo, vida_maxima, 6.0 + rng.uniform(-1.2, 1.2)
+
+def tamanho_monstro(vida_maxima):
+    tamanho_base = 80 + (vida_maxima - 1) * 20
+    return (int(tamanho_base * escala_x), int(tamanho_base * escala_y))
+
+def velocidade_monstro(dificuldade_atual):
+    return min(120 + (dificuldade_atual * 18), 480) * escala_x  # pixels por segundo
+
+def velocidade_feitico(pos, alvo=None):
+    """Velocidade de um feitiço lançado de `pos`: na direção do alvo, se houver, senão reto para a direita."""
+    rapidez = 900 * escala_x  # pixels por segundo
+    if alvo:
+        direcao = pygame.Vector2(alvo.rect.center) - pos
+        if direcao.length() > 0:
+            return direcao.normalize() * rapidez
+    # Sem alvo, ou o caso raro de estar na mesma posição
+    return pygame.Vector2(rapidez, 0)
+
+def draw_health_bar(surface, rect, vida_atual, vida_maxima, cor):
+    barra_w, barra_h = 60 * escala_x, 8 * escala_y
+    x, y = rect.centerx - barra_w / 2, rect.y - 15 * escala_y
+    pygame.draw.rect(surface, (60,60,60), (x,y,barra_w,barra_h)); vida_w = int(barra_w * (vida_atual / vida_maxima))
+    pygame.draw.rect(surface, cor, (x,y,vida_w,barra_h)); return pygame.draw.rect(surface, (200,200,200), (x,y,barra_w,barra_h), 1)
+
+_barras_de_vida = {}  # (vida atual, vida máxima, cor) -> Surface
+
+def health_bar_image(vida_atual, vida_maxima, cor):
+    """A barra do draw_health_bar pronta numa superfície (desenhada em health_bar_pos), uma por combinação."""
+    chave = (vida_atual, vida_maxima, cor)
+    barra = _barras_de_vida.get(chave)
+    if barra is None:
+        barra_w, barra_h = 60 * escala_x, 8 * escala_y
+        barra = _barras_de_vida[chave] = pygame.Surface((int(barra_w), int(barra_h)), pygame.SRCALPHA).convert_alpha()
+        barra.fill((60,60,60)); barra.fill(cor, (0, 0, int(barra_w * (vida_atual / vida_maxima)), barra_h))
+        pygame.draw.rect(barra, (200,200,200), barra.get_rect(), 1)
+    return barra
+
+def health_bar_pos(left, top, w):
+    """Canto superior esquerdo da barra de vida de um monstro com esse rect, como no draw_health_bar."""
+    return int(left + w // 2 - 60 * escala_x / 2), int(top - 15 * escala_y)
+
+class Monstro(PooledSprite):
+    __slots__ = ('anim_manager', 'tipo', 'vida_maxima', 'vida_atual', 'ordem_spawn', 'frame_index', 'animation_speed',
+                 'animation_frames', 'image', 'rect', 'pos_x', 'pos_x_anterior', 'velocidade', 'cor_vida')
+    def __init__(self, dificuldade_atual, anim_manager, rng=random):
         super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(dificuldade_atual, anim_manager, rng)
+    def reset(self, dificuldade_atual, anim_manager, rng=random):
         self.anim_manager = anim_manager
-        self.tipo = random.choice(["fogo", "gelo", "terra"])
-        self.vida_maxima = 1
-        if dificuldade_atual > 3 and random.random() < 0.2: self.vida_maxima = 2
-        if dificuldade_atual > 6 and random.random() < 0.1: self.vida_maxima = 3
+        self.tipo, self.vida_maxima, self.animation_speed = sortear_monstro(dificuldade_atual, rng)
         self.vida_atual = self.vida_maxima
-        self.frame_index, self.animation_speed = 0.0, 0.1 + random.uniform(-0.02, 0.02)
-        tamanho_base = 80 + (self.vida_maxima - 1) * 20
-        frames_base = self.anim_manager.animations[f'monstro_{self.tipo}']
-        self.animation_frames = [pygame.transform.scale(f, (int(tamanho_base * escala_x), int(tamanho_base * escala_y))) for f in frames_base]
+        self.ordem_spawn = 0  # definido pelo MonsterIndex
+        self.frame_index = 0.0
+        self.animation_frames = self.anim_manager.get_frames(f'monstro_{self.tipo}', tamanho_monstro(self.vida_maxima))
         self.image = self.animation_frames[0]
-        self.rect = self.image.get_rect(x=LARGURA_TELA + 50, y=random.randint(50, ALTURA_TELA - self.image.get_height()))
-        self.velocidade = min(2 + (dificuldade_atual * 0.3), 8) * escala_x
-        if self.tipo == "fogo": self.cor_vida = (255,100,100)
-        elif self.tipo == "gelo": self.cor_vida = (100,200,255)
-        else: self.cor_vida = (200,150,100)
-    def update(self):
-        self.rect.x -= self.velocidade
-        self.frame_index = (self.frame_index + self.animation_speed) % len(self.animation_frames)
+        self.rect.size = self.image.get_size(); self.rect.topleft = (LARGURA_TELA + 50, rng.randint(50, ALTURA_TELA - self.image.get_height()))
+        self.pos_x = self.pos_x_anterior = float(self.rect.x)
+        self.velocidade = velocidade_monstro(dificuldade_atual)
+        self.cor_vida = CORES_VIDA[self.tipo]
+    def update(self, dt):
+        self.pos_x_anterior = self.pos_x
+        self.pos_x -= self.velocidade * dt; self.rect.x = int(self.pos_x)
+        self.frame_index = (self.frame_index + self.animation_speed * dt) % len(self.animation_frames)
         self.image = self.animation_frames[int(self.frame_index)]
+    def render_rect(self, alpha):
+        """Retângulo interpolado entre o tick anterior e o atual (alpha em [0, 1))."""
+        rect = self.rect.copy(); rect.x = int(self.pos_x_anterior + (self.pos_x - self.pos_x_anterior) * alpha)
+        return rect
     def tomar_dano(self):
         self.vida_atual -= 1; return self.vida_atual <= 0
-    def draw_vida(self, surface):
+    def draw_vida(self, surface, rect=None):
         if self.vida_maxima > 1:
-            barra_w, barra_h = 60 * escala_x, 8 * escala_y
-            x, y = self.rect.centerx - barra_w / 2, self.rect.y - 15 * escala_y
-            pygame.draw.rect(surface, (60,60,60), (x,y,barra_w,barra_h)); vida_w = int(barra_w * (self.vida_atual / self.vida_maxima))
-            pygame.draw.rect(surface, self.cor_vida, (x,y,vida_w,barra_h)); pygame.draw.rect(surface, (200,200,200), (x,y,barra_w,barra_h), 1)
+            return draw_health_bar(surface, rect or self.rect, self.vida_atual, self.vida_maxima, self.cor_vida)
 
-class Feitico(pygame.sprite.Sprite):
+class Feitico(PooledSprite):
+    __slots__ = ('anim_manager', 'tipo', 'tipo_alvo', 'animation_frames', 'frame_index', 'animation_speed',
+                 'image', 'rect', 'pos', 'pos_anterior', 'velocidade')
     def __init__(self, tipo, pos_inicio, anim_manager, mapa_comandos_voz, alvo=None):
         super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.pos, self.pos_anterior, self.velocidade = pygame.Vector2(), pygame.Vector2(), pygame.Vector2()
+        self.reset(tipo, pos_inicio, anim_manager, mapa_comandos_voz, alvo)
+    def reset(self, tipo, pos_inicio, anim_manager, mapa_comandos_voz, alvo=None):
         self.anim_manager = anim_manager
         self.tipo = tipo
         self.tipo_alvo = mapa_comandos_voz.get(tipo)
-        self.animation_frames = self.anim_manager.animations[f'feitico_{self.tipo}']
-        self.frame_index, self.animation_speed = 0.0, 0.3
+        self.animation_frames = self.anim_manager.get_frames(f'feitico_{self.tipo}')
+        self.frame_index, self.animation_speed = 0.0, 18.0
         self.image = self.animation_frames[0]
-        self.rect = self.image.get_rect(center=pos_inicio)
-        self.pos = pygame.Vector2(self.rect.center)
-
+        self.rect.size = self.image.get_size(); self.rect.center = pos_inicio
+        self.pos.update(self.rect.center)
+        self.pos_anterior.update(self.pos)
         # Se um alvo for fornecido, persegue o alvo.
-        if alvo:
-            direcao = pygame.Vector2(alvo.rect.center) - self.pos
-            if direcao.length() > 0:
-                self.velocidade = direcao.normalize() * (15 * escala_x)
-            else: # Caso raro de estar na mesma posição
-                self.velocidade = pygame.Vector2(15 * escala_x, 0)
-        # Se nenhum alvo for fornecido, vai reto.
-        else:
-            self.velocidade = pygame.Vector2(15 * escala_x, 0)
+        self.velocidade.update(velocidade_feitico(self.pos, alvo))
 
-    def update(self):
-        self.pos += self.velocidade; self.rect.center = self.pos
-        self.frame_index = (self.frame_index + self.animation_speed) % len(self.animation_frames)
+    def update(self, dt):
+        self.pos_anterior.update(self.pos)
+        self.pos += self.velocidade * dt; self.rect.center = self.pos
+        self.frame_index = (self.frame_index + self.animation_speed * dt) % len(self.animation_frames)
         self.image = self.animation_frames[int(self.frame_index)]
-        if not tela.get_rect().colliderect(self.rect): self.kill()
+        # Feitiços fora da tela são descartados pelo GameWorld ao montar a grade de colisão.
+    def render_rect(self, alpha):
+        """Retângulo interpolado entre o tick anterior e o atual (alpha em [0, 1))."""
+        return self.image.get_rect(center=self.pos_anterior.lerp(self.pos, alpha))
 
-class Explosao(pygame.sprite.Sprite):
+class Explosao(PooledSprite):
+    __slots__ = ('anim_manager', 'animation_frames', 'frame_index', 'animation_speed', 'image', 'rect')
     def __init__(self, position, anim_manager):
-        super().__init__(); self.anim_manager = anim_manager
-        self.animation_frames = self.anim_manager.animations['explosao']
-        self.frame_index, self.animation_speed = 0.0, 0.3
-        self.image = self.animation_frames[0]; self.rect = self.image.get_rect(center=position)
-    def update(self):
-        self.frame_index += self.animation_speed
+        super().__init__(); self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(position, anim_manager)
+    def reset(self, position, anim_manager):
+        self.anim_manager = anim_manager
+        self.animation_frames = self.anim_manager.get_frames('explosao')
+        self.frame_index, self.animation_speed = 0.0, 18.0
+        self.image = self.animation_frames[0]; self.rect.size = self.image.get_size(); self.rect.center = position
+    def update(self, dt):
+        self.frame_index += self.animation_speed * dt
         if self.frame_index >= len(self.animation_frames): self.kill()
         else: self.image = self.animation_frames[int(self.frame_index)]
 
+# Instâncias reaproveitadas entre ticks e partidas; ver GameWorld.update e GameWorld.close.
+entity_pools = {'monstros': EntityPool(Monstro), 'feiticos': EntityPool(Feitico), 'explosoes': EntityPool(Explosao)}
+gc_control = GcController()
+
+def entity_pool_stats():
+    return {nome: pool.stats() for nome, pool in entity_pools.items()}
+
+class Transcricao(str):
+    """
+    Texto de uma transcrição, com o trace_id do latency.voice_tracer (None se veio
+    do teclado), o instante de origem no relógio do reconhecedor e a idade (em
+    segundos) que ela tinha ao ser entregue ao jogo.
+    """
+    def __new__(cls, texto, trace_id=None, instante=None):
+        obj = super().__new__(cls, texto); obj.trace_id, obj.instante, obj.idade = trace_id, instante, 0.0
+        return obj
+
 class VoiceRecognitionSystem:
-    def __init__(self):
-        # CORREÇÃO: Fila de comandos de voz agora é ilimitada.
-        self.command_buffer = deque()
+    """
+    O PyRecognition (Chrome + Selenium) leva segundos para subir, então ele é
+    criado numa thread e o jogo começa no teclado. `estado` vai de "CARREGANDO"
+    para "PRONTA" ou "INDISPONIVEL"; voice_available só fica True em "PRONTA", e
+    os loops passam a aceitar voz no frame seguinte, sem reiniciar.
+    """
+    def __init__(self, backend=None, language='pt-BR'):
+        # `language` pode trazer vários idiomas ("pt-BR,en-US"): no mesmo Chrome, um ativo por vez.
+        # Transcrições e comandos de teclado, entregues juntos a cada frame. A idade vem da
+        # origem (TranscriptEvent.instante): o que esperou nas filas fora dos loops expira.
+        self.clock = backend.clock if backend is not None else PyRecognition.clock
+        self.command_buffer = CommandBus(maxlen=256, max_idade=RecognizerBackend.IDADE_MAX, clock=self.clock,
+                                         ao_descartar=lambda trans, motivo: voice_tracer.discard(trans.trace_id))
+        self.recognizer = None
+        self.pronta = threading.Event()  # sinalizada quando o estado deixa de ser CARREGANDO
+        self._parar = False
+        self._lock = threading.Lock()
+        # Qualquer voice_backends.RecognizerBackend (ex: ReplayRecognizer) substitui o PyRecognition.
+        if backend is not None:
+            self.recognizer = backend; self.estado = "PRONTA"; self.pronta.set()
+            print(f"Usando reconhecedor {type(backend).__name__}.")
+            return
+        self.estado = "CARREGANDO"
+        threading.Thread(target=self._start_recognizer, args=(language,), name="voz-init", daemon=True).start()
+
+    def _start_recognizer(self, language):
+        inicio = time.perf_counter()
         try:
-            self.recognizer = PyRecognition('pt-BR'); self.voice_available = True
-            print("Sistema de reconhecimento de voz inicializado!")
+            recognizer = PyRecognition(language)
         except Exception as e:
-            print(f"PyRecognition falhou: {e}. Usando teclado."); self.voice_available = False
+            print(f"PyRecognition falhou: {e}. Usando teclado."); self.estado = "INDISPONIVEL"
+        else:
+            with self._lock:
+                fechou = self._parar  # O jogo fechou enquanto o Chrome subia
+                if not fechou: self.recognizer = recognizer; self.estado = "PRONTA"
+            if fechou:
+                recognizer.stop(); self.estado = "INDISPONIVEL"
+            else:
+                print(f"Sistema de reconhecimento de voz inicializado em {time.perf_counter() - inicio:.1f}s!")
+        self.pronta.set()
+
+    @property
+    def voice_available(self):
+        return self.estado == "PRONTA"
             
     def get_all_pending_transcripts(self):
         if self.voice_available:
-            for speech in self.recognizer.get_all_pending(): self.command_buffer.append(speech)
-        results = []; [results.append(self.command_buffer.popleft()) for _ in range(len(self.command_buffer))]
+            for event in self.recognizer.get_all_pending_events():
+                voice_tracer.mark(event.trace_id, 'coletado')
+                self.command_buffer.put(Transcricao(event.text, event.trace_id, event.instante), instante=event.instante)
+        results = self.command_buffer.drain()
+        agora = self.clock()
+        for trans in results:
+            trans.idade = agora - trans.instante; voice_tracer.mark(trans.trace_id, 'entregue')
         return results
         
-    def add_keyboard_command(self, command): self.command_buffer.append(command)
+    def add_keyboard_command(self, command):
+        agora = self.clock(); self.command_buffer.put(Transcricao(command, None, agora), instante=agora)
+
+    def set_language_enabled(self, language, enabled):
+        if self.voice_available: self.recognizer.set_language_enabled(language, enabled)
     
     def stop(self):
-        if self.voice_available: self.recognizer.stop()
+        with self._lock:
+            self._parar = True
+            recognizer = self.recognizer if self.voice_available else None
+        if recognizer: recognizer.stop()
 
 class GameState:
     def __init__(self, score_manager):
@@ -262,105 +545,114 @@ class GameState:
 
 # --- FUNÇÕES DE LÓGICA E CONTROLE ---
 # --- FUNÇÕES DE LÓGICA E CONTROLE ---
-def process_voice_command(command: str):
+def process_voice_command(command: str, aproximado=False):
     """
     Processa uma string de transcrição de voz e retorna uma lista de comandos canônicos identificados.
     Esta versão é mais robusta, detectando comandos como substrings dentro das palavras faladas.
     Ex: "fogos" ativa "fogo", "queimando" ativa "queimar" (que mapeia para "fogo").
+    O vocabulário fica em comandos.COMANDOS_MAP e o matcher é construído uma única vez.
+    Com `aproximado` (só durante a partida) quase-acertos como "fogu" também contam;
+    nos menus, fala comum a uma letra de um comando ("voltas") não vira comando.
     """
-    if not command:
-        return []
-
-    comandos_map = {
-        "fogo": ["fogo", "fire", "chama", "queimar"],
-        "gelo": ["gelo", "ice", "congelar", "frio"],
-        "raio": ["raio", "thunder", "trovao", "eletrico", "relampago", "rai"],
-        "comecar": ["comecar", "iniciar", "start", "jogar"],
-        "pontuacao": ["pontuacao", "scores", "placar"],
-        "voltar": ["voltar", "menu", "retornar"],
-        "parar": ["parar", "stop", "sair", "quit"]
-    }
-
-    # Cria um mapa reverso para busca eficiente: {"fogo": "fogo", "fire": "fogo", ...}
-    sinonimo_map = {s: cmd for cmd, sl in comandos_map.items() for s in sl}
-    # Obtém uma lista de todos os sinônimos únicos para iterar
-    todos_sinonimos = list(sinonimo_map.keys())
-
-    # Normaliza e divide a entrada de voz
-    palavras_faladas = _normalize_ascii(command).split()
-    comandos_identificados = []
-
-    # Itera sobre cada palavra dita pelo jogador
-    for palavra in palavras_faladas:
-        # Para cada palavra, verifica se algum sinônimo corresponde como substring
-        for sinonimo in todos_sinonimos:
-            # A MUDANÇA PRINCIPAL:
-            # Em vez de 'if palavra == sinonimo', usamos 'if sinonimo in palavra'.
-            if sinonimo in palavra:
-                # Adiciona o comando principal correspondente (ex: "fogo")
-                comandos_identificados.append(sinonimo_map[sinonimo])
-                # Encontrou uma correspondência para esta 'palavra', então
-                # quebra o loop interno e vai para a próxima 'palavra' falada.
-                # Isso evita adicionar o mesmo comando duas vezes para uma única palavra (ex: "fogofogo").
-                break
-    
-    return comandos_identificados
+    return command_matcher.match(command, aproximado)
 
 def reset_game_state(game_state, all_groups):
     print(f"--- INICIANDO JOGO PARA: {game_state.player_name} ---")
     game_state.pontuacao, game_state.dificuldade, game_state.vidas, game_state.combo = 0, 0, 3, 0
     for group in all_groups.values():
-        if isinstance(group, pygame.sprite.Group): group.empty()
+        if not isinstance(group, pygame.sprite.Group): continue
+        # kill() devolve aos pools os sprites que vieram deles; empty() só os tiraria dos grupos.
+        for sprite in group.sprites():
+            if isinstance(sprite, PooledSprite): sprite.kill()
+        group.empty()
+    for pool in entity_pools.values(): pool.recycle()
     all_groups['todos'].add(all_groups['mago_sprite'])
     global cenario_x; cenario_x = 0
 
 def draw_text_centered(surface, text, font, color, y_pos):
-    rendered_text = font.render(text, True, color)
+    rendered_text = text_cache.render(font, text, color)
     rect = rendered_text.get_rect(center=(LARGURA_TELA / 2, y_pos))
-    surface.blit(rendered_text, rect)
+    return surface.blit(rendered_text, rect)
+
+class HudCache:
+    """
+    HUD da partida (pontos, vidas e combo) composto numa única superfície, refeita
+    só quando um desses campos do GameState muda.
+    """
+    def __init__(self):
+        self._key = None
+        self._surface = None
+        self.composicoes = 0
+
+    def surface_for(self, game_state):
+        key = (game_state.pontuacao, game_state.vidas, game_state.combo)
+        if key != self._key:
+            self._key, self._surface = key, self._compose(game_state)
+            self.composicoes += 1
+        return self._surface
+
+    def _compose(self, game_state):
+        pontos = text_cache.render(fonte, f"Pontos: {game_state.pontuacao}", (255, 255, 255))
+        combo = text_cache.render(fonte_media, f"Combo x{game_state.combo}!", (255, 215, 0)) if game_state.combo > 1 else None
+        largura = max(20 + pontos.get_width(), 40 + game_state.vidas * 40, 20 + (combo.get_width() if combo else 0))
+        altura = 120 + combo.get_height() if combo else max(20 + pontos.get_height(), 95)
+        surf = pygame.Surface((largura, altura), pygame.SRCALPHA)
+        surf.blit(pontos, (20, 20))
+        for i in range(game_state.vidas): pygame.draw.circle(surf, (255, 100, 100), (40 + i * 40, 80), 15, 0)
+        if combo: surf.blit(combo, (20, 120))
+        return surf
+
+hud = HudCache()
+
+def draw_voice_status(surface, voice_system):
+    """Aviso no canto inferior esquerdo enquanto o reconhecedor ainda está subindo."""
+    if voice_system.estado != "CARREGANDO": return []
+    aviso = text_cache.render(fonte_pequena, "voz carregando... (use o teclado)", (200, 200, 200))
+    return [surface.blit(aviso, aviso.get_rect(bottomleft=(20, ALTURA_TELA - 20)))]
 
 def draw_ui(surface, game_state, voice_available):
+    """Desenha a interface do estado atual e retorna os retângulos alterados."""
+    rects = []
     if game_state.estado == "JOGANDO":
-        surface.blit(fonte.render(f"Pontos: {game_state.pontuacao}", True, (255, 255, 255)), (20, 20))
-        for i in range(game_state.vidas): pygame.draw.circle(surface, (255, 100, 100), (40 + i * 40, 80), 15, 0)
-        if game_state.combo > 1: surface.blit(fonte_media.render(f"Combo x{game_state.combo}!", True, (255, 215, 0)), (20, 120))
+        rects.append(surface.blit(hud.surface_for(game_state), (0, 0)))
     elif game_state.estado == "MENU":
-        draw_text_centered(surface, "MAGO DOS COMANDOS", fonte, (255, 255, 100), ALTURA_TELA / 4)
+        rects.append(draw_text_centered(surface, "MAGO DOS COMANDOS", fonte, (255, 255, 100), ALTURA_TELA / 4))
         
         cor_iniciar = (255, 255, 0) if game_state.menu_option == "INICIAR" else (200, 255, 200)
         cor_pontos = (255, 255, 0) if game_state.menu_option == "PONTUACOES" else (200, 255, 200)
 
-        draw_text_centered(surface, "Iniciar Jogo", fonte_media, cor_iniciar, ALTURA_TELA / 2)
-        draw_text_centered(surface, "Pontuações", fonte_media, cor_pontos, ALTURA_TELA / 2 + 60)
+        rects.append(draw_text_centered(surface, "Iniciar Jogo", fonte_media, cor_iniciar, ALTURA_TELA / 2))
+        rects.append(draw_text_centered(surface, "Pontuações", fonte_media, cor_pontos, ALTURA_TELA / 2 + 60))
         
         instrucao = "Use SETAS e ENTER ou fale 'COMEÇAR'/'PONTUAÇÃO'" if voice_available else "Use SETAS e ENTER"
-        draw_text_centered(surface, instrucao, fonte_pequena, (200, 200, 200), ALTURA_TELA * 0.75)
+        rects.append(draw_text_centered(surface, instrucao, fonte_pequena, (200, 200, 200), ALTURA_TELA * 0.75))
 
     elif game_state.estado == "SCORES":
-        draw_text_centered(surface, "MELHORES PONTUAÇÕES", fonte, (255, 215, 0), ALTURA_TELA / 6)
+        rects.append(draw_text_centered(surface, "MELHORES PONTUAÇÕES", fonte, (255, 215, 0), ALTURA_TELA / 6))
         top_scores = game_state.score_manager.get_top_scores(5)
         if not top_scores:
-            draw_text_centered(surface, "Nenhuma pontuação registrada ainda.", fonte_pequena, (255, 255, 255), ALTURA_TELA / 2)
+            rects.append(draw_text_centered(surface, "Nenhuma pontuação registrada ainda.", fonte_pequena, (255, 255, 255), ALTURA_TELA / 2))
         else:
             for i, score_entry in enumerate(top_scores):
                 texto = f"{i+1}. {score_entry['name']}: {score_entry['score']}"
-                draw_text_centered(surface, texto, fonte_media, (255, 255, 255), ALTURA_TELA / 3 + i * 60)
+                rects.append(draw_text_centered(surface, texto, fonte_media, (255, 255, 255), ALTURA_TELA / 3 + i * 60))
         instrucao = "Fale 'VOLTAR' ou pressione ESC para retornar ao menu."
-        draw_text_centered(surface, instrucao, fonte_pequena, (200, 200, 200), ALTURA_TELA * 0.85)
+        rects.append(draw_text_centered(surface, instrucao, fonte_pequena, (200, 200, 200), ALTURA_TELA * 0.85))
 
     elif game_state.estado == "GET_NAME":
-        draw_text_centered(surface, "DIGITE SEU NOME", fonte, (255, 255, 100), ALTURA_TELA / 3)
-        nome_render = fonte_media.render(game_state.player_name, True, (255, 255, 255))
+        rects.append(draw_text_centered(surface, "DIGITE SEU NOME", fonte, (255, 255, 100), ALTURA_TELA / 3))
+        nome_render = text_cache.render(fonte_media, game_state.player_name, (255, 255, 255))
         nome_rect = nome_render.get_rect(center=(LARGURA_TELA/2, ALTURA_TELA/2))
-        pygame.draw.rect(tela, (30, 30, 30), (nome_rect.x - 10, nome_rect.y - 10, nome_rect.width + 20, nome_rect.height + 20))
+        rects.append(pygame.draw.rect(tela, (30, 30, 30), (nome_rect.x - 10, nome_rect.y - 10, nome_rect.width + 20, nome_rect.height + 20)))
         tela.blit(nome_render, nome_rect)
         instrucao = "Pressione ENTER ou fale 'COMEÇAR' para continuar"
-        draw_text_centered(surface, instrucao, fonte_pequena, (200, 255, 200), ALTURA_TELA * 0.65)
+        rects.append(draw_text_centered(surface, instrucao, fonte_pequena, (200, 255, 200), ALTURA_TELA * 0.65))
 
     elif game_state.estado == "GAME_OVER":
-        draw_text_centered(surface, "GAME OVER", fonte, (255, 50, 50), ALTURA_TELA / 2 - 50)
-        draw_text_centered(surface, f"Pontuação final: {game_state.pontuacao}", fonte_media, (255, 255, 255), ALTURA_TELA / 2 + 20)
-        draw_text_centered(surface, "Voltando para o menu...", fonte_pequena, (200, 200, 200), ALTURA_TELA * 0.8)
+        rects.append(draw_text_centered(surface, "GAME OVER", fonte, (255, 50, 50), ALTURA_TELA / 2 - 50))
+        rects.append(draw_text_centered(surface, f"Pontuação final: {game_state.pontuacao}", fonte_media, (255, 255, 255), ALTURA_TELA / 2 + 20))
+        rects.append(draw_text_centered(surface, "Voltando para o menu...", fonte_pequena, (200, 200, 200), ALTURA_TELA * 0.8))
+    return rects
 
 # --- FUNÇÃO PARA DESENHAR O CENÁRIO ---
 def draw_scrolling_background():
@@ -373,11 +665,96 @@ def draw_scrolling_background():
     if cenario_x <= -LARGURA_TELA:
         cenario_x = 0
 
-def menu_loop(game_state, voice_system):
+def restore_background(surface, rect, offset_x):
+    """Redesenha só o pedaço `rect` do cenário, como desenhado no deslocamento `offset_x`."""
+    for x in (offset_x, offset_x + LARGURA_TELA):
+        surface.blit(cenario_img, rect, area=pygame.Rect(rect).move(-int(x), 0))
+
+# --- RENDERIZADORES ---
+def flip_display():
+    if janela is not None: pygame.transform.scale(tela, janela.get_size(), janela)
+    pygame.display.flip()
+
+def update_display(rects):
+    """display.update(rects) com os retângulos em coordenadas lógicas."""
+    if janela is None:
+        pygame.display.update(rects); return
+    # Amplia o frame inteiro (uma única chamada em C) e envia só as regiões alteradas.
+    pygame.transform.scale(tela, janela.get_size(), janela)
+    sx, sy = janela.get_width() / LARGURA_TELA, janela.get_height() / ALTURA_TELA
+    pygame.display.update([pygame.Rect(int(r.x * sx) - 1, int(r.y * sy) - 1, int(r.w * sx) + 3, int(r.h * sy) + 3) for r in rects])
+
+class FullRenderer:
+    """Modo padrão: redesenha o cenário inteiro e faz flip() a cada frame."""
+    def invalidate(self): pass
+    def begin_frame(self, surface): draw_scrolling_background()
+    def present(self, rects): flip_display()
+
+class DirtyRenderer:
+    """
+    Renderização por retângulos sujos para máquinas sem aceleração.
+
+    Em cada frame, apaga (com o cenário) só os retângulos desenhados no frame
+    anterior, desenha os novos e envia ao display apenas a união dos dois via
+    display.update(rects). O cenário rolando sujaria a tela inteira, então ele é
+    repintado por completo só a cada `intervalo_fundo` segundos (rolagem em
+    passos); com intervalo_fundo=None ele fica parado.
+    """
+    def __init__(self, intervalo_fundo=0.25):
+        self.intervalo_fundo = intervalo_fundo
+        self.rects_anteriores = []
+        self.fundo_x = 0.0           # deslocamento do cenário na última repintura completa
+        self.ultimo_fundo = 0.0
+        self.completo = True
+        self.frames_completos = self.frames_parciais = 0
+
+    def invalidate(self):
+        """Força uma repintura completa no próximo frame (ex: troca de tela)."""
+        self.completo = True
+
+    def begin_frame(self, surface):
+        agora = time.perf_counter()
+        if (not self.completo and self.intervalo_fundo is not None
+                and agora - self.ultimo_fundo >= self.intervalo_fundo and int(cenario_x) != int(self.fundo_x)):
+            self.completo = True
+        if self.completo:
+            self.fundo_x, self.ultimo_fundo = cenario_x, agora
+            draw_scrolling_background()
+        else:
+            for rect in self.rects_anteriores:
+                restore_background(surface, rect, self.fundo_x)
+
+    def present(self, rects):
+        rects = [r for r in rects if r]
+        if self.completo:
+            flip_display(); self.completo = False; self.frames_completos += 1
+        else:
+            update_display(self.rects_anteriores + rects); self.frames_parciais += 1
+        self.rects_anteriores = rects
+
+renderer = FullRenderer()
+# Tempo por fase de cada frame; F3 mostra p50/p95/p99 e --perfil grava ao sair.
+profiler = FrameProfiler()
+
+def present_menu_frame(game_state, voice_system):
+    """Final de frame comum a menu, placar e nome: cenário, interface, overlay, flip e espera."""
     global cenario_x
+    cenario_x -= 12 * escala_x * clock.get_time() / 1000.0
+    renderer.begin_frame(tela); profiler.mark('cenario')
+    rects = draw_ui(tela, game_state, voice_system.voice_available) + draw_voice_status(tela, voice_system); profiler.mark('ui')
+    profiler.add('texto', text_cache.take_frame_ms())
+    rects += profiler.draw_overlay(tela, fonte_perfil); profiler.mark('overlay')
+    renderer.present(rects); profiler.mark('flip')
+    clock.tick(FPS); profiler.mark('espera')
+    profiler.end_frame()
+
+def menu_loop(game_state, voice_system):
+    renderer.invalidate()
     looping = True
     while looping:
+        profiler.begin_frame('menu')
         for event in pygame.event.get():
+            if profiler.handle_event(event): continue
             if event.type == pygame.QUIT: return "QUIT"
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE: return "QUIT"
@@ -391,42 +768,44 @@ def menu_loop(game_state, voice_system):
                     else:
                         game_state.estado = "SCORES"
                     looping = False
+        profiler.mark('eventos')
         
-        transcricoes = voice_system.get_all_pending_transcripts()
+        transcricoes = voice_system.get_all_pending_transcripts(); profiler.mark('voz')
         for trans in transcricoes:
             comandos = process_voice_command(trans)
             if "comecar" in comandos:
                 game_state.estado = "GET_NAME"; looping = False
             elif "pontuacao" in comandos:
                 game_state.estado = "SCORES"; looping = False
+        profiler.mark('comandos')
 
-        cenario_x -= 0.2 * escala_x
-        draw_scrolling_background()
-        draw_ui(tela, game_state, voice_system.voice_available)
-        pygame.display.flip(); clock.tick(FPS)
+        present_menu_frame(game_state, voice_system)
 
 def scores_loop(game_state, voice_system):
-    global cenario_x
+    renderer.invalidate()
     while True:
+        profiler.begin_frame('placar')
         for event in pygame.event.get():
+            if profiler.handle_event(event): continue
             if event.type == pygame.QUIT: return "QUIT"
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 game_state.estado = "MENU"; return
+        profiler.mark('eventos')
         
-        transcricoes = voice_system.get_all_pending_transcripts()
+        transcricoes = voice_system.get_all_pending_transcripts(); profiler.mark('voz')
         if any("voltar" in process_voice_command(t) for t in transcricoes):
             game_state.estado = "MENU"; return
+        profiler.mark('comandos')
 
-        cenario_x -= 0.2 * escala_x
-        draw_scrolling_background()
-        draw_ui(tela, game_state, voice_system.voice_available)
-        pygame.display.flip(); clock.tick(FPS)
+        present_menu_frame(game_state, voice_system)
 
 def get_name_loop(game_state, voice_system):
-    global cenario_x
+    renderer.invalidate()
     game_state.player_name = ""
     while True:
+        profiler.begin_frame('nome')
         for event in pygame.event.get():
+            if profiler.handle_event(event): continue
             if event.type == pygame.QUIT: return "QUIT"
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
@@ -438,15 +817,14 @@ def get_name_loop(game_state, voice_system):
                 else:
                     if len(game_state.player_name) < 15 and event.unicode.isalnum():
                         game_state.player_name += event.unicode
+        profiler.mark('eventos')
         
-        transcricoes = voice_system.get_all_pending_transcripts()
+        transcricoes = voice_system.get_all_pending_transcripts(); profiler.mark('voz')
         if any("comecar" in process_voice_command(t) for t in transcricoes) and game_state.player_name:
             game_state.estado = "JOGANDO"; return
+        profiler.mark('comandos')
 
-        cenario_x -= 0.2 * escala_x
-        draw_scrolling_background()
-        draw_ui(tela, game_state, voice_system.voice_available)
-        pygame.display.flip(); clock.tick(FPS)
+        present_menu_frame(game_state, voice_system)
 
 def game_over_loop(game_state):
     game_state.score_manager.save_score(game_state.player_name, game_state.pontuacao)
@@ -458,114 +836,558 @@ def game_over_loop(game_state):
         
         tela.fill((0,0,0))
         draw_ui(tela, game_state, False)
-        pygame.display.flip()
+        flip_display()
         clock.tick(15)
     
     game_state.estado = "MENU"
     return "MENU"
 
-def game_loop(game_state, voice_system, anim_manager):
-    global cenario_x
-    mago = Mago(anim_manager)
-    all_groups = {'todos': pygame.sprite.Group(), 'mago_sprite': mago, 'monstros': pygame.sprite.Group(), 'feiticos': pygame.sprite.Group(), 'aprendizes': pygame.sprite.Group(), 'explosoes': pygame.sprite.Group()}
-    reset_game_state(game_state, all_groups)
-    
-    aprendiz_ativo, PONTUACAO_PARA_APRENDIZ = None, 250
-    mapa_comandos_voz = {"gelo": "fogo", "fogo": "gelo", "raio": "terra"}
-    intervalo_spawn, ultimo_spawn = 2000, pygame.time.get_ticks()
+class GameClock:
+    """Relógio real: pygame.time.get_ticks() e o Clock global, limitado ao FPS."""
+    def get_ticks(self): return pygame.time.get_ticks()
+    def tick(self, fps): return clock.tick(fps)
 
-    fila_de_comandos_de_voz = deque()
+class SimulatedClock:
+    """Relógio simulado: cada tick avança exatamente 1000/fps ms, sem esperar."""
+    def __init__(self): self.ticks = 0.0
+    def get_ticks(self): return int(self.ticks)
+    def tick(self, fps):
+        dt = 1000.0 / fps if fps else 0.0
+        self.ticks += dt
+        return dt
 
-    while game_state.estado == "JOGANDO":
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
-                game_state.estado = "QUIT"; break
-            
-            if not voice_system.voice_available and event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_1: fila_de_comandos_de_voz.append("fogo")
-                if event.key == pygame.K_2: fila_de_comandos_de_voz.append("gelo")
-                if event.key == pygame.K_3: fila_de_comandos_de_voz.append("raio")
-        
-        transcricoes = voice_system.get_all_pending_transcripts()
+def inverter_mapa(mapa_comandos_voz):
+    """{feitiço: tipo de monstro} -> {tipo de monstro: feitiço}; o primeiro feitiço de cada tipo vence."""
+    inverso = {}
+    for feitico, tipo in mapa_comandos_voz.items(): inverso.setdefault(tipo, feitico)
+    return inverso
+
+def _chave_alvo(monstro):
+    return (monstro.rect.x, monstro.ordem_spawn)
+
+class MonsterIndex:
+    """
+    Monstros vivos separados por elemento, cada lista ordenada por (rect.x, ordem
+    de spawn): o mesmo critério (e o mesmo desempate) de min(..., key=rect.x) sobre
+    o grupo. nearest(tipo) é O(1); refresh() roda uma vez por passo, depois do
+    movimento e das mortes, e como as listas já estão quase ordenadas o sort
+    (timsort) é linear.
+    """
+    def __init__(self):
+        self.por_tipo = {}
+        self._proxima_ordem = 0
+
+    def add(self, monstro):
+        monstro.ordem_spawn = self._proxima_ordem; self._proxima_ordem += 1
+        lista = self.por_tipo.setdefault(monstro.tipo, [])
+        lista.append(monstro)
+        if len(lista) > 1 and _chave_alvo(lista[-2]) > _chave_alvo(monstro): lista.sort(key=_chave_alvo)
+
+    def refresh(self):
+        for tipo, lista in self.por_tipo.items():
+            vivos = [m for m in lista if m.alive()]
+            vivos.sort(key=_chave_alvo)
+            self.por_tipo[tipo] = vivos
+
+    def nearest(self, tipo):
+        """Monstro vivo mais à esquerda do elemento `tipo`, ou None."""
+        for monstro in self.por_tipo.get(tipo, ()):
+            if monstro.alive(): return monstro
+        return None
+
+    def nearest_any(self):
+        candidatos = [m for m in map(self.nearest, self.por_tipo) if m is not None]
+        return min(candidatos, key=_chave_alvo) if candidatos else None
+
+class GameWorld:
+    """
+    Estado de uma partida: sprites, fila de feitiços e temporizador de spawn.
+    update(dt) avança a simulação em passos fixos; o tempo de jogo (tempo_ms) é
+    o acumulado desses passos, então o ritmo não depende do FPS de desenho.
+
+    Com horda > 0 (modo de estresse) o spawn mantém `horda` monstros vivos e os
+    que escapam pela esquerda são só repostos, sem custar vidas.
+
+    Monstros e feitiços são sprites; os métodos da seção "Entidades" são o que o
+    SoAGameWorld troca para guardá-los em arrays.
+    """
+    PONTUACAO_PARA_APRENDIZ = 250
+    # Fila de feitiços (um lançado por passo): acúmulos de fala não viram rajadas atrasadas.
+    FILA_FEITICOS_MAX = 16
+    IDADE_MAX_FEITICO = 1.0     # segundos de jogo
+    COALESCER_FEITICO_APOS = 0.25
+
+    def __init__(self, game_state, anim_manager, rng=random, horda=0):
+        self.game_state, self.anim_manager, self.rng = game_state, anim_manager, rng
+        self.horda = horda
+        self.mago = Mago(anim_manager)
+        self.all_groups = {'todos': pygame.sprite.Group(), 'mago_sprite': self.mago, 'monstros': pygame.sprite.Group(), 'feiticos': pygame.sprite.Group(), 'aprendizes': pygame.sprite.Group(), 'explosoes': pygame.sprite.Group()}
+        reset_game_state(game_state, self.all_groups)
+        self.aprendiz_ativo = None
+        self.mapa_comandos_voz = {"gelo": "fogo", "fogo": "gelo", "raio": "terra"}
+        self.indice_monstros = MonsterIndex()
+        self.tempo_ms = 0.0
+        self.intervalo_spawn, self.ultimo_spawn = 2000, 0.0
+        # Itens (tipo do feitiço, trace_id ou None), no relógio do jogo para não depender do FPS.
+        self.fila_de_comandos_de_voz = CommandBus(self.FILA_FEITICOS_MAX, self.IDADE_MAX_FEITICO, self.COALESCER_FEITICO_APOS,
+                                                  clock=lambda: self.tempo_ms / 1000.0, ao_descartar=self._spell_dropped)
+        # Usada quando compensa (ver collide); a célula tem o tamanho do maior sprite (o monstro de 3 vidas).
+        self.grade_feiticos = SpatialHash(max(tamanho_monstro(3)), bounds=tela.get_rect())
+
+    def process_transcripts(self, transcricoes):
         for trans in transcricoes:
-            comandos = process_voice_command(trans)
-            for cmd in comandos:
-                if cmd in mapa_comandos_voz:
-                    fila_de_comandos_de_voz.append(cmd)
-                    
+            feiticos = [cmd for cmd in process_voice_command(trans, aproximado=True) if cmd in self.mapa_comandos_voz]
+            trace_id = getattr(trans, 'trace_id', None)
+            voice_tracer.recognized(trace_id, len(feiticos))
+            for cmd in feiticos: self.queue_spell(cmd, trace_id, getattr(trans, 'idade', 0.0))
+
+    def queue_spell(self, tipo_feitico, trace_id=None, idade=0.0):
+        # `idade`: segundos que o comando já esperou antes do jogo; a fila continua a contagem.
+        self.fila_de_comandos_de_voz.put((tipo_feitico, trace_id), chave=tipo_feitico, instante=self.tempo_ms / 1000.0 - idade)
+
+    def _spell_dropped(self, comando, motivo):
+        if comando[1] is not None: voice_tracer.spell_dropped(comando[1])
+
+    def update(self, dt=PASSO_FIXO):
+        """Avança a simulação em um passo de `dt` segundos (sem desenhar nada)."""
+        global cenario_x
+        game_state, all_groups, mago, anim_manager = self.game_state, self.all_groups, self.mago, self.anim_manager
+
         # Lança um feitiço por frame, enquanto houver comandos na fila.
-        if fila_de_comandos_de_voz:
-            tipo_feitico = fila_de_comandos_de_voz.popleft()
-            
+        comando = self.fila_de_comandos_de_voz.pop() if self.fila_de_comandos_de_voz else None
+        if comando is not None:
+            tipo_feitico, trace_id = comando
+
             mago.cast_spell()
 
-            tipo_alvo = mapa_comandos_voz.get(tipo_feitico)
-            alvos = [m for m in all_groups['monstros'] if m.tipo == tipo_alvo]
-            
-            alvo_final = None
-            if alvos:
-                # Mira no alvo mais próximo
-                alvo_final = min(alvos, key=lambda m: m.rect.x)
+            # Mira no alvo mais próximo do elemento certo (None se não houver)
+            alvo_final = self.indice_monstros.nearest(self.mapa_comandos_voz.get(tipo_feitico))
                 
             # Cria UM feitiço, com ou sem alvo
-            feitico_novo = Feitico(tipo_feitico, mago.rect.center, anim_manager, mapa_comandos_voz, alvo=alvo_final)
-            all_groups['todos'].add(feitico_novo)
-            all_groups['feiticos'].add(feitico_novo)
+            self.spawn_spell(tipo_feitico, mago.rect.center, alvo_final)
+            if trace_id is not None: voice_tracer.spell_cast(trace_id)
         
-        cenario_x -= 0.5 * escala_x
-        if not aprendiz_ativo and game_state.pontuacao >= PONTUACAO_PARA_APRENDIZ:
-            aprendiz_ativo=Aprendiz(mago,anim_manager,mapa_comandos_voz); all_groups['todos'].add(aprendiz_ativo); all_groups['aprendizes'].add(aprendiz_ativo)
-        if aprendiz_ativo: aprendiz_ativo.logica_de_combate(mago,all_groups['monstros'],all_groups['todos'],all_groups['feiticos'])
-        if pygame.time.get_ticks() - ultimo_spawn > intervalo_spawn:
-            monstro = Monstro(game_state.dificuldade, anim_manager)
-            all_groups['todos'].add(monstro); all_groups['monstros'].add(monstro); ultimo_spawn = pygame.time.get_ticks()
+        self.tempo_ms += dt * 1000.0
+        cenario_x -= 30 * escala_x * dt
+        if not self.aprendiz_ativo and game_state.pontuacao >= self.PONTUACAO_PARA_APRENDIZ:
+            self.aprendiz_ativo = Aprendiz(mago, anim_manager, self.mapa_comandos_voz, rng=self.rng); all_groups['todos'].add(self.aprendiz_ativo); all_groups['aprendizes'].add(self.aprendiz_ativo)
+        if self.aprendiz_ativo: self.aprendiz_ativo.logica_de_combate(mago, self.indice_monstros, self.spawn_spell, dt)
+        if self.horda:
+            for _ in range(self.horda - self.monster_count()): self.spawn_monster()
+        elif self.tempo_ms - self.ultimo_spawn > self.intervalo_spawn:
+            self.spawn_monster(); self.ultimo_spawn = self.tempo_ms
+        profiler.mark('logica')
         
-        all_groups['todos'].update(); all_groups['explosoes'].update()
+        self.advance_entities(dt); profiler.mark('sprites')
         
-        hits = pygame.sprite.groupcollide(all_groups['monstros'], all_groups['feiticos'], False, True)
-        for monstro, feiticos_hit in hits.items():
+        hits = self.collide(); profiler.mark('colisao')
+        for monstro, feiticos_hit in hits:
             if feiticos_hit[0].tipo_alvo == monstro.tipo:
                 for _ in feiticos_hit:
                     if monstro.tomar_dano():
                         game_state.pontuacao += 10 + game_state.combo * 2; game_state.combo += 1
-                        all_groups['explosoes'].add(Explosao(monstro.rect.center, anim_manager)); monstro.kill()
+                        all_groups['explosoes'].add(entity_pools['explosoes'].acquire(monstro.rect.center, anim_manager)); monstro.kill()
                         break
             else: game_state.combo = 0
         
         nova_dif = game_state.pontuacao // 100
-        if nova_dif > game_state.dificuldade: game_state.dificuldade = nova_dif; intervalo_spawn = max(500, 2000 - game_state.dificuldade*150)
-        for monstro in list(all_groups['monstros']):
-            if monstro.rect.right < 0:
-                monstro.kill(); game_state.vidas -= 1; game_state.combo = 0
-                if game_state.vidas <= 0:
-                    game_state.estado = "GAME_OVER"
-        
-        draw_scrolling_background()
-        all_groups['todos'].draw(tela); all_groups['explosoes'].draw(tela)
-        for m in all_groups['monstros']: m.draw_vida(tela)
-        draw_ui(tela, game_state, voice_system.voice_available)
+        if nova_dif > game_state.dificuldade: game_state.dificuldade = nova_dif; self.intervalo_spawn = max(500, 2000 - game_state.dificuldade*150)
+        for monstro in self.escaped_monsters():
+            monstro.kill()
+            if self.horda: continue
+            game_state.vidas -= 1; game_state.combo = 0
+            if game_state.vidas <= 0:
+                game_state.estado = "GAME_OVER"
+        self.end_step()
+        profiler.mark('logica')
+
+    # --- Entidades ---
+    def spawn_monster(self):
+        monstro = entity_pools['monstros'].acquire(self.game_state.dificuldade, self.anim_manager, rng=self.rng)
+        self.all_groups['todos'].add(monstro); self.all_groups['monstros'].add(monstro); self.indice_monstros.add(monstro)
+
+    def spawn_spell(self, tipo_feitico, origem, alvo=None):
+        feitico = entity_pools['feiticos'].acquire(tipo_feitico, origem, self.anim_manager, self.mapa_comandos_voz, alvo=alvo)
+        self.all_groups['todos'].add(feitico); self.all_groups['feiticos'].add(feitico)
+
+    def monster_count(self):
+        return len(self.all_groups['monstros'])
+
+    def advance_entities(self, dt):
+        self.all_groups['todos'].update(dt); self.all_groups['explosoes'].update(dt)
+
+    def collide(self):
+        """[(monstro, [feitiços que o atingiram])]; os feitiços atingidos e os que saíram da tela morrem."""
+        all_groups, grade = self.all_groups, self.grade_feiticos
+        usar_grade = usar_grade_colisao
+        if usar_grade is None:
+            # A grade só quando compensa; com os sprites do jogo em tela cheia, nunca (ver bench_colisao).
+            usar_grade = grade_compensa(len(all_groups['feiticos']), grade.cell_size, grade.bounds)
+        if not usar_grade:
+            area = grade.bounds
+            for feitico in all_groups['feiticos'].sprites():
+                if not area.colliderect(feitico.rect): feitico.kill()
+            return pygame.sprite.groupcollide(all_groups['monstros'], all_groups['feiticos'], False, True).items()
+        # Remonta a grade com os feitiços; os que saíram da tela ficam de fora e morrem.
+        grade.clear()
+        for feitico in all_groups['feiticos'].sprites():
+            if not grade.insert(feitico, feitico.rect): feitico.kill()
+        return groupcollide(all_groups['monstros'], all_groups['feiticos'], grade, False, True).items()
+
+    def escaped_monsters(self):
+        """Monstros vivos que passaram inteiros pela borda esquerda."""
+        return [monstro for monstro in self.all_groups['monstros'] if monstro.rect.right < 0]
+
+    def end_step(self):
+        self.indice_monstros.refresh()
+        # Só agora nada mais aponta para os sprites mortos neste passo.
+        for pool in entity_pools.values(): pool.recycle()
+
+    def close(self):
+        """Fim da partida: devolve aos pools os sprites que ainda estavam vivos."""
+        for grupo in (self.all_groups['todos'], self.all_groups['explosoes']):
+            for sprite in grupo.sprites(): sprite.kill()
+        for pool in entity_pools.values(): pool.recycle()
+
+    def draw(self, surface, voice_available, alpha=0.0):
+        """
+        Desenha sprites e interface (sem o cenário, que é do renderer) no estado
+        interpolado entre o último passo e o próximo (alpha em [0, 1)).
+        Com usar_lote_rle, sprites e barras de vida saem de um único Surface.blits
+        com as cópias RLE de anim_manager.quadros_lote (ver lote_blits).
+        Retorna os retângulos alterados.
+        """
+        all_groups = self.all_groups
+        if usar_lote_rle:
+            rects = surface.blits(self.lote_blits(alpha))
+        else:
+            rects = draw_interpolated(surface, all_groups['todos'], alpha)
+            rects += draw_interpolated(surface, all_groups['explosoes'], alpha)
+            for m in all_groups['monstros']: rects.append(m.draw_vida(surface, m.render_rect(alpha)))
+        profiler.mark('desenho')
+        rects += draw_ui(surface, self.game_state, voice_available); profiler.mark('ui')
+        return rects
+
+    def lote_blits(self, alpha):
+        """(superfície, destino, área) de sprites e barras de vida, na mesma ordem do desenho fora do lote."""
+        all_groups, region = self.all_groups, self.anim_manager.quadros_lote.region
+        blits = lote_sprite_blits(all_groups['todos'], region, alpha) + lote_sprite_blits(all_groups['explosoes'], region, alpha)
+        for m in all_groups['monstros']:
+            if m.vida_maxima > 1:
+                rect = m.render_rect(alpha); imagem, area = region(health_bar_image(m.vida_atual, m.vida_maxima, m.cor_vida))
+                blits.append((imagem, health_bar_pos(rect.x, rect.y, rect.w), area))
+        return blits
+
+def draw_interpolated(surface, group, alpha):
+    """Como Group.draw, mas sprites com render_rect() são desenhados na posição interpolada."""
+    return surface.blits([(s.image, s.render_rect(alpha) if hasattr(s, 'render_rect') else s.rect) for s in group])
+
+def lote_sprite_blits(group, region, alpha):
+    """Os blits do draw_interpolated como (superfície, destino, área), com `region` dando de onde sai cada frame."""
+    blits = []
+    for s in group:
+        imagem, area = region(s.image)
+        blits.append((imagem, s.render_rect(alpha) if hasattr(s, 'render_rect') else s.rect, area))
+    return blits
+
+# --- MOTOR DE ENTIDADES EM ARRAYS ---
+class MonstroView:
+    """Linha de monstro do SoAGameWorld com a cara de um Monstro (tipo, rect, tomar_dano, kill)."""
+    __slots__ = ('monstros', 'linha')
+    def __init__(self, monstros, linha): self.monstros, self.linha = monstros, linha
+    @property
+    def tipo(self): return TIPOS_MONSTRO[self.monstros.tipo[self.linha]]
+    @property
+    def rect(self):
+        m, i = self.monstros, self.linha
+        return pygame.Rect(int(m.left[i]), int(m.top[i]), int(m.w[i]), int(m.h[i]))
+    def tomar_dano(self):
+        self.monstros.vida[self.linha] -= 1; return self.monstros.vida[self.linha] <= 0
+    def kill(self): self.monstros.kill(self.linha)
+
+class FeiticoView:
+    """Linha de feitiço do SoAGameWorld; a coluna tipo guarda o índice do elemento que ele mata."""
+    __slots__ = ('feiticos', 'linha')
+    def __init__(self, feiticos, linha): self.feiticos, self.linha = feiticos, linha
+    @property
+    def tipo_alvo(self):
+        codigo = self.feiticos.tipo[self.linha]
+        return TIPOS_MONSTRO[codigo] if codigo >= 0 else None
+
+class SoAMonsterIndex:
+    """Mesma interface do MonsterIndex, direto nos arrays: as linhas já estão na ordem de spawn."""
+    def __init__(self, monstros): self.monstros = monstros
+    def nearest(self, tipo):
+        if tipo not in TIPOS_MONSTRO: return None
+        linha = self.monstros.leftmost(self.monstros.tipo == TIPOS_MONSTRO.index(tipo))
+        return None if linha is None else MonstroView(self.monstros, linha)
+    def nearest_any(self):
+        linha = self.monstros.leftmost()
+        return None if linha is None else MonstroView(self.monstros, linha)
+
+class SoAGameWorld(GameWorld):
+    """
+    GameWorld com monstros e feitiços em entity_store.EntityArrays em vez de
+    sprites: movimento, animação, descarte fora da tela e colisão AABB rodam
+    como operações vetorizadas sobre todas as entidades de uma vez, e o desenho
+    é um único Surface.blits por tipo montado a partir dos arrays. Mago,
+    aprendiz e explosões continuam sprites.
+
+    O código que espera um sprite (alvos, acertos) recebe MonstroView e
+    FeiticoView, que leem e escrevem a linha correspondente. Com o mesmo rng a
+    partida é a mesma do GameWorld. Feito para o modo horda, com milhares de
+    monstros; precisa do numpy.
+    """
+    def __init__(self, game_state, anim_manager, rng=random, horda=0):
+        self.monstros = entity_store.EntityArrays('topleft', capacidade=max(256, 2 * horda))
+        self.feiticos = entity_store.EntityArrays('center')
+        self.animacoes, self._animacao_ids = [], {}  # listas de frames, indexadas pela coluna 'animacao'
+        self.regioes = []  # (superfície, área) de cada frame em quadros_lote, paralelo a animacoes; None até o primeiro desenho
+        super().__init__(game_state, anim_manager, rng, horda)
+        self.indice_monstros = SoAMonsterIndex(self.monstros)
+
+    def _animacao(self, nome, tamanho=None):
+        chave = (nome, tamanho)
+        if chave not in self._animacao_ids:
+            self._animacao_ids[chave] = len(self.animacoes); self.animacoes.append(self.anim_manager.get_frames(nome, tamanho))
+            self.regioes.append(None)
+        return self._animacao_ids[chave]
+
+    def spawn_monster(self):
+        dificuldade = self.game_state.dificuldade
+        tipo, vida_maxima, animation_speed = sortear_monstro(dificuldade, self.rng)
+        animacao = self._animacao(f'monstro_{tipo}', tamanho_monstro(vida_maxima))
+        frames = self.animacoes[animacao]; w, h = frames[0].get_size()
+        self.monstros.spawn(x=float(LARGURA_TELA + 50), y=self.rng.randint(50, ALTURA_TELA - h), vx=-velocidade_monstro(dificuldade),
+                            w=w, h=h, animation_speed=animation_speed, n_frames=len(frames), animacao=animacao,
+                            tipo=TIPOS_MONSTRO.index(tipo), vida=vida_maxima, vida_maxima=vida_maxima)
+
+    def spawn_spell(self, tipo_feitico, origem, alvo=None):
+        animacao = self._animacao(f'feitico_{tipo_feitico}')
+        frames = self.animacoes[animacao]
+        rect = frames[0].get_rect(center=origem)  # o Feitico também parte do centro já arredondado
+        velocidade = velocidade_feitico(pygame.Vector2(rect.center), alvo)
+        tipo_alvo = self.mapa_comandos_voz.get(tipo_feitico)
+        self.feiticos.spawn(x=float(rect.centerx), y=float(rect.centery), vx=velocidade.x, vy=velocidade.y, w=rect.w, h=rect.h,
+                            animation_speed=18.0, n_frames=len(frames), animacao=animacao,
+                            tipo=TIPOS_MONSTRO.index(tipo_alvo) if tipo_alvo in TIPOS_MONSTRO else -1)
+
+    def monster_count(self):
+        return len(self.monstros)
+
+    def advance_entities(self, dt):
+        super().advance_entities(dt)  # mago, aprendiz e explosões
+        self.monstros.advance(dt); self.feiticos.advance(dt)
+
+    def collide(self):
+        feiticos = self.feiticos
+        feiticos.vivo[feiticos.outside(LARGURA_TELA, ALTURA_TELA)] = False
+        hits = entity_store.first_hits(self.monstros, feiticos)
+        for _, linhas in hits: feiticos.vivo[linhas] = False
+        return [(MonstroView(self.monstros, m), [FeiticoView(feiticos, f) for f in linhas]) for m, linhas in hits]
+
+    def escaped_monsters(self):
+        m = self.monstros
+        return [MonstroView(m, linha) for linha in (m.vivo & (m.left + m.w < 0)).nonzero()[0].tolist()]
+
+    def end_step(self):
+        self.monstros.compact(); self.feiticos.compact()
+        for pool in entity_pools.values(): pool.recycle()
+
+    def close(self):
+        self.monstros.clear(); self.feiticos.clear()
+        super().close()
+
+    def _blits(self, arrays, alpha):
+        left, top = arrays.render_rects(alpha)
+        animacoes = self.animacoes
+        return [(animacoes[a][int(f)], (x, y)) for a, f, x, y
+                in zip(arrays.animacao.tolist(), arrays.frame_index.tolist(), left.tolist(), top.tolist())]
+
+    def _lote_blits(self, arrays, alpha):
+        left, top = arrays.render_rects(alpha)
+        regioes, blits = self.regioes, []
+        for a, f, x, y in zip(arrays.animacao.tolist(), arrays.frame_index.tolist(), left.tolist(), top.tolist()):
+            if regioes[a] is None: regioes[a] = self.anim_manager.quadros_lote.regions(self.animacoes[a])
+            imagem, area = regioes[a][int(f)]
+            blits.append((imagem, (x, y), area))
+        return blits
+
+    def lote_blits(self, alpha):
+        all_groups, m, region = self.all_groups, self.monstros, self.anim_manager.quadros_lote.region
+        blits = lote_sprite_blits(all_groups['todos'], region, alpha)
+        blits += self._lote_blits(m, alpha) + self._lote_blits(self.feiticos, alpha)
+        blits += lote_sprite_blits(all_groups['explosoes'], region, alpha)
+        # Barras de vida: posições calculadas de uma vez, como em health_bar_pos.
+        left, top = m.render_rects(alpha)
+        linhas = (m.vida_maxima > 1).nonzero()[0]
+        xs = (left[linhas] + m.w[linhas] // 2 - 60 * escala_x / 2).astype(int).tolist()
+        ys = (top[linhas] - 15 * escala_y).astype(int).tolist()
+        for i, x, y in zip(linhas.tolist(), xs, ys):
+            imagem, area = region(health_bar_image(int(m.vida[i]), int(m.vida_maxima[i]), CORES_VIDA[TIPOS_MONSTRO[m.tipo[i]]]))
+            blits.append((imagem, (x, y), area))
+        return blits
+
+    def draw(self, surface, voice_available, alpha=0.0):
+        all_groups, m = self.all_groups, self.monstros
+        if usar_lote_rle:
+            rects = surface.blits(self.lote_blits(alpha))
+        else:
+            rects = draw_interpolated(surface, all_groups['todos'], alpha)
+            rects += surface.blits(self._blits(m, alpha)) + surface.blits(self._blits(self.feiticos, alpha))
+            rects += draw_interpolated(surface, all_groups['explosoes'], alpha)
+            left, top = m.render_rects(alpha)
+            for i in (m.vida_maxima > 1).nonzero()[0].tolist():
+                rect = pygame.Rect(int(left[i]), int(top[i]), int(m.w[i]), int(m.h[i]))
+                rects.append(draw_health_bar(surface, rect, m.vida[i], m.vida_maxima[i], CORES_VIDA[TIPOS_MONSTRO[m.tipo[i]]]))
+        profiler.mark('desenho')
+        rects += draw_ui(surface, self.game_state, voice_available); profiler.mark('ui')
+        return rects
+
+# Mundo das partidas: GameWorld ou SoAGameWorld (--motor soa), com horda > 0 para o modo horda (--horda).
+classe_mundo, horda = GameWorld, 0
+# Desenho em lote, com as cópias RLE dos frames (--lote-rle).
+usar_lote_rle = False
+# Colisão monstros x feitiços pela grade espacial (True), pelo groupcollide (False) ou
+# pelo que compensar a cada passo (None, o padrão); ver --grade-colisao.
+usar_grade_colisao = None
+
+def criar_mundo(game_state, anim_manager, rng=random):
+    return classe_mundo(game_state, anim_manager, rng, horda=horda)
+
+def game_loop(game_state, voice_system, anim_manager, game_clock=None, rng=random):
+    game_clock = game_clock or GameClock()
+    world = criar_mundo(game_state, anim_manager, rng)
+    renderer.invalidate()
+    acumulador = 0.0
+    game_clock.tick(FPS)  # Descarta o tempo gasto fora da partida
+    # Coleta automática do GC desligada durante a partida; ver GcController.
+    with gc_control.deferred():
+        while game_state.estado == "JOGANDO":
+            profiler.begin_frame('jogo')
+            for event in pygame.event.get():
+                if profiler.handle_event(event): continue
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    game_state.estado = "QUIT"; break
+            
+                if not voice_system.voice_available and event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_1: world.queue_spell("fogo")
+                    if event.key == pygame.K_2: world.queue_spell("gelo")
+                    if event.key == pygame.K_3: world.queue_spell("raio")
+            profiler.mark('eventos')
         
-        pygame.display.flip()
-        clock.tick(FPS)
+            transcricoes = voice_system.get_all_pending_transcripts(); profiler.mark('voz')
+            world.process_transcripts(transcricoes); profiler.mark('comandos')
+
+            # Passos fixos de simulação para o tempo real decorrido; travadas (ex: do
+            # Chrome/Selenium) geram mais passos no frame seguinte, não um jogo mais lento.
+            while acumulador >= PASSO_FIXO and game_state.estado == "JOGANDO":
+                world.update(PASSO_FIXO); acumulador -= PASSO_FIXO
+            # ESC, QUIT ou GAME_OVER (inclusive no meio dos passos acima): a partida
+            # acabou e não há frame a desenhar; o que sobrou no acumulador daria alpha >= 1.
+            if game_state.estado != "JOGANDO":
+                profiler.end_frame(); break
+            renderer.begin_frame(tela); profiler.mark('cenario')
+            alpha = min(acumulador / PASSO_FIXO, 1.0)
+            rects = world.draw(tela, voice_system.voice_available, alpha) + draw_voice_status(tela, voice_system)
+            profiler.add('texto', text_cache.take_frame_ms())
+            rects += profiler.draw_overlay(tela, fonte_perfil); profiler.mark('overlay')
+            renderer.present(rects); voice_tracer.frame_presented(); profiler.mark('flip')
+            gc_control.end_of_frame(); profiler.mark('gc')
+            acumulador += min(game_clock.tick(FPS) / 1000.0, MAX_FRAME_DT); profiler.mark('espera')
+            profiler.end_frame()
+    world.close()
+
+# --- SIMULAÇÃO SEM JANELA ---
+def _comando_do_bot(world):
+    """Jogador automático: responde ao monstro mais à esquerda com o feitiço certo."""
+    alvo = world.indice_monstros.nearest_any()
+    if alvo is None: return None
+    return inverter_mapa(world.mapa_comandos_voz).get(alvo.tipo)
+
+def run_headless_simulation(anim_manager, seed=0, ticks=60 * TAXA_SIMULACAO * 10, voice_backend=None, bot_interval=20, game_clock=None):
+    """
+    Roda partidas sem renderizar, com RNG semeado e relógio simulado, o mais rápido
+    que a CPU permitir. Sem voice_backend, um bot lança um feitiço a cada
+    `bot_interval` ticks. Ao chegar em GAME_OVER uma nova partida começa.
+    Retorna um dicionário com ticks/s e uma assinatura determinística da execução.
+    """
+    rng = random.Random(seed)
+    game_clock = game_clock or SimulatedClock()
+    game_state = GameState(None); game_state.player_name = f"sim-{seed}"
+    voice_system = VoiceRecognitionSystem(voice_backend) if voice_backend else None
+    pontuacoes = []
+
+    game_state.estado = "JOGANDO"
+    world = criar_mundo(game_state, anim_manager, rng)
+    inicio = time.perf_counter()
+    with gc_control.deferred():
+        for tick in range(ticks):
+            if voice_system:
+                world.process_transcripts(voice_system.get_all_pending_transcripts())
+            elif tick % bot_interval == 0:
+                cmd = _comando_do_bot(world)
+                if cmd: world.queue_spell(cmd)
+            world.update(PASSO_FIXO); voice_tracer.frame_presented()
+            game_clock.tick(TAXA_SIMULACAO)
+            gc_control.end_of_frame()
+            if game_state.estado == "GAME_OVER":
+                pontuacoes.append(game_state.pontuacao)
+                game_state.estado = "JOGANDO"
+                world.close(); world = criar_mundo(game_state, anim_manager, rng)
+    duracao = time.perf_counter() - inicio
+    pontuacoes.append(game_state.pontuacao)  # partida em andamento
+
+    assinatura = hashlib.sha1(json.dumps([pontuacoes, game_clock.get_ticks()]).encode()).hexdigest()[:12]
+    return {
+        "seed": seed, "ticks": ticks, "minutos_simulados": ticks / TAXA_SIMULACAO / 60,
+        "segundos_reais": duracao, "ticks_por_segundo": ticks / duracao if duracao else float('inf'),
+        "partidas": len(pontuacoes), "pontuacoes": pontuacoes, "assinatura": assinatura,
+        "pools": entity_pool_stats(), "gc": gc_control.stats(),
+    }
 
 # --- FUNÇÃO PRINCIPAL ---
-def main():
-    voice_system = VoiceRecognitionSystem()
+ANIMACOES_DO_JOGO = [
+    ('mago_idle', pasta_mago_anim, (100, 120)),
+    ('mago_cast', pasta_mago_anim, (110, 120)),
+    ('monstro_fogo', pasta_monstro_fogo_anim, (80, 80)),
+    ('monstro_gelo', pasta_monstro_gelo_anim, (80, 80)),
+    ('monstro_terra', pasta_monstro_terra_anim, (80, 80)),
+    ('feitico_fogo', pasta_feitico_fogo_anim, (50, 50)),
+    ('feitico_gelo', pasta_feitico_gelo_anim, (50, 50)),
+    ('feitico_raio', pasta_feitico_raio_anim, (50, 50)),
+    ('explosao', pasta_explosao_anim, (100, 100)),
+    ('aprendiz_idle', pasta_aprendiz_anim, (70, 90)),
+]
+
+def load_game_animations(anim_manager):
+    # Carregamento único no início do jogo, com as pastas decodificadas em paralelo
+    inicio = time.perf_counter()
+    anim_manager.load_animations(ANIMACOES_DO_JOGO)
+    print(f"Animações carregadas em {(time.perf_counter() - inicio) * 1000:.1f} ms.")
+
+def print_latency_summary():
+    resumo = voice_tracer.summary()
+    if not resumo['estagios']: return
+    t = resumo['traces']
+    print(f"latência voz -> feitiço: {t['concluidos']} transcrições com feitiço, {t['descartados']} sem, {t['expirados']} expiradas")
+    for estagio, st in resumo['estagios'].items():
+        print(f"  {estagio:<14} p50 {st['p50']:8.2f} ms | p95 {st['p95']:8.2f} ms | p99 {st['p99']:8.2f} ms | n={st['n']}")
+
+def print_pool_stats():
+    for nome, st in entity_pool_stats().items():
+        print(f"pool {nome}: {st['criados']} criados, {st['reutilizados']} reutilizados ({st['reuso']:.0%}), {st['livres']} livres, {st['descartados']} descartados")
+    st = gc_control.stats()
+    print(f"gc: {st['coletas']} coletas controladas, {st['tempo_total_ms']:.1f} ms no total, pior {st['pior_ms']:.2f} ms, {st['congelados']} objetos congelados")
+
+def main(voice_backend=None, asset_cache=None, perfil_path=None, latencia_path=None, idiomas='pt-BR'):
+    voice_system = VoiceRecognitionSystem(voice_backend, idiomas)
     score_manager = ScoreManager()
     game_state = GameState(score_manager)
-    anim_manager = AnimationManager()
-    
-    # Carregamento único no início do jogo
-    anim_manager.load_animation_from_folder('mago_idle', pasta_mago_anim, (100, 120))
-    anim_manager.load_animation_from_folder('mago_cast', pasta_mago_anim, (110, 120))
-    anim_manager.load_animation_from_folder('monstro_fogo', pasta_monstro_fogo_anim, (80, 80))
-    anim_manager.load_animation_from_folder('monstro_gelo', pasta_monstro_gelo_anim, (80, 80))
-    anim_manager.load_animation_from_folder('monstro_terra', pasta_monstro_terra_anim, (80, 80))
-    anim_manager.load_animation_from_folder('feitico_fogo', pasta_feitico_fogo_anim, (50, 50))
-    anim_manager.load_animation_from_folder('feitico_gelo', pasta_feitico_gelo_anim, (50, 50))
-    anim_manager.load_animation_from_folder('feitico_raio', pasta_feitico_raio_anim, (50, 50))
-    anim_manager.load_animation_from_folder('explosao', pasta_explosao_anim, (100, 100))
-    anim_manager.load_animation_from_folder('aprendiz_idle', pasta_aprendiz_anim, (70, 90))
+    anim_manager = AnimationManager(asset_cache=asset_cache)
+    load_background(asset_cache)
+    load_game_animations(anim_manager)
+    gc_control.freeze()  # Assets e módulos já carregados não são mais percorridos pelo GC
 
     running = True
     while running:
@@ -592,7 +1414,68 @@ def main():
             running = False
 
     voice_system.stop()
+    score_manager.close()
+    print_pool_stats(); print_latency_summary()
+    if latencia_path:
+        voice_tracer.dump(latencia_path); print(f"Latências gravadas em {latencia_path}")
+    if perfil_path:
+        profiler.dump(perfil_path); print(f"Perfil de {len(profiler.frames)} frames gravado em {perfil_path}")
     pygame.quit()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Mago dos Comandos")
+    parser.add_argument('--idiomas', default='pt-BR', help="idiomas do reconhecimento, separados por vírgula (ex: pt-BR,en-US); o Chrome escuta um por vez, começando pelo primeiro")
+    parser.add_argument('--replay', metavar='ARQUIVO', help="reproduz uma sessão de voz gravada (JSON por linha) em vez do microfone")
+    parser.add_argument('--replay-rapido', action='store_true', help="entrega os eventos do replay o mais rápido possível, ignorando o tempo original")
+    parser.add_argument('--replay-loop', action='store_true', help="recomeça o replay ao chegar no fim")
+    parser.add_argument('--headless', action='store_true', help="simula partidas sem janela, o mais rápido possível, e reporta ticks/s")
+    parser.add_argument('--seed', type=int, default=0, help="semente do RNG da simulação (--headless)")
+    parser.add_argument('--minutos', type=float, default=10, help="minutos de jogo simulados (--headless)")
+    parser.add_argument('--bake', action='store_true', help="gera o cache de assets redimensionados para a resolução atual e sai")
+    parser.add_argument('--dirty-rects', action='store_true', help="atualiza só as regiões alteradas da tela (máquinas sem aceleração)")
+    parser.add_argument('--sem-cache', action='store_true', help="decodifica os PNGs sem usar o cache de assets em disco")
+    parser.add_argument('--logica', metavar='LxA', help="desenha nesta resolução (ex: 800x600, o tamanho da arte) e amplia uma vez por frame para a janela")
+    parser.add_argument('--upscale', choices=('sdl', 'software'), default='sdl', help="com --logica: ampliação pelo SDL (pygame.SCALED) ou por transform.scale")
+    parser.add_argument('--perfil', metavar='ARQUIVO', help="ao sair, grava o tempo por fase dos últimos frames (.csv ou .json)")
+    parser.add_argument('--latencia', metavar='ARQUIVO', help="ao sair, grava em JSON os histogramas de latência voz -> feitiço por estágio")
+    parser.add_argument('--gc-automatico', action='store_true', help="deixa o coletor de lixo rodar a qualquer momento, em vez de só entre frames")
+    parser.add_argument('--motor', choices=('sprites', 'soa'), default='sprites', help="monstros e feitiços como sprites ou em arrays numpy (soa, para hordas)")
+    parser.add_argument('--horda', type=int, default=0, metavar='N', help="modo horda: mantém N monstros na tela; os que escapam não custam vidas")
+    parser.add_argument('--grade-colisao', choices=('auto', 'sim', 'nao'), default='auto',
+                        help="colisões pela grade espacial: 'auto' a usa quando há muitos feitiços e sprites pequenos para a tela")
+    parser.add_argument('--lote-rle', action='store_true', help="desenha sprites e barras de vida num único blits, com cópias RLE dos frames")
+    args = parser.parse_args()
+
+    asset_cache = None if args.sem_cache else AssetCache(pasta_cache_assets)
+    if args.dirty_rects:
+        renderer = DirtyRenderer()
+    gc_control.enabled = not args.gc_automatico
+    if args.motor == 'soa':
+        if entity_store is None: parser.error("--motor soa precisa do numpy (pip install numpy)")
+        classe_mundo = SoAGameWorld
+    horda, usar_lote_rle = args.horda, args.lote_rle
+    usar_grade_colisao = {'auto': None, 'sim': True, 'nao': False}[args.grade_colisao]
+    if args.bake:
+        asset_cache = asset_cache or AssetCache(pasta_cache_assets)
+        load_background(asset_cache); load_game_animations(AnimationManager(asset_cache=asset_cache))
+        pygame.quit(); sys.exit()
+
+    # No modo simulado o replay segue o relógio simulado, não o real.
+    sim_clock = SimulatedClock()
+    replay_clock = (lambda: sim_clock.get_ticks() / 1000.0) if args.headless else time.perf_counter
+    backend = None
+    if args.replay:
+        backend = ReplayRecognizer(args.replay, realtime=not args.replay_rapido, loop=args.replay_loop, clock=replay_clock)
+
+    if args.headless:
+        anim_manager = AnimationManager(asset_cache=asset_cache); load_game_animations(anim_manager); gc_control.freeze()
+        resultado = run_headless_simulation(anim_manager, seed=args.seed, ticks=int(args.minutos * 60 * TAXA_SIMULACAO),
+                                            voice_backend=backend, game_clock=sim_clock)
+        print(f"{resultado['ticks']} ticks ({resultado['minutos_simulados']:.1f} min simulados) em {resultado['segundos_reais']:.2f}s "
+              f"-> {resultado['ticks_por_segundo']:.0f} ticks/s | partidas: {resultado['partidas']} | assinatura: {resultado['assinatura']}")
+        print_pool_stats(); print_latency_summary()
+        if args.latencia: voice_tracer.dump(args.latencia)
+        pygame.quit()
+    else:
+        main(backend, asset_cache, args.perfil, args.latencia, args.idiomas)
\ No newline at end of file
@@ -0,0 +1,183 @@
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+
+from profiler import percentil
+
+
+def _agora_ms():
+    return time.perf_counter() * 1000
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências em ms, com baldes em progressão geométrica (limites
+    0.1, 0.2, 0.4, ... ms) e as últimas `amostras` medidas para percentis exatos.
+    """
+    LIMITES = tuple(0.1 * 2 ** i for i in range(16))  # até ~3.3 s; acima disso cai no último balde
+
+    def __init__(self, amostras=2048):
+        self.baldes = [0] * (len(self.LIMITES) + 1)
+        self.recentes = deque(maxlen=amostras)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def add(self, ms):
+        ms = max(0.0, ms)
+        i = 0
+        while i < len(self.LIMITES) and ms > self.LIMITES[i]:
+            i += 1
+        self.baldes[i] += 1
+        self.recentes.append(ms)
+        self.contagem += 1
+        self.soma += ms
+        self.maximo = max(self.maximo, ms)
+
+    def stats(self):
+        ordenadas = sorted(self.recentes)
+        return {'n': self.contagem, 'media': self.soma / self.contagem if self.contagem else 0.0,
+                'p50': percentil(ordenadas, 50), 'p95': percentil(ordenadas, 95), 'p99': percentil(ordenadas, 99),
+                'max': self.maximo}
+
+    def buckets(self):
+        """[(limite superior em ms ou None para o último, contagem)]"""
+        return list(zip(list(self.LIMITES) + [None], self.baldes))
+
+
+class LatencyTracer:
+    """
+    Rastreia cada transcrição da voz até o frame em que o feitiço aparece.
+
+    start() dá um trace_id à transcrição quando ela chega ao Python; os pontos
+    seguintes do caminho chamam mark(trace_id, marca), e recognized() diz quantos
+    feitiços ela gerou. Cada feitiço lançado com aquele trace_id é fechado no
+    próximo frame_presented(). As latências por estágio vão para um
+    LatencyHistogram cada:
+
+        navegador      onresult -> fetch no engineScript.js (Date.now dos dois lados)
+        transporte     fetch -> chegada no Python (relógio de parede)
+        fila           chegada -> coleta pelo jogo (Queue do reconhecedor)
+        buffer         coleta -> entrega ao loop (command_buffer do VoiceRecognitionSystem)
+        matching       entrega -> comando reconhecido
+        fila_feiticos  reconhecido -> Mago.cast_spell (um feitiço por passo)
+        render         lançamento -> frame apresentado
+        total          onresult (ou chegada, sem navegador) -> frame apresentado
+
+    start() pode ser chamado da thread do reconhecedor; o resto, da thread do jogo.
+    Traces sem feitiço são descartados por recognized(trace_id, 0); os que nunca
+    chegam lá (ex: transcrições lidas pelos menus) expiram, do mais antigo para
+    o mais novo, quando há mais de `max_abertos`.
+    """
+    ESTAGIOS = ('navegador', 'transporte', 'fila', 'buffer', 'matching', 'fila_feiticos', 'render', 'total')
+
+    def __init__(self, max_abertos=1024):
+        self.max_abertos = max_abertos
+        self.histogramas = {estagio: LatencyHistogram() for estagio in self.ESTAGIOS}
+        self.abertos = OrderedDict()  # trace_id -> {marca: ms}
+        self.lancados = []            # (trace_id, ms do lançamento) aguardando o próximo frame
+        self.iniciados = self.concluidos = self.descartados = self.expirados = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self, navegador_ms=None, enviado_ms=None):
+        """
+        Abre um trace. navegador_ms/enviado_ms são o `timestamp` e o `sentAt` do
+        evento do navegador (Date.now()), quando houver.
+        """
+        marcas = {'recebido': _agora_ms()}
+        if navegador_ms is not None:
+            marcas['navegador'] = navegador_ms
+            marcas['enviado'] = enviado_ms if enviado_ms is not None else navegador_ms
+            marcas['recebido_parede'] = time.time() * 1000
+        with self._lock:
+            trace_id = next(self._ids)
+            self.abertos[trace_id] = marcas
+            self.iniciados += 1
+            while len(self.abertos) > self.max_abertos:
+                self.abertos.popitem(last=False); self.expirados += 1
+        return trace_id
+
+    def mark(self, trace_id, marca):
+        marcas = self.abertos.get(trace_id)
+        if marcas is not None and marca not in marcas:
+            marcas[marca] = _agora_ms()
+
+    def recognized(self, trace_id, feiticos):
+        """Fim do matching: a transcrição gerou `feiticos` comandos de feitiço (0 descarta o trace)."""
+        marcas = self.abertos.get(trace_id)
+        if marcas is None:
+            return
+        if not feiticos:
+            self.discard(trace_id); return
+        marcas['reconhecido'] = _agora_ms()
+        marcas['pendentes'] = feiticos
+
+    def spell_cast(self, trace_id):
+        if trace_id in self.abertos:
+            self.lancados.append((trace_id, _agora_ms()))
+
+    def spell_dropped(self, trace_id):
+        """Um feitiço do trace saiu da fila sem ser lançado (expirado ou coalescido)."""
+        marcas = self.abertos.get(trace_id)
+        if marcas is None:
+            return
+        marcas['pendentes'] = marcas.get('pendentes', 1) - 1
+        if marcas['pendentes'] <= 0:
+            with self._lock:
+                self.abertos.pop(trace_id, None)
+                if 'fechado' not in marcas: self.descartados += 1
+
+    def discard(self, trace_id):
+        with self._lock:
+            if self.abertos.pop(trace_id, None) is not None:
+                self.descartados += 1
+
+    def frame_presented(self):
+        """Fecha os feitiços lançados desde o último frame."""
+        if not self.lancados:
+            return
+        agora = _agora_ms()
+        for trace_id, lancado in self.lancados:
+            marcas = self.abertos.get(trace_id)
+            if marcas is None:
+                continue
+            h = self.histogramas
+            if 'fechado' not in marcas:
+                # Estágios anteriores ao comando: uma vez por transcrição.
+                if 'navegador' in marcas:
+                    h['navegador'].add(marcas['enviado'] - marcas['navegador'])
+                    h['transporte'].add(marcas['recebido_parede'] - marcas['enviado'])
+                for estagio, de, ate in (('fila', 'recebido', 'coletado'), ('buffer', 'coletado', 'entregue'),
+                                         ('matching', 'entregue', 'reconhecido')):
+                    if de in marcas and ate in marcas: h[estagio].add(marcas[ate] - marcas[de])
+                marcas['fechado'] = True
+                self.concluidos += 1
+            # Cada feitiço da transcrição conta nos estágios seguintes.
+            if 'reconhecido' in marcas: h['fila_feiticos'].add(lancado - marcas['reconhecido'])
+            h['render'].add(agora - lancado)
+            navegador = marcas['recebido_parede'] - marcas['navegador'] if 'navegador' in marcas else 0.0
+            h['total'].add(navegador + agora - marcas['recebido'])
+            marcas['pendentes'] = marcas.get('pendentes', 1) - 1
+            if marcas['pendentes'] <= 0:
+                with self._lock: self.abertos.pop(trace_id, None)
+        self.lancados.clear()
+
+    def summary(self):
+        return {
+            'traces': {'iniciados': self.iniciados, 'concluidos': self.concluidos,
+                       'descartados': self.descartados, 'expirados': self.expirados, 'abertos': len(self.abertos)},
+            'estagios': {estagio: h.stats() for estagio, h in self.histogramas.items() if h.contagem},
+        }
+
+    def dump(self, path):
+        dados = self.summary()
+        dados['histogramas'] = {estagio: h.buckets() for estagio, h in self.histogramas.items() if h.contagem}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=1)
+
+
+# Único rastreador do processo: reconhecedores e jogo marcam no mesmo.
+voice_tracer = LatencyTracer()
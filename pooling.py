@@ -0,0 +1,132 @@
+import gc
+import time
+from contextlib import contextmanager
+
+import pygame
+
+
+class PooledSprite(pygame.sprite.Sprite):
+    """
+    Sprite reaproveitável por um EntityPool.
+
+    As subclasses declaram __slots__ com o próprio estado e implementam
+    reset(*args), que deixa a instância como se tivesse acabado de ser criada
+    com esses argumentos. O __dict__ herdado do pygame.sprite.Sprite continua
+    existindo, mas só guarda o conjunto de grupos do sprite.
+
+    kill() devolve a instância ao pool, que só a reutiliza depois do próximo
+    recycle(): até lá ela ainda pode ser referenciada por quem a matou.
+    """
+    __slots__ = ('pool',)
+
+    def __init__(self):
+        super().__init__()
+        self.pool = None
+
+    def kill(self):
+        if self.alive():
+            super().kill()
+            if self.pool is not None: self.pool.release(self)
+
+
+class EntityPool:
+    """
+    Lista de instâncias livres de uma subclasse de PooledSprite.
+
+    acquire(*args) reinicia uma instância livre com reset(*args) ou, se não
+    houver nenhuma, cria uma nova com cls(*args). As liberadas por kill() ficam
+    pendentes até recycle(), chamado num ponto do tick em que nada mais aponta
+    para elas. Acima de `max_livres` as instâncias são descartadas para o GC.
+    """
+
+    def __init__(self, cls, max_livres=512):
+        self.cls = cls
+        self.max_livres = max_livres
+        self.livres = []
+        self.pendentes = []
+        self.criados = self.reutilizados = self.descartados = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.livres:
+            obj = self.livres.pop()
+            obj.reset(*args, **kwargs)
+            self.reutilizados += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            obj.pool = self
+            self.criados += 1
+        return obj
+
+    def release(self, obj):
+        self.pendentes.append(obj)
+
+    def recycle(self):
+        """Torna disponíveis as instâncias liberadas desde a última chamada."""
+        if not self.pendentes:
+            return
+        for obj in self.pendentes:
+            if obj.alive():
+                continue  # Alguém a colocou num grupo de novo
+            if len(self.livres) < self.max_livres: self.livres.append(obj)
+            else: self.descartados += 1
+        self.pendentes.clear()
+
+    def stats(self):
+        pedidos = self.criados + self.reutilizados
+        return {'criados': self.criados, 'reutilizados': self.reutilizados, 'descartados': self.descartados,
+                'livres': len(self.livres), 'reuso': self.reutilizados / pedidos if pedidos else 0.0}
+
+
+class GcController:
+    """
+    Controle do coletor de lixo em volta do loop de frames.
+
+    freeze() roda uma coleta completa e move tudo o que já existe (assets,
+    módulos, fontes) para a geração permanente, que o GC deixa de percorrer.
+    Dentro de deferred() a coleta automática fica desligada; end_of_frame(),
+    chamado depois de apresentar o frame, roda só as gerações jovens quando os
+    contadores do gc passam dos limites. A coleta completa fica para a saída do
+    loop (menu, fim de partida), fora do meio de um frame.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.coletas = 0
+        self.tempo_total = 0.0
+        self.pior = 0.0
+
+    def freeze(self):
+        if self.enabled:
+            gc.collect()
+            gc.freeze()
+
+    @contextmanager
+    def deferred(self):
+        if not self.enabled or not gc.isenabled():
+            yield
+            return
+        gc.disable()
+        try:
+            yield
+        finally:
+            gc.enable()
+            self._collect(2)
+
+    def end_of_frame(self):
+        if not self.enabled or gc.isenabled():
+            return
+        contagem, limites = gc.get_count(), gc.get_threshold()
+        if contagem[0] >= limites[0]:
+            self._collect(1 if contagem[1] >= limites[1] else 0)
+
+    def _collect(self, geracao):
+        inicio = time.perf_counter()
+        gc.collect(geracao)
+        duracao = time.perf_counter() - inicio
+        self.coletas += 1
+        self.tempo_total += duracao
+        self.pior = max(self.pior, duracao)
+
+    def stats(self):
+        return {'coletas': self.coletas, 'tempo_total_ms': self.tempo_total * 1000, 'pior_ms': self.pior * 1000,
+                'congelados': gc.get_freeze_count()}
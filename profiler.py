@@ -0,0 +1,131 @@
+import csv
+import json
+import math
+import time
+from collections import deque
+
+import pygame
+
+
+def percentil(valores_ordenados, p):
+    """Percentil por posição mais próxima (nearest-rank) de uma lista já ordenada."""
+    if not valores_ordenados:
+        return 0.0
+    indice = min(len(valores_ordenados), max(1, math.ceil(p / 100.0 * len(valores_ordenados)))) - 1
+    return valores_ordenados[indice]
+
+
+class FrameProfiler:
+    """
+    Tempo por fase de cada frame, guardado num buffer circular dos últimos
+    `capacidade` frames.
+
+    Uso dentro de um loop:
+        profiler.begin_frame('jogo')
+        ... eventos ...;  profiler.mark('eventos')
+        ... desenho ...;  profiler.mark('desenho')
+        profiler.end_frame()
+
+    mark(fase) atribui à fase o tempo desde o mark anterior (ou do begin_frame) e
+    acumula se a fase se repetir no mesmo frame, como nos passos fixos de
+    simulação. add(fase, ms) soma um tempo medido por outra pessoa (ex: o
+    TextCache); fases assim ficam contidas em alguma fase de mark. Fora de um
+    frame (simulação headless) mark e add não fazem nada.
+    """
+
+    def __init__(self, capacidade=3600, intervalo_overlay=0.5):
+        self.frames = deque(maxlen=capacidade)  # (loop, total_ms, {fase: ms})
+        self.overlay_visivel = False
+        self.intervalo_overlay = intervalo_overlay
+        self._loop = None
+        self._inicio = self._ultimo = None
+        self._fases = {}
+        self._overlay = None
+        self._overlay_gerado_em = 0.0
+
+    def begin_frame(self, loop):
+        self._loop = loop
+        self._inicio = self._ultimo = time.perf_counter()
+        self._fases = {}
+
+    def mark(self, fase):
+        if self._inicio is None:
+            return
+        agora = time.perf_counter()
+        self._fases[fase] = self._fases.get(fase, 0.0) + (agora - self._ultimo) * 1000
+        self._ultimo = agora
+
+    def add(self, fase, ms):
+        if self._inicio is not None and ms:
+            self._fases[fase] = self._fases.get(fase, 0.0) + ms
+
+    def end_frame(self):
+        if self._inicio is None:
+            return
+        self.frames.append((self._loop, (time.perf_counter() - self._inicio) * 1000, self._fases))
+        self._inicio = self._ultimo = None
+
+    def handle_event(self, event):
+        """F3 liga/desliga o overlay. Retorna True se o evento foi consumido."""
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.overlay_visivel = not self.overlay_visivel
+            self._overlay = None
+            return True
+        return False
+
+    def summary(self, loop=None):
+        """{loop: {fase: {'p50', 'p95', 'p99', 'media', 'frames'}}}, com a fase 'total' incluída."""
+        amostras = {}
+        for nome_loop, total, fases in self.frames:
+            if loop is not None and nome_loop != loop:
+                continue
+            por_fase = amostras.setdefault(nome_loop, {'total': []})
+            por_fase['total'].append(total)
+            for fase, ms in fases.items():
+                por_fase.setdefault(fase, []).append(ms)
+        resumo = {}
+        for nome_loop, por_fase in amostras.items():
+            resumo[nome_loop] = {}
+            for fase, valores in por_fase.items():
+                valores.sort()
+                resumo[nome_loop][fase] = {'p50': percentil(valores, 50), 'p95': percentil(valores, 95),
+                                           'p99': percentil(valores, 99), 'media': sum(valores) / len(valores),
+                                           'frames': len(valores)}
+        return resumo
+
+    def draw_overlay(self, surface, font):
+        """Desenha a tabela p50/p95/p99 do loop atual no canto superior direito. Retorna os rects."""
+        if not self.overlay_visivel:
+            return []
+        agora = time.perf_counter()
+        if self._overlay is None or agora - self._overlay_gerado_em >= self.intervalo_overlay:
+            self._overlay, self._overlay_gerado_em = self._compose_overlay(font), agora
+        return [surface.blit(self._overlay, self._overlay.get_rect(topright=(surface.get_width() - 10, 10)))]
+
+    def _compose_overlay(self, font):
+        fases = self.summary(self._loop).get(self._loop, {})
+        linhas = [f"{self._loop or '-'}  ({len(self.frames)} frames)", f"{'fase':<12}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for fase, st in sorted(fases.items(), key=lambda item: (item[0] == 'total', -item[1]['p95'])):
+            linhas.append(f"{fase:<12}{st['p50']:>7.2f}{st['p95']:>7.2f}{st['p99']:>7.2f}")
+        renders = [font.render(linha, True, (230, 230, 230)) for linha in linhas]
+        altura_linha = font.get_linesize()
+        surf = pygame.Surface((max(r.get_width() for r in renders) + 16, altura_linha * len(renders) + 12), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        for i, render in enumerate(renders):
+            surf.blit(render, (8, 6 + i * altura_linha))
+        return surf
+
+    def dump(self, path):
+        """Grava os frames do buffer: .json com o resumo por loop e os frames, senão CSV (um frame por linha)."""
+        if path.lower().endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'resumo': self.summary(),
+                           'frames': [{'loop': loop, 'total': total, 'fases': fases} for loop, total, fases in self.frames]},
+                          f, ensure_ascii=False, indent=1)
+            return
+        colunas = sorted({fase for _, _, fases in self.frames for fase in fases})
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'loop', 'total_ms'] + colunas)
+            for i, (loop, total, fases) in enumerate(self.frames):
+                writer.writerow([i, loop, f"{total:.4f}"] + [f"{fases[c]:.4f}" if c in fases else '' for c in colunas])
@@ -0,0 +1,134 @@
+import bisect
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ScoreManager:
+    """
+    Placar em SQLite, com o arquivo acessado só por uma thread de escrita.
+
+    save_score() atualiza na hora um top-K em memória (é ele que as telas
+    desenham) e enfileira o INSERT, que roda numa transação própria na thread
+    do banco: salvar nunca trava um frame e uma queda no meio da escrita não
+    corrompe o placar. Consultas que precisam do banco inteiro (melhor de um
+    jogador, posição no ranking) passam pela mesma fila, então enxergam todas
+    as pontuações salvas antes delas.
+
+    Na primeira execução, as pontuações de `legacy_json` (o antigo scores.json)
+    são importadas.
+    """
+
+    def __init__(self, path="scores.db", top_k=100, legacy_json="scores.json"):
+        self.path = path
+        self.top_k = top_k
+        self.legacy_json = legacy_json
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="placar")
+        self._conn = None
+        self.scores = self._executor.submit(self._open).result()
+
+    # --- Thread do banco ---
+    def _open(self):
+        conn = self._conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, name TEXT NOT NULL, score INTEGER NOT NULL, created REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score DESC, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scores_name ON scores (name, score DESC)")
+            if conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 0:
+                self._import_legacy(conn)
+        return self._query_top(self.top_k)
+
+    def _import_legacy(self, conn):
+        if not self.legacy_json or not os.path.exists(self.legacy_json):
+            return
+        try:
+            with open(self.legacy_json, 'r') as f:
+                antigos = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Placar antigo {self.legacy_json} ignorado: {e}")
+            return
+        agora = time.time()
+        conn.executemany("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)",
+                         [(str(s['name']), int(s['score']), agora) for s in antigos if 'name' in s and 'score' in s])
+
+    def _insert(self, name, score, created):
+        with self._conn:
+            self._conn.execute("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)", (name, score, created))
+
+    def _insert_many(self, linhas):
+        with self._conn:
+            self._conn.executemany("INSERT INTO scores (name, score, created) VALUES (?, ?, ?)", linhas)
+
+    def _query_top(self, count):
+        rows = self._conn.execute("SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ?", (count,))
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def _query_best(self, name):
+        return self._conn.execute("SELECT MAX(score) FROM scores WHERE name = ?", (name,)).fetchone()[0]
+
+    def _query_rank(self, score):
+        return 1 + self._conn.execute("SELECT COUNT(*) FROM scores WHERE score > ?", (score,)).fetchone()[0]
+
+    def _query_count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- Thread do jogo ---
+    def _submit(self, func, *args):
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(_report_error)
+        return future
+
+    def save_score(self, player_name, score):
+        """Não bloqueia: atualiza o top-K em memória e grava em segundo plano. Retorna o Future da escrita."""
+        entrada = {"name": player_name, "score": score}
+        # Empates ficam depois das pontuações mais antigas, como no sort estável de antes.
+        posicao = bisect.bisect_right(self.scores, -score, key=lambda e: -e['score'])
+        if posicao < self.top_k:
+            self.scores.insert(posicao, entrada)
+            del self.scores[self.top_k:]
+        return self._submit(self._insert, player_name, score, time.time())
+
+    def save_many(self, entradas):
+        """Importação em lote de (nome, pontuação); recarrega o top-K ao terminar."""
+        agora = time.time()
+        self._submit(self._insert_many, [(name, score, agora) for name, score in entradas]).result()
+        self.scores = self._submit(self._query_top, self.top_k).result()
+
+    def get_top_scores(self, count=5):
+        if count <= self.top_k:
+            return self.scores[:count]
+        return self._submit(self._query_top, count).result()
+
+    def player_best(self, player_name):
+        """Melhor pontuação do jogador, ou None."""
+        return self._submit(self._query_best, player_name).result()
+
+    def rank(self, score):
+        """Posição (1 = primeiro) que `score` ocupa no placar inteiro."""
+        return self._submit(self._query_rank, score).result()
+
+    def count(self):
+        return self._submit(self._query_count).result()
+
+    def flush(self):
+        """Espera as escritas enfileiradas terminarem."""
+        self._executor.submit(lambda: None).result()
+
+    def close(self):
+        self._executor.submit(self._close)
+        self._executor.shutdown(wait=True)
+
+
+def _report_error(future):
+    erro = future.exception()
+    if erro is not None:
+        print(f"Erro no placar: {erro}")
@@ -0,0 +1,82 @@
+class SpatialHash:
+    """
+    Grade uniforme para broadphase de colisões entre retângulos.
+
+    Cada item é inserido em todas as células que o seu rect cobre; query(rect)
+    devolve só os itens dessas células, em vez de testar todos contra todos.
+    Com `bounds` definido, insert() recusa (retorna False) itens totalmente fora
+    dele, o que serve para descartar feitiços que saíram da tela.
+    """
+
+    def __init__(self, cell_size, bounds=None):
+        self.cell_size = cell_size
+        self.bounds = bounds
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, (rect.right - 1) // cs, rect.top // cs, (rect.bottom - 1) // cs)
+
+    def insert(self, item, rect):
+        if self.bounds is not None and not self.bounds.colliderect(rect):
+            return False
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None: cells[(cx, cy)] = [item]
+                else: cell.append(item)
+        return True
+
+    def query(self, rect):
+        """Itens cujas células se sobrepõem às de `rect` (candidatos, sem teste fino)."""
+        x0, x1, y0, y1 = self._cell_range(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), ())
+        encontrados = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for item in cells.get((cx, cy), ()):
+                    encontrados[item] = None
+        return encontrados
+
+
+# Medido com benchmarks/bench_colisao.py: a grade só ganha do todos contra todos
+# com muitos itens na grade e células pequenas perto da área coberta.
+ITENS_PARA_COMPENSAR = 150
+CELULAS_PARA_COMPENSAR = 100
+
+def compensa(n_itens, cell_size, bounds):
+    """Se montar a grade com `n_itens` e consultá-la sai mais barato que o groupcollide do pygame."""
+    return n_itens >= ITENS_PARA_COMPENSAR and cell_size * cell_size * CELULAS_PARA_COMPENSAR <= bounds.w * bounds.h
+
+
+def groupcollide(groupa, groupb, grid, dokilla=False, dokillb=False):
+    """
+    Equivalente a pygame.sprite.groupcollide (colisão por rect), usando `grid` já
+    montada com os sprites de `groupb`. Mantém a mesma semântica: as listas seguem
+    a ordem de `groupb` e, com dokillb, um sprite morto não colide de novo.
+    """
+    ordem = None
+    mortos = set()
+    crashed = {}
+    for a in (groupa.sprites() if dokilla else groupa):
+        rect = a.rect
+        hit = [b for b in grid.query(rect) if b not in mortos and rect.colliderect(b.rect)]
+        if not hit:
+            continue
+        if len(hit) > 1:
+            if ordem is None: ordem = {b: i for i, b in enumerate(groupb)}
+            hit.sort(key=ordem.__getitem__)
+        if dokillb:
+            for b in hit:
+                b.kill(); mortos.add(b)
+        if dokilla:
+            a.kill()
+        crashed[a] = hit
+    return crashed
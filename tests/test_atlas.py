@@ -0,0 +1,58 @@
+import pygame
+import pytest
+
+from atlas import TextureAtlas
+from frame_cache import RleFrameCache
+
+
+def _frame(tamanho, cor):
+    frame = pygame.Surface(tamanho, pygame.SRCALPHA)
+    frame.fill(cor)
+    frame.set_at((0, 0), (0, 0, 0, 0))  # um pixel transparente, como nos sprites
+    return frame
+
+
+@pytest.fixture
+def frames():
+    return [_frame((30, 20), (255, 0, 0, 255)), _frame((50, 40), (0, 255, 0, 128)), _frame((10, 60), (0, 0, 255, 200))]
+
+
+def test_atlas_empacota_frames_em_areas_separadas_de_uma_pagina(frames):
+    atlas = TextureAtlas(tamanho_pagina=(256, 256), margem=1)
+    regioes = atlas.regions(frames)
+
+    assert len(atlas.paginas) == 1
+    assert all(pagina is atlas.paginas[0] for pagina, _ in regioes)
+    areas = [area for _, area in regioes]
+    assert [a.size for a in areas] == [f.get_size() for f in frames]
+    assert all(atlas.paginas[0].get_rect().contains(a) for a in areas)
+    assert not any(a.colliderect(b) for i, a in enumerate(areas) for b in areas[i + 1:])
+    for frame, (pagina, area) in zip(frames, regioes):
+        copia = pagina.subsurface(area)
+        assert pygame.image.tobytes(copia, 'RGBA') == pygame.image.tobytes(frame, 'RGBA')
+
+
+def test_atlas_devolve_a_mesma_regiao_e_abre_pagina_quando_enche():
+    atlas = TextureAtlas(tamanho_pagina=(64, 64), margem=0)
+    a, b, c = _frame((64, 40), (1, 2, 3, 255)), _frame((64, 40), (4, 5, 6, 255)), _frame((100, 10), (7, 8, 9, 255))
+
+    assert atlas.region(a) is atlas.region(a)
+    assert atlas.region(b)[0] is not atlas.region(a)[0]  # não cabe embaixo de `a`
+    assert atlas.region(c)[1].size == (100, 10)          # maior que a página: página própria
+    assert len(atlas.paginas) == 3
+
+
+def test_frames_com_alpha_de_superficie_ficam_de_fora():
+    frame = _frame((8, 8), (9, 9, 9, 255)); frame.set_alpha(100)
+    assert TextureAtlas().region(frame) == (frame, None)
+    assert RleFrameCache().region(frame) == (frame, None)
+
+
+def test_rle_frame_cache_prepara_uma_copia_por_frame(frames):
+    cache = RleFrameCache()
+    copia, area = cache.region(frames[0])
+
+    assert area is None and copia is not frames[0]
+    assert copia.get_flags() & pygame.RLEACCELOK  # RLEACCEL só aparece depois do primeiro blit
+    assert cache.region(frames[0])[0] is copia
+    assert cache.stats() == {"frames": 1}
@@ -0,0 +1,29 @@
+import pytest
+
+import jogo
+from comandos import command_matcher
+
+# Fala comum a uma ou duas letras de um sinônimo, que não pode virar comando
+FALSOS_POSITIVOS = ["menos", "frito", "frigo", "placa", "kit", "retorno"]
+QUASE_ACERTOS = {"fogu": "fogo", "jelo": "gelo", "gelu": "gelo", "parrar": "parar",
+                 "voutar": "voltar", "comesar": "comecar", "pontuasao": "pontuacao"}
+
+
+@pytest.mark.parametrize("palavra", FALSOS_POSITIVOS)
+def test_palavras_comuns_nao_viram_comando(palavra):
+    assert command_matcher.match(palavra) == []
+
+
+@pytest.mark.parametrize("palavra, comando", QUASE_ACERTOS.items())
+def test_quase_acertos_casam_na_partida(palavra, comando):
+    assert jogo.process_voice_command(palavra, aproximado=True) == [comando]
+
+
+@pytest.mark.parametrize("palavra", ["placas", "voltas", "fogu", "comesar"])
+def test_menus_so_aceitam_sinonimos_exatos(palavra):
+    assert jogo.process_voice_command(palavra) == []
+
+
+def test_menus_ainda_reconhecem_os_sinonimos():
+    assert jogo.process_voice_command("quero ver o placar") == ["pontuacao"]
+    assert jogo.process_voice_command("voltar") == ["voltar"]
@@ -0,0 +1,63 @@
+from command_bus import CommandBus
+
+
+class Relogio:
+    def __init__(self): self.agora = 0.0
+    def __call__(self): return self.agora
+
+
+def _bus(**kw):
+    relogio, descartes = Relogio(), []
+    bus = CommandBus(clock=relogio, ao_descartar=lambda item, motivo: descartes.append((item, motivo)), **kw)
+    return bus, relogio, descartes
+
+
+def test_cheia_descarta_o_mais_antigo():
+    bus, _, descartes = _bus(maxlen=3)
+    for item in "abcd": bus.put(item, chave=item)
+
+    assert descartes == [("a", "cheia")]
+    assert bus.drain() == ["b", "c", "d"]
+    assert bus.stats()["cheia"] == 1
+
+
+def test_comandos_velhos_expiram_no_drain_e_no_pop():
+    bus, relogio, descartes = _bus(max_idade=1.0)
+    bus.put("fogo", "fogo"); relogio.agora = 0.8
+    bus.put("gelo", "gelo"); relogio.agora = 1.5
+
+    assert bus.drain() == ["gelo"]
+    bus.put("raio", "raio"); relogio.agora = 3.0
+    assert bus.pop() is None
+    assert descartes == [("fogo", "expirado"), ("raio", "expirado")]
+
+
+def test_idade_conta_do_instante_da_origem():
+    bus, relogio, descartes = _bus(max_idade=1.0)
+    relogio.agora = 5.0
+    bus.put("fogo", "fogo", instante=3.9)  # já esperou 1.1 s em outra fila
+    bus.put("gelo", "gelo", instante=4.5)
+
+    assert bus.drain() == ["gelo"]
+    assert descartes == [("fogo", "expirado")]
+
+
+def test_repeticoes_velhas_coalescem_no_comando_mais_novo():
+    bus, relogio, descartes = _bus(coalescer_apos=0.2)
+    for _ in range(3): bus.put("fogo", "fogo")
+    bus.put("gelo", "gelo")
+    relogio.agora = 0.5
+    bus.put("fogo novo", "fogo")
+
+    assert bus.drain() == ["gelo", "fogo novo"]
+    assert [motivo for _, motivo in descartes] == ["coalescido"] * 3
+
+
+def test_pop_coalesce_como_o_drain():
+    bus, relogio, _ = _bus(coalescer_apos=0.2)
+    bus.put("fogo 1", "fogo"); relogio.agora = 0.5
+    bus.put("fogo 2", "fogo")
+
+    assert bus.pop() == "fogo 2"
+    assert bus.pop() is None
+    assert bus.stats() == {'na_fila': 0, 'recebidos': 2, 'entregues': 1, 'cheia': 0, 'expirado': 0, 'coalescido': 1}
@@ -0,0 +1,37 @@
+import random
+
+import jogo
+
+
+def _mundo_com_sprites():
+    anim_manager = jogo.AnimationManager()
+    anim_manager.load_animations(jogo.ANIMACOES_DO_JOGO)
+    game_state = jogo.GameState(None); game_state.estado = "JOGANDO"
+    world = jogo.GameWorld(game_state, anim_manager, random.Random(1))
+    for _ in range(5): world.spawn_monster()
+    for _ in range(3): world.spawn_spell("fogo", world.mago.rect.center)
+    return world
+
+
+def test_reset_game_state_devolve_os_sprites_vivos_aos_pools():
+    world = _mundo_com_sprites()
+    livres = {nome: len(pool.livres) for nome, pool in jogo.entity_pools.items()}
+
+    jogo.reset_game_state(world.game_state, world.all_groups)
+
+    assert len(jogo.entity_pools['monstros'].livres) == livres['monstros'] + 5
+    assert len(jogo.entity_pools['feiticos'].livres) == livres['feiticos'] + 3
+    assert list(world.all_groups['todos']) == [world.mago]
+    assert not world.all_groups['monstros'] and not world.all_groups['feiticos']
+    world.close()
+
+
+def test_monstros_da_rodada_seguinte_saem_do_pool():
+    world = _mundo_com_sprites()
+    jogo.reset_game_state(world.game_state, world.all_groups)
+    criados = jogo.entity_pools['monstros'].criados
+
+    for _ in range(5): world.spawn_monster()
+
+    assert jogo.entity_pools['monstros'].criados == criados
+    world.close()
@@ -0,0 +1,39 @@
+from voice_backends import TranscriptTracker
+
+
+def _evento(seq, *resultados, session=1, language="pt-BR"):
+    return {"seq": seq, "session": session, "language": language, "timestamp": 0,
+            "results": [{"index": i, "stable": s, "unstable": u, "isFinal": f} for i, s, u, f in resultados]}
+
+
+def _palavras(eventos):
+    return [e.new_words for e in eventos]
+
+
+def test_entrega_so_as_palavras_estaveis_novas():
+    tracker = TranscriptTracker()
+
+    assert _palavras(tracker.feed(_evento(0, (0, [], ["fo"], False)))) == []
+    assert _palavras(tracker.feed(_evento(1, (0, ["fogo"], ["ge"], False)))) == [["fogo"]]
+    assert _palavras(tracker.feed(_evento(2, (0, ["fogo"], ["gelo"], False)))) == []
+    assert _palavras(tracker.feed(_evento(3, (0, ["fogo", "gelo"], [], True)))) == [["gelo"]]
+    assert _palavras(tracker.feed(_evento(4, (0, ["fogo", "gelo"], [], True), (1, ["raio"], [], False)))) == [["raio"]]
+
+
+def test_seq_repetido_ou_antigo_e_ignorado():
+    tracker = TranscriptTracker()
+    tracker.feed(_evento(5, (0, ["fogo"], [], False)))
+
+    assert tracker.feed(_evento(5, (0, ["fogo", "gelo"], [], False))) == []
+    assert tracker.feed(_evento(4, (0, ["fogo", "gelo"], [], False))) == []
+    assert _palavras(tracker.feed(_evento(6, (0, ["fogo", "gelo"], [], False)))) == [["gelo"]]
+
+
+def test_nova_sessao_recomeca_os_indices_so_do_seu_idioma():
+    tracker = TranscriptTracker()
+    tracker.feed(_evento(0, (0, ["fogo", "gelo"], [], True)))
+    tracker.feed(_evento(1, (0, ["fire"], [], False), language="en-US"))
+
+    novos = tracker.feed(_evento(2, (0, ["raio"], [], False), session=2))
+    assert _palavras(novos) == [["raio"]] and novos[0].language == "pt-BR"
+    assert _palavras(tracker.feed(_evento(3, (0, ["fire", "ice"], [], False), language="en-US"))) == [["ice"]]
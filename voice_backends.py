@@ -0,0 +1,237 @@
+import json
+import time
+
+from latency import voice_tracer
+
+
+class RecognizerBackend:
+    """
+    Interface que o VoiceRecognitionSystem espera de um reconhecedor de voz.
+
+    get_all_pending_events() devolve os TranscriptEvents acumulados desde a última
+    chamada; get_all_pending() devolve só o texto recém-estabilizado de cada um.
+    Eventos de idiomas em disabled_languages são descartados.
+
+    Cada TranscriptEvent sai com o `instante` em que o reconhecedor o recebeu, no
+    relógio `clock`; toda fila no caminho até o feitiço mede a idade a partir
+    dele e descarta o que passou de IDADE_MAX segundos (ex: o que foi dito
+    durante o game over, quando ninguém lê as filas).
+    """
+    disabled_languages = frozenset()
+    clock = staticmethod(time.perf_counter)
+    IDADE_MAX = 1.0
+
+    def set_language_enabled(self, language, enabled):
+        """Liga/desliga um idioma em tempo de execução."""
+        desligados = set(self.disabled_languages)
+        if enabled: desligados.discard(language)
+        else: desligados.add(language)
+        self.disabled_languages = frozenset(desligados)  # troca atômica para a thread do reconhecedor
+
+    def get_all_pending_events(self):
+        raise NotImplementedError
+
+    def get_all_pending(self):
+        """Retorna o texto recém-estabilizado de cada evento pendente"""
+        return [event.text for event in self.get_all_pending_events()]
+
+    def stop(self):
+        pass
+
+
+class TranscriptEvent:
+    """
+    Palavras recém-estabilizadas de um resultado da Web Speech API.
+
+    result_index: índice do resultado dentro da sessão do SpeechRecognition.
+    stable/unstable: segmentos (listas de palavras) conforme enviados pelo navegador.
+    new_words: parte de `stable` que ainda não tinha sido entregue ao Python.
+    timestamp: Date.now() do navegador, em milissegundos.
+    language: idioma do SpeechRecognition que produziu o resultado (None se desconhecido).
+    trace_id: identificador no latency.voice_tracer, dado por quem recebe o evento.
+    instante: clock() do reconhecedor quando o evento chegou, base da idade nas filas.
+    """
+    __slots__ = ('result_index', 'stable', 'unstable', 'is_final', 'timestamp', 'new_words', 'language', 'trace_id', 'instante')
+
+    def __init__(self, result_index, stable, unstable, is_final, timestamp, new_words, language=None, trace_id=None, instante=None):
+        self.result_index = result_index
+        self.stable = stable
+        self.unstable = unstable
+        self.is_final = is_final
+        self.timestamp = timestamp
+        self.new_words = new_words
+        self.language = language
+        self.trace_id = trace_id
+        self.instante = instante
+
+    @property
+    def text(self):
+        return ' '.join(self.new_words)
+
+    def __repr__(self):
+        return (f"TranscriptEvent(index={self.result_index}, new={self.new_words!r}, "
+                f"unstable={self.unstable!r}, final={self.is_final}, language={self.language!r})")
+
+
+def segment_result(index, transcript, is_final, last_words):
+    """
+    Mesma regra do segmentResult() do engineScript.js: uma palavra é estável quando
+    se repete na mesma posição em dois resultados seguidos, ou quando o resultado
+    é final. `last_words` (índice -> palavras) guarda o resultado anterior.
+    """
+    words = transcript.split()
+    if is_final:
+        last_words.pop(index, None)
+        return {'index': index, 'stable': words, 'unstable': [], 'isFinal': True}
+    previous = last_words.get(index, [])
+    n = 0
+    while n < len(words) and n < len(previous) and words[n] == previous[n]:
+        n += 1
+    last_words[index] = words
+    return {'index': index, 'stable': words[:n], 'unstable': words[n:], 'isFinal': False}
+
+
+class TranscriptTracker:
+    """
+    Converte os eventos estruturados do navegador em TranscriptEvents incrementais,
+    lembrando quantas palavras estáveis de cada resultado já foram entregues.
+    Cada idioma tem o seu SpeechRecognition, com sessões e índices próprios; o
+    `seq` é único para a página inteira.
+    """
+
+    def __init__(self):
+        self.last_seq = -1
+        self.session = {}        # idioma -> sessão atual
+        self.emitted_words = {}  # idioma -> {result_index: palavras estáveis já entregues}
+
+    def feed(self, event):
+        seq = event.get('seq', -1)
+        if seq <= self.last_seq:
+            return []  # Duplicado: o navegador envia em série, na ordem de seq
+        self.last_seq = seq
+
+        # Os índices de resultado recomeçam a cada recognition.start().
+        language = event.get('language')
+        session = event.get('session')
+        if language not in self.session or session != self.session[language]:
+            self.session[language] = session
+            self.emitted_words[language] = {}
+        emitted_words = self.emitted_words[language]
+
+        timestamp = event.get('timestamp', 0)
+        novos = []
+        for result in event.get('results', ()):
+            index = result.get('index', 0)
+            stable = result.get('stable', [])
+            already = emitted_words.get(index, 0)
+            if len(stable) <= already:
+                continue
+            emitted_words[index] = len(stable)
+            novos.append(TranscriptEvent(
+                index, stable, result.get('unstable', []), bool(result.get('isFinal')),
+                timestamp, stable[already:], language))
+        return novos
+
+
+def load_session(path):
+    """
+    Lê uma sessão gravada: um evento JSON por linha, ordenado por "t" (segundos
+    desde o início da sessão). Linhas em branco e começando com "#" são ignoradas.
+
+    Cada linha pode ser um evento do navegador como gravado pelo PyRecognition
+    (com "results") ou a forma simplificada, fácil de escrever à mão:
+        {"t": 0.42, "transcript": "fogo gelo", "final": false, "index": 0}
+    Nas duas formas, "language" (opcional) identifica o idioma do resultado.
+    """
+    linhas = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for numero, linha in enumerate(f, 1):
+            linha = linha.strip()
+            if not linha or linha.startswith('#'):
+                continue
+            try:
+                linhas.append(json.loads(linha))
+            except ValueError as e:
+                raise ValueError(f"{path}:{numero}: evento inválido ({e})") from None
+    return linhas
+
+
+class ReplayRecognizer(RecognizerBackend):
+    """
+    Reproduz uma sessão de reconhecimento gravada, sem microfone, navegador ou rede.
+
+    realtime=True entrega cada evento quando o seu "t" (dividido por `speed`) já
+    passou no relógio `clock`; realtime=False entrega `batch` eventos por chamada,
+    o mais rápido possível. Com loop=True a sessão recomeça ao terminar, para
+    testes de carga longos.
+    """
+
+    def __init__(self, session, realtime=True, speed=1.0, batch=1, loop=False, clock=time.perf_counter):
+        self.lines = load_session(session) if isinstance(session, str) else list(session)
+        self.realtime = realtime
+        self.speed = speed
+        self.batch = batch
+        self.loop = loop
+        self.clock = clock
+        self.tracker = TranscriptTracker()
+        self._last_words = {}  # idioma -> {índice: palavras}
+        self._position = 0
+        self._seq = 0
+        self._round = 0
+        self._start = None
+
+    @property
+    def finished(self):
+        return not self.loop and self._position >= len(self.lines)
+
+    def _to_browser_event(self, line):
+        if 'results' in line:
+            event = dict(line)
+        else:
+            index = line.get('index', 0)
+            last_words = self._last_words.setdefault(line.get('language'), {})
+            event = {'session': line.get('session', 0), 'language': line.get('language'),
+                     'results': [segment_result(index, line.get('transcript', ''),
+                                                bool(line.get('final')), last_words)]}
+        # Renumera para que voltas sucessivas (loop) não sejam descartadas como duplicadas.
+        event['seq'] = self._seq
+        event['session'] = (self._round, event.get('session', 0))
+        event.setdefault('timestamp', line.get('t', 0) * 1000.0)
+        self._seq += 1
+        return event
+
+    def _due_lines(self):
+        if not self.lines:
+            return []
+        if not self.realtime:
+            fim = self._position + self.batch
+            due = self.lines[self._position:fim]
+            self._position = min(fim, len(self.lines))
+        else:
+            if self._start is None:
+                self._start = self.clock()
+            elapsed = (self.clock() - self._start) * self.speed
+            fim = self._position
+            while fim < len(self.lines) and self.lines[fim].get('t', 0) <= elapsed:
+                fim += 1
+            due = self.lines[self._position:fim]
+            self._position = fim
+        if self.loop and self._position >= len(self.lines):
+            self._position = 0
+            self._round += 1
+            self._last_words = {}
+            self._start = None
+        return due
+
+    def get_all_pending_events(self):
+        events = []
+        for line in self._due_lines():
+            event = self._to_browser_event(line)
+            if event.get('language') in self.disabled_languages:
+                continue
+            events.extend(self.tracker.feed(event))
+        instante = self.clock()
+        for event in events:
+            # Os timestamps gravados não são do relógio de agora: o trace e a idade começam aqui.
+            event.trace_id = voice_tracer.start(); event.instante = instante
+        return events